@@ -66,10 +66,9 @@ class CacheService:
         返回:
         - list: 缓存键名列表信息。
         """
-        cache_keys = await RedisCURD(redis).get_keys(f"{cache_name}*")
-        cache_key_list = [
-            key.split(":", 1)[1] for key in cache_keys if key.startswith(f"{cache_name}:")
-        ]
+        cache_key_list = []
+        async for cache_keys in RedisCURD(redis).scan_keys(f"{cache_name}:*"):
+            cache_key_list.extend(key.split(":", 1)[1] for key in cache_keys)
 
         return cache_key_list
 
@@ -109,8 +108,7 @@ class CacheService:
         返回:
         - bool: 是否清理成功。
         """
-        cache_keys = await RedisCURD(redis).get_keys(f"{cache_name}*")
-        if cache_keys:
+        async for cache_keys in RedisCURD(redis).scan_keys(f"{cache_name}*"):
             await RedisCURD(redis).delete(*cache_keys)
 
         return True
@@ -127,8 +125,7 @@ class CacheService:
         返回:
         - bool: 是否清理成功。
         """
-        cache_keys = await RedisCURD(redis).get_keys(f"*{cache_key}")
-        if cache_keys:
+        async for cache_keys in RedisCURD(redis).scan_keys(f"*{cache_key}"):
             await RedisCURD(redis).delete(*cache_keys)
 
         return True
@@ -144,8 +141,7 @@ class CacheService:
         返回:
         - bool: 是否清理成功。
         """
-        cache_keys = await RedisCURD(redis).get_keys()
-        if cache_keys:
+        async for cache_keys in RedisCURD(redis).scan_keys():
             await RedisCURD(redis).delete(*cache_keys)
 
         return True
@@ -28,21 +28,20 @@ class OnlineService:
         - list[dict]: 在线用户详情字典列表。
         """
 
-        keys = await RedisCURD(redis).get_keys(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:*")
-        tokens = await RedisCURD(redis).mget(keys)
-
         online_users = []
-        for token in tokens:
-            if not token:
-                continue
-            try:
-                payload = decode_access_token(token=token)
-                session_info = json.loads(payload.sub)
-                if cls._match_search_conditions(session_info, search):
-                    online_users.append(session_info)
-            except Exception as e:
-                log.error(f"解析在线用户数据失败: {e}")
-                continue
+        # 按批 SCAN + MGET 读取令牌，不使用阻塞 Redis 的 KEYS
+        async for items in RedisCURD(redis).scan_items(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:*"):
+            for _, token in items:
+                if not token:
+                    continue
+                try:
+                    payload = decode_access_token(token=token)
+                    session_info = json.loads(payload.sub)
+                    if cls._match_search_conditions(session_info, search):
+                        online_users.append(session_info)
+                except Exception as e:
+                    log.error(f"解析在线用户数据失败: {e}")
+                    continue
         # 按照 login_time 倒序排序
         online_users.sort(key=lambda x: x.get("login_time", ""), reverse=True)
 
@@ -65,6 +65,18 @@ class DiskInfoSchema(BaseModel):
     usage: float = Field(ge=0, le=100, description="使用率(%)")
 
 
+class PwdHashPoolSchema(BaseModel):
+    """密码哈希线程池状态模型"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    max_workers: int = Field(ge=0, description="线程数")
+    max_queue: int = Field(ge=0, description="最大排队任务数")
+    running: int = Field(ge=0, description="执行中任务数")
+    waiting: int = Field(ge=0, description="排队任务数")
+    rejected: int = Field(ge=0, description="累计拒绝任务数")
+
+
 class ServerMonitorSchema(BaseModel):
     """服务器监控信息模型"""
 
@@ -75,3 +87,4 @@ class ServerMonitorSchema(BaseModel):
     py: PyInfoSchema = Field(description="Python运行信息")
     sys: SysInfoSchema = Field(description="系统信息")
     disks: list[DiskInfoSchema] = Field(default_factory=list, description="磁盘信息")
+    pwd_hash: PwdHashPoolSchema | None = Field(default=None, description="密码哈希线程池状态")
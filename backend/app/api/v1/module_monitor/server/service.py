@@ -6,11 +6,13 @@ from pathlib import Path
 import psutil
 
 from app.utils.common_util import bytes2human
+from app.utils.hash_bcrpy_util import PwdUtil
 
 from .schema import (
     CpuInfoSchema,
     DiskInfoSchema,
     MemoryInfoSchema,
+    PwdHashPoolSchema,
     PyInfoSchema,
     ServerMonitorSchema,
     SysInfoSchema,
@@ -34,6 +36,7 @@ class ServerService:
             sys=cls._get_system_info(),
             py=cls._get_python_info(),
             disks=cls._get_disk_info(),
+            pwd_hash=PwdHashPoolSchema(**PwdUtil.status()),
         ).model_dump()
 
     @classmethod
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.module_system.user.model import UserModel
@@ -15,6 +15,9 @@ class AuthSchema(BaseModel):
     check_data_scope: bool = Field(default=True, description="是否检查数据权限")
     db: AsyncSession = Field(description="数据库会话")
 
+    # 本次请求内解析出的数据权限范围，由 Permission 写入，避免同一请求内重复计算
+    _data_scope: dict = PrivateAttr(default_factory=dict)
+
 
 class JWTPayloadSchema(BaseModel):
     """JWT载荷模型"""
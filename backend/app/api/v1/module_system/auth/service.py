@@ -85,14 +85,19 @@ class LoginService:
         if not user:
             raise CustomException(msg="用户不存在")
 
-        if not PwdUtil.verify_password(
+        verified, new_password_hash = await PwdUtil.verify_and_update_async(
             plain_password=login_form.password, password_hash=user.password
-        ):
+        )
+        if not verified:
             raise CustomException(msg="账号或密码错误")
 
         if user.status == "1":
             raise CustomException(msg="用户已被停用")
 
+        # 旧哈希的加密轮数与当前配置不同时，用本次登录的明文重新加密
+        if new_password_hash:
+            await UserCRUD(auth).change_password_crud(id=user.id, password_hash=new_password_hash)
+
         # 更新最后登录时间
         user = await UserCRUD(auth).update_last_login_crud(id=user.id)
         if not user:
@@ -1,9 +1,13 @@
 from collections.abc import Sequence
 
+from sqlalchemy import delete, insert, literal, or_, select
+
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.core.base_crud import CRUDBase
+from app.core.exceptions import CustomException
+from app.utils.common_util import get_child_id_map
 
-from .model import DeptModel
+from .model import DeptClosureModel, DeptModel
 from .schema import DeptCreateSchema, DeptUpdateSchema
 
 
@@ -99,3 +103,154 @@ class DeptCRUD(CRUDBase[DeptModel, DeptCreateSchema, DeptUpdateSchema]):
         """
         obj = await self.get(id=id)
         return obj.name if obj else None
+
+    async def get_descendant_ids_crud(self, ids: list[int]) -> list[int]:
+        """
+        通过闭包表获取部门及其所有子部门 ID。
+
+        参数:
+        - ids (list[int]): 部门 ID 列表。
+
+        返回:
+        - list[int]: 部门及其所有子部门 ID。
+        """
+        sql = select(DeptClosureModel.descendant_id).where(DeptClosureModel.ancestor_id.in_(ids)).distinct()
+        return list((await self.auth.db.execute(sql)).scalars().all())
+
+    async def get_ancestor_ids_crud(self, ids: list[int]) -> list[int]:
+        """
+        通过闭包表获取部门及其所有上级部门 ID。
+
+        参数:
+        - ids (list[int]): 部门 ID 列表。
+
+        返回:
+        - list[int]: 部门及其所有上级部门 ID。
+        """
+        sql = select(DeptClosureModel.ancestor_id).where(DeptClosureModel.descendant_id.in_(ids)).distinct()
+        return list((await self.auth.db.execute(sql)).scalars().all())
+
+    async def get_exist_ids_crud(self, ids: list[int]) -> set[int]:
+        """
+        查询存在的部门 ID(不做数据权限过滤)。
+
+        参数:
+        - ids (list[int]): 部门 ID 列表。
+
+        返回:
+        - set[int]: 其中存在的部门 ID。
+        """
+        sql = select(DeptModel.id).where(DeptModel.id.in_(ids))
+        return set((await self.auth.db.execute(sql)).scalars().all())
+
+    async def add_closure_crud(self, id: int, parent_id: int | None) -> None:
+        """
+        新增部门后写入闭包关系：自身一行，加上级部门的每个祖先一行。
+
+        参数:
+        - id (int): 新部门 ID。
+        - parent_id (int | None): 上级部门 ID。
+
+        返回:
+        - None
+        """
+        await self.auth.db.execute(
+            insert(DeptClosureModel).values(ancestor_id=id, descendant_id=id, depth=0)
+        )
+        if parent_id:
+            ancestors = select(
+                DeptClosureModel.ancestor_id, literal(id), DeptClosureModel.depth + 1
+            ).where(DeptClosureModel.descendant_id == parent_id)
+            await self.auth.db.execute(
+                insert(DeptClosureModel).from_select(["ancestor_id", "descendant_id", "depth"], ancestors)
+            )
+
+    async def move_closure_crud(self, id: int, parent_id: int | None) -> None:
+        """
+        部门更换上级后移动整棵子树的闭包关系。
+
+        参数:
+        - id (int): 部门 ID。
+        - parent_id (int | None): 新的上级部门 ID。
+
+        返回:
+        - None
+
+        异常:
+        - CustomException: 新的上级部门是自身或其子部门时抛出。
+        """
+        # MySQL 不允许在 DELETE 的子查询中引用目标表，先把子树查出来
+        subtree = (await self.auth.db.execute(
+            select(DeptClosureModel.descendant_id, DeptClosureModel.depth).where(DeptClosureModel.ancestor_id == id)
+        )).all()
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+        if parent_id in subtree_ids:
+            raise CustomException(msg="更新失败，上级部门不能是自身或其子部门")
+
+        # 断开子树与原祖先的关系
+        await self.auth.db.execute(
+            delete(DeptClosureModel).where(
+                DeptClosureModel.descendant_id.in_(subtree_ids),
+                DeptClosureModel.ancestor_id.not_in(subtree_ids),
+            )
+        )
+        if not parent_id:
+            return
+        # 新祖先 × 子树
+        ancestors = (await self.auth.db.execute(
+            select(DeptClosureModel.ancestor_id, DeptClosureModel.depth).where(DeptClosureModel.descendant_id == parent_id)
+        )).all()
+        rows = [
+            {"ancestor_id": ancestor_id, "descendant_id": descendant_id, "depth": ancestor_depth + depth + 1}
+            for ancestor_id, ancestor_depth in ancestors
+            for descendant_id, depth in subtree
+        ]
+        if rows:
+            await self.auth.db.execute(insert(DeptClosureModel), rows)
+
+    async def delete_closure_crud(self, ids: list[int]) -> None:
+        """
+        删除部门的闭包关系(数据库未启用外键级联时不会自动删除)。
+
+        参数:
+        - ids (list[int]): 部门 ID 列表。
+
+        返回:
+        - None
+        """
+        await self.auth.db.execute(
+            delete(DeptClosureModel).where(
+                or_(DeptClosureModel.ancestor_id.in_(ids), DeptClosureModel.descendant_id.in_(ids))
+            )
+        )
+
+    async def rebuild_closure_crud(self) -> int:
+        """
+        根据 parent_id 重建整个闭包表。
+
+        返回:
+        - int: 写入的闭包关系条数。
+        """
+        depts = (await self.auth.db.execute(select(DeptModel.id, DeptModel.parent_id))).all()
+        dept_ids = {dept.id for dept in depts}
+        child_id_map = get_child_id_map(depts)
+        rows = []
+        # 从根部门(无上级或上级已不存在)开始向下遍历，path 为当前部门的祖先链
+        stack = [(dept.id, []) for dept in depts if dept.parent_id not in dept_ids]
+        visited = set()
+        while stack:
+            id, path = stack.pop()
+            if id in visited:
+                continue
+            visited.add(id)
+            path = [*path, id]
+            rows.extend(
+                {"ancestor_id": ancestor_id, "descendant_id": id, "depth": len(path) - 1 - i}
+                for i, ancestor_id in enumerate(path)
+            )
+            stack.extend((child_id, path) for child_id in child_id_map.get(id, []))
+
+        await self.auth.db.execute(delete(DeptClosureModel))
+        for start in range(0, len(rows), 1000):
+            await self.auth.db.execute(insert(DeptClosureModel), rows[start:start + 1000])
+        return len(rows)
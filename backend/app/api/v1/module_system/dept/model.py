@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.base_model import ModelMixin
+from app.core.base_model import MappedBase, ModelMixin
 
 if TYPE_CHECKING:
     from app.api.v1.module_system.role.model import RoleModel
@@ -54,3 +54,30 @@ class DeptModel(ModelMixin):
         foreign_keys="UserModel.dept_id",
         lazy="selectin",
     )
+
+
+class DeptClosureModel(MappedBase):
+    """
+    部门闭包表
+
+    保存每个部门与其所有祖先(含自身, depth=0)的关系，由 DeptService 在部门增删改时维护。
+    数据权限按 ancestor_id 查询子树，无需递归遍历部门树。
+    """
+
+    __tablename__: str = "sys_dept_closure"
+    __table_args__: dict[str, str] = {"comment": "部门闭包表"}
+
+    ancestor_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("sys_dept.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+        comment="祖先部门ID",
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("sys_dept.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+        index=True,
+        comment="后代部门ID",
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="层级距离")
@@ -1,13 +1,8 @@
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.core.base_schema import BatchSetAvailable
 from app.core.exceptions import CustomException
-from app.utils.common_util import (
-    get_child_id_map,
-    get_child_recursion,
-    get_parent_id_map,
-    get_parent_recursion,
-    traversal_to_tree,
-)
+from app.core.user_cache import UserContextCache
+from app.utils.common_util import traversal_to_tree
 
 from .crud import DeptCRUD
 from .schema import (
@@ -92,6 +87,7 @@ class DeptService:
         if obj:
             raise CustomException(msg="创建失败，编码已存在")
         dept = await DeptCRUD(auth).create(data=data)
+        await DeptCRUD(auth).add_closure_crud(id=dept.id, parent_id=dept.parent_id)
         return DeptOutSchema.model_validate(dept).model_dump()
 
     @classmethod
@@ -116,6 +112,10 @@ class DeptService:
         exist_dept = await DeptCRUD(auth).get(name=data.name)
         if exist_dept and exist_dept.id != id:
             raise CustomException(msg="更新失败，部门名称重复")
+        # 未传上级部门时(如只改名称) parent_id 为默认值 None，不能当作移到根节点
+        if "parent_id" in data.model_fields_set and data.parent_id != dept.parent_id:
+            # 先移动闭包关系，上级部门是自身或其子部门时在此拒绝
+            await DeptCRUD(auth).move_closure_crud(id=id, parent_id=data.parent_id)
         dept = await DeptCRUD(auth).update(id=id, data=data)
         return DeptOutSchema.model_validate(dept).model_dump()
 
@@ -137,25 +137,13 @@ class DeptService:
         if len(ids) < 1:
             raise CustomException(msg="删除失败，删除对象不能为空")
 
-        # 获取所有部门列表，用于构建树形关系
-        all_depts = await DeptCRUD(auth).get_list_crud()
-
-        # 构建子部门ID映射
-        child_id_map = get_child_id_map(model_list=all_depts)
-
-        # 收集所有需要删除的部门ID，包括直接指定的ID和它们的所有子部门ID
-        delete_ids_set = set()
-
-        for id in ids:
-            # 递归获取该ID的所有子部门ID
-            all_descendants = get_child_recursion(id=id, id_map=child_id_map)
-            delete_ids_set.update(all_descendants)
-
-        # 将集合转换为列表
-        delete_ids = list(delete_ids_set)
+        # 通过闭包表收集所有需要删除的部门ID，包括直接指定的ID和它们的所有子部门ID
+        delete_ids = await DeptCRUD(auth).get_descendant_ids_crud(ids=ids)
 
         # 执行批量删除操作
+        await DeptCRUD(auth).delete_closure_crud(ids=delete_ids)
         await DeptCRUD(auth).delete(ids=delete_ids)
+        await UserContextCache.invalidate(db=auth.db)
 
     @classmethod
     async def batch_set_available_service(cls, auth: AuthSchema, data: BatchSetAvailable) -> None:
@@ -169,18 +157,10 @@ class DeptService:
         返回:
         - None
         """
-        dept_list = await DeptCRUD(auth).get_list_crud()
-        total_ids = []
-
+        # 启用时连同所有上级部门一起启用，停用时连同所有子部门一起停用
         if data.status == "0":
-            id_map = get_parent_id_map(model_list=dept_list)
-            for dept_id in data.ids:
-                enable_ids = get_parent_recursion(id=dept_id, id_map=id_map)
-                total_ids.extend(enable_ids)
+            total_ids = await DeptCRUD(auth).get_ancestor_ids_crud(ids=data.ids)
         else:
-            id_map = get_child_id_map(model_list=dept_list)
-            for dept_id in data.ids:
-                disable_ids = get_child_recursion(id=dept_id, id_map=id_map)
-                total_ids.extend(disable_ids)
+            total_ids = await DeptCRUD(auth).get_descendant_ids_crud(ids=data.ids)
 
         await DeptCRUD(auth).set_available_crud(ids=total_ids, status=data.status)
@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 from redis.asyncio.client import Redis
 
@@ -13,6 +13,7 @@ from app.core.dependencies import AuthPermission, redis_getter
 from app.core.logger import log
 from app.core.router_class import OperationLogRoute
 from app.utils.common_util import bytes2file_response
+from app.utils.excel_util import ExcelUtil
 
 from .schema import (
     DictDataCreateSchema,
@@ -246,6 +247,7 @@ async def batch_set_available_dict_type_controller(
 async def export_type_list_controller(
     search: Annotated[DictTypeQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dict_type:export"]))],
+    file_type: Annotated[Literal["xlsx", "csv"], Query(description="导出文件类型")] = "xlsx",
 ) -> StreamingResponse:
     """
     导出字典类型
@@ -253,6 +255,7 @@ async def export_type_list_controller(
     参数:
     - search (DictTypeQueryParam): 查询参数模型
     - auth (AuthSchema): 认证信息模型
+    - file_type (Literal["xlsx", "csv"]): 导出文件类型
 
     返回:
     - StreamingResponse: 包含导出字典类型结果的响应模型
@@ -260,15 +263,13 @@ async def export_type_list_controller(
     异常:
     - CustomException: 导出字典类型失败时抛出异常。
     """
-    # 获取全量数据
-    result_dict_list = await DictTypeService.get_obj_list_service(search=search, auth=auth)
-    export_result = await DictTypeService.export_obj_service(data_list=result_dict_list)
+    export_result = await DictTypeService.export_obj_service(search=search, auth=auth, file_type=file_type)
     log.info("导出字典类型成功")
 
     return StreamResponse(
-        data=bytes2file_response(export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=dict_type.xlsx"},
+        data=export_result,
+        media_type=ExcelUtil.MEDIA_TYPES[file_type],
+        headers={"Content-Disposition": f"attachment; filename=dict_type.{file_type}"},
     )
 
 
@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.api.v1.module_system.dict.model import DictDataModel, DictTypeModel
@@ -6,6 +6,7 @@ from app.api.v1.module_system.dict.schema import (
     DictDataCreateSchema,
     DictDataUpdateSchema,
     DictTypeCreateSchema,
+    DictTypeOutSchema,
     DictTypeUpdateSchema,
 )
 from app.core.base_crud import CRUDBase
@@ -64,6 +65,27 @@ class DictTypeCRUD(CRUDBase[DictTypeModel, DictTypeCreateSchema, DictTypeUpdateS
             preload = []
         return await self.list(search=search, order_by=order_by, preload=preload)
 
+    def iter_out_list_crud(
+        self,
+        search: dict | None = None,
+        order_by: list[dict] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        分批获取数据字典类型输出列表，用于导出
+
+        参数:
+        - search (dict | None): 查询参数,默认值为None
+        - order_by (list[dict] | None): 排序参数,默认值为None
+        - batch_size (int): 每批行数,默认值为1000
+
+        返回:
+        - AsyncIterator[list[dict]]: 逐批输出的数据字典类型详情字典列表
+        """
+        return self.iter_projection(
+            out_schema=DictTypeOutSchema, search=search, order_by=order_by, batch_size=batch_size
+        )
+
     async def create_obj_crud(self, data: DictTypeCreateSchema) -> DictTypeModel | None:
         """
         创建数据字典类型
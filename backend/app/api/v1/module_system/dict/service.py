@@ -1,9 +1,12 @@
 import json
+from collections.abc import AsyncIterator
+from typing import Literal
 
 from redis.asyncio.client import Redis
 
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
 from app.core.base_schema import BatchSetAvailable
 from app.core.database import async_db_session
 from app.core.exceptions import CustomException
@@ -229,15 +232,22 @@ class DictTypeService:
         await DictTypeCRUD(auth).set_obj_available_crud(ids=data.ids, status=data.status)
 
     @classmethod
-    async def export_obj_service(cls, data_list: list[dict]) -> bytes:
+    async def export_obj_service(
+        cls,
+        auth: AuthSchema,
+        search: DictTypeQueryParam | None = None,
+        file_type: Literal["xlsx", "csv"] = "xlsx",
+    ) -> AsyncIterator[bytes]:
         """
-        导出数据字典类型列表
+        流式导出数据字典类型列表
 
         参数:
-        - data_list (list[dict]): 数据字典类型列表
+        - auth (AuthSchema): 认证信息模型
+        - search (DictTypeQueryParam | None): 搜索条件模型
+        - file_type (Literal["xlsx", "csv"]): 导出文件类型
 
         返回:
-        - bytes: Excel文件字节流
+        - AsyncIterator[bytes]: 导出文件内容分块
         """
         mapping_dict = {
             "id": "编号",
@@ -251,18 +261,21 @@ class DictTypeService:
             "updated_id": "更新者ID",
         }
 
-        # 复制数据并转换状态
-        data = data_list.copy()
-        for item in data:
+        def format_item(item: dict) -> None:
             # 处理状态
             item["status"] = "启用" if item.get("status") == "0" else "停用"
-            item["creator"] = (
-                item.get("creator", {}).get("name", "未知")
-                if isinstance(item.get("creator"), dict)
-                else "未知"
-            )
 
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+        async def batches() -> AsyncIterator[list[dict]]:
+            # 导出文件在响应开始前写完，可直接使用请求会话
+            async for batch in DictTypeCRUD(auth).iter_out_list_crud(
+                search=search.__dict__ if search else None,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+            ):
+                yield batch
+
+        return await ExcelUtil.stream_export(
+            batches(), mapping_dict=mapping_dict, formatter=format_item, file_type=file_type
+        )
 
 
 class DictDataService:
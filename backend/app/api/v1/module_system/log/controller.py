@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.api.v1.module_system.auth.schema import AuthSchema
@@ -10,7 +10,7 @@ from app.core.base_params import PaginationQueryParam
 from app.core.dependencies import AuthPermission
 from app.core.logger import log
 from app.core.router_class import OperationLogRoute
-from app.utils.common_util import bytes2file_response
+from app.utils.excel_util import ExcelUtil
 
 from .schema import OperationLogOutSchema, OperationLogQueryParam
 from .service import OperationLogService
@@ -43,14 +43,19 @@ async def get_obj_list_controller(
     order_by = [{"created_time": "desc"}]
     if page.order_by:
         order_by = page.order_by
-    result_dict_list = await OperationLogService.get_log_list_service(
-        search=search, auth=auth, order_by=order_by
-    )
-    result_dict = await PaginationService.paginate(
-        data_list=result_dict_list,
-        page_no=page.page_no,
-        page_size=page.page_size,
-    )
+    if page.cursor is not None:
+        result_dict = await OperationLogService.get_log_cursor_page_service(
+            auth=auth, page=page, search=search, order_by=order_by
+        )
+    else:
+        result_dict_list = await OperationLogService.get_log_list_service(
+            search=search, auth=auth, order_by=order_by
+        )
+        result_dict = await PaginationService.paginate(
+            data_list=result_dict_list,
+            page_no=page.page_no,
+            page_size=page.page_size,
+        )
     log.info("查询日志成功")
     return SuccessResponse(data=result_dict, msg="查询日志成功")
 
@@ -112,6 +117,7 @@ async def delete_obj_log_controller(
 async def export_obj_list_controller(
     search: Annotated[OperationLogQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:log:export"]))],
+    file_type: Annotated[Literal["xlsx", "csv"], Query(description="导出文件类型")] = "xlsx",
 ) -> StreamingResponse:
     """
     导出日志
@@ -119,18 +125,18 @@ async def export_obj_list_controller(
     参数:
     - search (OperationLogQueryParam): 日志查询参数模型
     - auth (AuthSchema): 认证信息模型
+    - file_type (Literal["xlsx", "csv"]): 导出文件类型
 
     返回:
     - StreamingResponse: 包含导出日志的流式响应模型
     """
-    operation_log_list = await OperationLogService.get_log_list_service(search=search, auth=auth)
     operation_log_export_result = await OperationLogService.export_log_list_service(
-        operation_log_list=operation_log_list
+        auth=auth, search=search, file_type=file_type
     )
     log.info("导出日志成功")
 
     return StreamResponse(
-        data=bytes2file_response(operation_log_export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=log.xlsx"},
+        data=operation_log_export_result,
+        media_type=ExcelUtil.MEDIA_TYPES[file_type],
+        headers={"Content-Disposition": f"attachment; filename=log.{file_type}"},
     )
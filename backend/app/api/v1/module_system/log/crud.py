@@ -1,10 +1,10 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.core.base_crud import CRUDBase
 
 from .model import OperationLogModel
-from .schema import OperationLogCreateSchema
+from .schema import OperationLogCreateSchema, OperationLogOutSchema
 
 
 class OperationLogCRUD(
@@ -66,3 +66,74 @@ class OperationLogCRUD(
         - Sequence[OperationLogModel]: 操作日志列表。
         """
         return await self.list(search=search, order_by=order_by, preload=preload)
+
+    async def get_out_list_crud(
+        self,
+        search: dict | None = None,
+        order_by: list | None = None,
+    ) -> list[dict]:
+        """
+        获取操作日志输出列表，只查询 OperationLogOutSchema 需要的列和关系。
+
+        参数:
+        - search (Dict | None): 搜索条件字典。
+        - order_by (List[Dict[str, str]] | None): 排序字段列表。
+
+        返回:
+        - list[dict]: 操作日志详情字典列表。
+        """
+        return await self.list_projection(
+            out_schema=OperationLogOutSchema, search=search, order_by=order_by
+        )
+
+    def iter_out_list_crud(
+        self,
+        search: dict | None = None,
+        order_by: list | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        分批获取操作日志输出列表，用于导出。
+
+        参数:
+        - search (Dict | None): 搜索条件字典。
+        - order_by (List[Dict[str, str]] | None): 排序字段列表。
+        - batch_size (int): 每批行数。
+
+        返回:
+        - AsyncIterator[list[dict]]: 逐批输出的操作日志详情字典列表。
+        """
+        return self.iter_projection(
+            out_schema=OperationLogOutSchema, search=search, order_by=order_by, batch_size=batch_size
+        )
+
+    async def get_cursor_page_crud(
+        self,
+        page_size: int,
+        cursor: str | None,
+        count_mode: str,
+        search: dict | None = None,
+        order_by: list | None = None,
+    ) -> dict:
+        """
+        游标分页获取操作日志。
+
+        参数:
+        - page_size (int): 每页数量。
+        - cursor (str | None): 分页游标。
+        - count_mode (str): 总数计算方式。
+        - search (Dict | None): 搜索条件字典。
+        - order_by (List[Dict[str, str]] | None): 排序字段列表。
+
+        返回:
+        - dict: 分页数据。
+        """
+        return await self.cursor_page(
+            limit=page_size,
+            order_by=order_by or [{"created_time": "desc"}],
+            search=search or {},
+            out_schema=OperationLogOutSchema,
+            cursor=cursor,
+            count_mode=count_mode,
+            projection=True,
+        )
@@ -1,4 +1,9 @@
+from collections.abc import AsyncIterator
+from typing import Literal
+
 from app.api.v1.module_system.auth.schema import AuthSchema
+from app.config.setting import settings
+from app.core.base_params import PaginationQueryParam
 from app.core.exceptions import CustomException
 from app.utils.excel_util import ExcelUtil
 
@@ -50,11 +55,37 @@ class OperationLogService:
         - list[dict]: 日志详情字典列表
         """
 
-        log_list = await OperationLogCRUD(auth).get_list_crud(
+        return await OperationLogCRUD(auth).get_out_list_crud(
             search=search.__dict__, order_by=order_by
         )
-        log_dict_list = [OperationLogOutSchema.model_validate(log).model_dump() for log in log_list]
-        return log_dict_list
+
+    @classmethod
+    async def get_log_cursor_page_service(
+        cls,
+        auth: AuthSchema,
+        page: PaginationQueryParam,
+        search: OperationLogQueryParam | None = None,
+        order_by: list | None = None,
+    ) -> dict:
+        """
+        游标分页获取日志，深度翻页不再随页码变慢
+
+        参数:
+        - auth (AuthSchema): 认证信息模型
+        - page (PaginationQueryParam): 分页查询参数模型
+        - search (OperationLogQueryParam | None): 日志查询参数模型
+        - order_by (list | None): 排序字段列表
+
+        返回:
+        - dict: 分页数据
+        """
+        return await OperationLogCRUD(auth).get_cursor_page_crud(
+            page_size=page.page_size,
+            cursor=page.cursor,
+            count_mode=page.count_mode,
+            search=search.__dict__ if search else None,
+            order_by=order_by,
+        )
 
     @classmethod
     async def create_log_service(cls, auth: AuthSchema, data: OperationLogCreateSchema) -> dict:
@@ -89,15 +120,22 @@ class OperationLogService:
         await OperationLogCRUD(auth).delete(ids=ids)
 
     @classmethod
-    async def export_log_list_service(cls, operation_log_list: list[dict]) -> bytes:
+    async def export_log_list_service(
+        cls,
+        auth: AuthSchema,
+        search: OperationLogQueryParam | None = None,
+        file_type: Literal["xlsx", "csv"] = "xlsx",
+    ) -> AsyncIterator[bytes]:
         """
-        导出日志信息
+        流式导出日志信息，按批查询并写出，不一次加载全部日志
 
         参数:
-        - operation_log_list (list[dict]): 操作日志信息列表
+        - auth (AuthSchema): 认证信息模型
+        - search (OperationLogQueryParam | None): 日志查询参数模型
+        - file_type (Literal["xlsx", "csv"]): 导出文件类型
 
         返回:
-        - bytes: 操作日志信息excel的二进制数据
+        - AsyncIterator[bytes]: 导出文件内容分块
         """
         # 操作日志字段映射
         mapping_dict = {
@@ -120,17 +158,20 @@ class OperationLogService:
             "updated_id": "更新者ID",
         }
 
-        # 处理数据
-        data = operation_log_list.copy()
-        for item in data:
+        def format_item(item: dict) -> None:
             # 处理状态
             item["response_code"] = "成功" if item.get("response_code") == 200 else "失败"
             # 处理日志类型 - 修正与schema.py保持一致
             item["type"] = "登录日志" if item.get("type") == 1 else "操作日志"
-            item["creator"] = (
-                item.get("creator", {}).get("name", "未知")
-                if isinstance(item.get("creator"), dict)
-                else "未知"
-            )
 
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+        async def batches() -> AsyncIterator[list[dict]]:
+            # 导出文件在响应开始前写完，可直接使用请求会话
+            async for batch in OperationLogCRUD(auth).iter_out_list_crud(
+                search=search.__dict__ if search else None,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+            ):
+                yield batch
+
+        return await ExcelUtil.stream_export(
+            batches(), mapping_dict=mapping_dict, formatter=format_item, file_type=file_type
+        )
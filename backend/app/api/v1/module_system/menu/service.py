@@ -1,6 +1,7 @@
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.core.base_schema import BatchSetAvailable
 from app.core.exceptions import CustomException
+from app.core.role_permission import RolePermissionCache
 from app.utils.common_util import (
     get_child_id_map,
     get_child_recursion,
@@ -118,6 +119,7 @@ class MenuService:
                 raise CustomException(msg="更新失败，父级菜单不存在")
             data.parent_name = parent_menu.name
         new_menu = await MenuCRUD(auth).update(id=id, data=data)
+        await RolePermissionCache.invalidate(db=auth.db)
 
         await cls.set_menu_available_service(
             auth=auth, data=BatchSetAvailable(ids=[id], status=data.status)
@@ -160,6 +162,7 @@ class MenuService:
 
         # 执行批量删除操作
         await MenuCRUD(auth).delete(ids=delete_ids)
+        await RolePermissionCache.invalidate(db=auth.db)
 
     @classmethod
     async def set_menu_available_service(cls, auth: AuthSchema, data: BatchSetAvailable) -> None:
@@ -190,3 +193,4 @@ class MenuService:
                 total_ids.extend(disable_ids)
 
         await MenuCRUD(auth).set_available_crud(ids=total_ids, status=data.status)
+        await RolePermissionCache.invalidate(db=auth.db)
@@ -10,6 +10,7 @@ from app.core.database import async_db_session
 from app.core.exceptions import CustomException
 from app.core.logger import log
 from app.core.redis_crud import RedisCURD
+from app.core.system_config import SystemConfigCache
 from app.utils.excel_util import ExcelUtil
 from app.utils.upload_util import UploadUtil
 
@@ -139,6 +140,8 @@ class ParamsService:
             log.error(f"创建字典类型失败: {e}")
             raise CustomException(msg=f"创建字典类型失败 {e}")
 
+        await SystemConfigCache.notify(redis)
+
         return new_obj_dict
 
     @classmethod
@@ -183,6 +186,8 @@ class ParamsService:
             log.error(f"更新系统配置失败: {e}")
             raise CustomException(msg="更新系统配置失败")
 
+        await SystemConfigCache.notify(redis)
+
         return new_obj_dict
 
     @classmethod
@@ -226,6 +231,8 @@ class ParamsService:
                 log.error(f"删除系统配置失败: {e}")
                 raise CustomException(msg="删除字典类型失败")
 
+        await SystemConfigCache.notify(redis)
+
     @classmethod
     async def export_obj_service(cls, data_list: list[dict]) -> bytes:
         """
@@ -319,6 +326,8 @@ class ParamsService:
                     log.error(f"❌️ 初始化系统配置失败: {e}")
                     raise CustomException(msg="初始化系统配置失败")
 
+        await SystemConfigCache.notify(redis)
+
     @classmethod
     async def get_init_config_service(cls, redis: Redis) -> list[dict]:
         """
@@ -3,6 +3,8 @@ from typing import Any
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.core.base_schema import BatchSetAvailable
 from app.core.exceptions import CustomException
+from app.core.role_permission import RolePermissionCache
+from app.core.user_cache import UserContextCache
 from app.utils.excel_util import ExcelUtil
 
 from .crud import RoleCRUD
@@ -113,6 +115,7 @@ class RoleService:
         if exist_role and exist_role.id != id:
             raise CustomException(msg="更新失败，角色名称重复")
         updated_role = await RoleCRUD(auth).update(id=id, data=data)
+        await UserContextCache.invalidate(db=auth.db)
         return RoleOutSchema.model_validate(updated_role).model_dump()
 
     @classmethod
@@ -134,6 +137,8 @@ class RoleService:
             if not role:
                 raise CustomException(msg="删除失败，该角色不存在")
         await RoleCRUD(auth).delete(ids=ids)
+        await UserContextCache.invalidate(db=auth.db)
+        await RolePermissionCache.invalidate(role_ids=ids, db=auth.db)
 
     @classmethod
     async def set_role_permission_service(
@@ -162,6 +167,8 @@ class RoleService:
             await RoleCRUD(auth).set_role_depts_crud(role_ids=data.role_ids, dept_ids=data.dept_ids)
         else:
             await RoleCRUD(auth).set_role_depts_crud(role_ids=data.role_ids, dept_ids=[])
+        await UserContextCache.invalidate(db=auth.db)
+        await RolePermissionCache.invalidate(role_ids=data.role_ids, db=auth.db)
 
     @classmethod
     async def set_role_available_service(cls, auth: AuthSchema, data: BatchSetAvailable) -> None:
@@ -176,6 +183,7 @@ class RoleService:
         - None
         """
         await RoleCRUD(auth).set_available_crud(ids=data.ids, status=data.status)
+        await UserContextCache.invalidate(db=auth.db)
 
     @classmethod
     async def export_role_list_service(cls, role_list: list[dict[str, Any]]) -> bytes:
@@ -1,7 +1,7 @@
 import urllib.parse
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Body, Depends, Path, Request, UploadFile
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +14,7 @@ from app.core.dependencies import AuthPermission, db_getter, get_current_user
 from app.core.logger import log
 from app.core.router_class import OperationLogRoute
 from app.utils.common_util import bytes2file_response
+from app.utils.excel_util import ExcelUtil
 
 from .schema import (
     CurrentUserUpdateSchema,
@@ -397,6 +398,7 @@ async def export_obj_list_controller(
     page: Annotated[PaginationQueryParam, Depends()],
     search: Annotated[UserQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:user:export"]))],
+    file_type: Annotated[Literal["xlsx", "csv"], Query(description="导出文件类型")] = "xlsx",
 ) -> StreamingResponse:
     """
     导出用户
@@ -405,20 +407,20 @@ async def export_obj_list_controller(
     - page (PaginationQueryParam): 分页查询参数模型
     - search (UserQueryParam): 查询参数模型
     - auth (AuthSchema): 认证信息模型
+    - file_type (Literal["xlsx", "csv"]): 导出文件类型
 
     返回:
     - StreamingResponse: 用户导出模板流响应
     """
-    user_list = await UserService.get_user_list_service(
-        auth=auth, search=search, order_by=page.order_by
+    user_export_result = await UserService.export_user_list_service(
+        auth=auth, search=search, order_by=page.order_by, file_type=file_type
     )
-    user_export_result = await UserService.export_user_list_service(user_list)
     log.info("导出用户成功")
 
     return StreamResponse(
-        data=bytes2file_response(user_export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=user.xlsx"},
+        data=user_export_result,
+        media_type=ExcelUtil.MEDIA_TYPES[file_type],
+        headers={"Content-Disposition": f"attachment; filename=user.{file_type}"},
     )
 
 
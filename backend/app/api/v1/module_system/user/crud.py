@@ -1,16 +1,20 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime
 from typing import Any
 
+from sqlalchemy import Row, or_, select
+
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.api.v1.module_system.position.crud import PositionCRUD
 from app.api.v1.module_system.role.crud import RoleCRUD
 from app.core.base_crud import CRUDBase
+from app.core.permission import Permission
 
 from .model import UserModel
 from .schema import (
     UserCreateSchema,
     UserForgetPasswordSchema,
+    UserOutSchema,
     UserUpdateSchema,
 )
 
@@ -105,6 +109,108 @@ class UserCRUD(CRUDBase[UserModel, UserCreateSchema, UserUpdateSchema]):
             preload=preload,
         )
 
+    async def get_by_usernames_crud(self, usernames: list[str]) -> dict[str, Row]:
+        """
+        根据用户名批量查询已存在的用户，每批一条 IN 查询，只查询ID、用户名和是否超管；
+        用户名在全表范围内唯一，不做数据权限过滤
+
+        参数:
+        - usernames (list[str]): 用户名列表
+
+        返回:
+        - dict[str, Row]: 用户名到 (id, username, is_superuser) 行的映射
+        """
+        users = {}
+        for start in range(0, len(usernames), self.BULK_BATCH_SIZE):
+            sql = select(UserModel.id, UserModel.username, UserModel.is_superuser).where(
+                UserModel.username.in_(usernames[start:start + self.BULK_BATCH_SIZE])
+            )
+            users.update({row.username: row for row in (await self.auth.db.execute(sql)).all()})
+        return users
+
+    async def get_scoped_ids_crud(self, ids: list[int]) -> set[int]:
+        """
+        批量查询当前用户数据权限范围内的用户ID，每批一条 IN 查询
+
+        参数:
+        - ids (list[int]): 用户ID列表
+
+        返回:
+        - set[int]: 其中有权限访问的用户ID
+        """
+        scoped_ids: set[int] = set()
+        for start in range(0, len(ids), self.BULK_BATCH_SIZE):
+            sql = select(UserModel.id).where(UserModel.id.in_(ids[start:start + self.BULK_BATCH_SIZE]))
+            sql = await Permission(model=UserModel, auth=self.auth).filter_query(sql)
+            scoped_ids.update((await self.auth.db.execute(sql)).scalars().all())
+        return scoped_ids
+
+    async def get_contact_owners_crud(
+        self, mobiles: list[str], emails: list[str]
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """
+        批量查询已被使用的手机号和邮箱，每批一条 IN 查询；唯一性在全表范围内校验，不做数据权限过滤
+
+        参数:
+        - mobiles (list[str]): 手机号列表
+        - emails (list[str]): 邮箱列表
+
+        返回:
+        - tuple[dict[str, int], dict[str, int]]: 手机号到用户ID的映射，邮箱到用户ID的映射
+        """
+        mobile_owners: dict[str, int] = {}
+        email_owners: dict[str, int] = {}
+        for start in range(0, max(len(mobiles), len(emails)), self.BULK_BATCH_SIZE):
+            mobile_chunk = mobiles[start:start + self.BULK_BATCH_SIZE]
+            email_chunk = emails[start:start + self.BULK_BATCH_SIZE]
+            sql = select(UserModel.id, UserModel.mobile, UserModel.email).where(
+                or_(UserModel.mobile.in_(mobile_chunk), UserModel.email.in_(email_chunk))
+            )
+            for row in (await self.auth.db.execute(sql)).all():
+                if row.mobile:
+                    mobile_owners[row.mobile] = row.id
+                if row.email:
+                    email_owners[row.email] = row.id
+        return mobile_owners, email_owners
+
+    async def get_out_list_crud(
+        self,
+        search: dict | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> list[dict]:
+        """
+        获取用户输出列表，只查询 UserOutSchema 需要的列和关系
+
+        参数:
+        - search (dict | None): 查询参数对象。
+        - order_by (list[dict[str, str]] | None): 排序参数列表。
+
+        返回:
+        - list[dict]: 用户详情字典列表
+        """
+        return await self.list_projection(out_schema=UserOutSchema, search=search, order_by=order_by)
+
+    def iter_out_list_crud(
+        self,
+        search: dict | None = None,
+        order_by: list[dict[str, str]] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        分批获取用户输出列表，用于导出
+
+        参数:
+        - search (dict | None): 查询参数对象。
+        - order_by (list[dict[str, str]] | None): 排序参数列表。
+        - batch_size (int): 每批行数。
+
+        返回:
+        - AsyncIterator[list[dict]]: 逐批输出的用户详情字典列表
+        """
+        return self.iter_projection(
+            out_schema=UserOutSchema, search=search, order_by=order_by, batch_size=batch_size
+        )
+
     async def update_last_login_crud(self, id: int) -> UserModel | None:
         """
         更新用户最后登录时间
@@ -1,5 +1,6 @@
 import io
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
 import pandas as pd
 from fastapi import UploadFile
@@ -10,9 +11,12 @@ from app.api.v1.module_system.menu.crud import MenuCRUD
 from app.api.v1.module_system.menu.schema import MenuOutSchema
 from app.api.v1.module_system.position.crud import PositionCRUD
 from app.api.v1.module_system.role.crud import RoleCRUD
+from app.config.setting import settings
 from app.core.base_schema import BatchSetAvailable, UploadResponseSchema
 from app.core.exceptions import CustomException
 from app.core.logger import log
+from app.core.role_permission import RolePermissionCache
+from app.core.user_cache import UserContextCache
 from app.utils.common_util import traversal_to_tree
 from app.utils.excel_util import ExcelUtil
 from app.utils.hash_bcrpy_util import PwdUtil
@@ -78,13 +82,7 @@ class UserService:
         返回:
         - list[dict]: 用户详情字典列表
         """
-        user_list = await UserCRUD(auth).get_list_crud(search=search.__dict__, order_by=order_by)
-        user_dict_list = []
-        for user in user_list:
-            user_dict = UserOutSchema.model_validate(user).model_dump()
-            user_dict_list.append(user_dict)
-
-        return user_dict_list
+        return await UserCRUD(auth).get_out_list_crud(search=search.__dict__, order_by=order_by)
 
     @classmethod
     async def create_user_service(cls, data: UserCreateSchema, auth: AuthSchema) -> dict:
@@ -115,7 +113,7 @@ class UserService:
                 raise CustomException(msg="部门不存在")
         # 创建用户
         if data.password:
-            data.password = PwdUtil.set_password_hash(password=data.password)
+            data.password = await PwdUtil.set_password_hash_async(password=data.password)
         user_dict = data.model_dump(exclude_unset=True, exclude={"role_ids", "position_ids"})
         # 创建用户
         new_user = await UserCRUD(auth).create(data=user_dict)
@@ -208,6 +206,7 @@ class UserService:
                 user_ids=[id], position_ids=data.position_ids
             )
 
+        await UserContextCache.invalidate(user_ids=[id], db=auth.db)
         user_dict = UserOutSchema.model_validate(new_user).model_dump()
         return user_dict
 
@@ -243,6 +242,7 @@ class UserService:
 
         # 删除用户
         await UserCRUD(auth).delete(ids=ids)
+        await UserContextCache.invalidate(user_ids=ids, db=auth.db)
 
     @classmethod
     async def get_current_user_info_service(cls, auth: AuthSchema) -> dict:
@@ -274,13 +274,12 @@ class UserService:
             menus = [MenuOutSchema.model_validate(menu).model_dump() for menu in menu_all]
 
         else:
-            # 收集用户所有角色的菜单ID，使用列表推导式优化代码
-            menu_ids = {
-                menu.id
-                for role in auth.user.roles or []
-                for menu in role.menus
-                if menu.status == "0" and menu.type in [1, 2, 4]
-            }
+            # 收集用户所有角色的菜单ID(按角色预先计算的索引)
+            menu_ids = (
+                await RolePermissionCache.get(
+                    db=auth.db, role_ids=[role.id for role in auth.user.roles or []]
+                )
+            ).menu_ids
 
             # 使用树形结构查询，预加载children关系
             menus = (
@@ -330,6 +329,7 @@ class UserService:
                 raise CustomException(msg="更新失败，邮箱已存在")
         user_update_data = UserUpdateSchema(**data.model_dump())
         new_user = await UserCRUD(auth).update(id=auth.user.id, data=user_update_data)
+        await UserContextCache.invalidate(user_ids=[auth.user.id], db=auth.db)
         return UserOutSchema.model_validate(new_user).model_dump()
 
     @classmethod
@@ -351,6 +351,7 @@ class UserService:
             if user.is_superuser:
                 raise CustomException(msg="超级管理员状态不能修改")
         await UserCRUD(auth).set_available_crud(ids=data.ids, status=data.status)
+        await UserContextCache.invalidate(user_ids=data.ids, db=auth.db)
 
     @classmethod
     async def upload_avatar_service(cls, base_url: str, file: UploadFile) -> dict:
@@ -396,13 +397,13 @@ class UserService:
         user = await UserCRUD(auth).get_by_id_crud(id=auth.user.id)
         if not user:
             raise CustomException(msg="用户不存在")
-        if not PwdUtil.verify_password(
+        if not await PwdUtil.verify_password_async(
             plain_password=data.old_password, password_hash=user.password
         ):
             raise CustomException(msg="原密码输入错误")
 
         # 更新密码
-        new_password_hash = PwdUtil.set_password_hash(password=data.new_password)
+        new_password_hash = await PwdUtil.set_password_hash_async(password=data.new_password)
         new_user = await UserCRUD(auth).change_password_crud(
             id=user.id, password_hash=new_password_hash
         )
@@ -433,7 +434,7 @@ class UserService:
             raise CustomException(msg="超级管理员密码不能重置")
 
         # 更新密码
-        new_password_hash = PwdUtil.set_password_hash(password=data.password)
+        new_password_hash = await PwdUtil.set_password_hash_async(password=data.password)
         new_user = await UserCRUD(auth).change_password_crud(
             id=data.id, password_hash=new_password_hash
         )
@@ -456,7 +457,7 @@ class UserService:
         if username_ok:
             raise CustomException(msg="账号已存在")
 
-        data.password = PwdUtil.set_password_hash(password=data.password)
+        data.password = await PwdUtil.set_password_hash_async(password=data.password)
         data.name = data.username
         create_dict = data.model_dump(exclude_unset=True, exclude={"role_ids", "position_ids"})
 
@@ -493,7 +494,7 @@ class UserService:
         if user.is_superuser:
             raise CustomException(msg="超级管理员密码不能重置")
 
-        new_password_hash = PwdUtil.set_password_hash(password=data.new_password)
+        new_password_hash = await PwdUtil.set_password_hash_async(password=data.new_password)
         new_user = await UserCRUD(auth).forget_password_crud(
             id=user.id, password_hash=new_password_hash
         )
@@ -526,9 +527,9 @@ class UserService:
         }
 
         try:
-            # 读取Excel文件
+            # 读取Excel文件，全部按文本读取，避免手机号等被解析为浮点数
             contents = await file.read()
-            df = pd.read_excel(io.BytesIO(contents))
+            df = pd.read_excel(io.BytesIO(contents), dtype=str)
             await file.close()
 
             if df.empty:
@@ -555,54 +556,123 @@ class UserService:
             if errors:
                 raise CustomException(msg="；".join(errors))
 
+            # 整列转换数据
+            for field in ("username", "name", "email", "mobile"):
+                df[field] = df[field].str.strip()
+            df[["email", "mobile"]] = df[["email", "mobile"]].astype(object).where(
+                df[["email", "mobile"]].notna(), None
+            )
+            df["gender"] = df["gender"].map({"男": "1", "女": "2"}).fillna("1")
+            df["status"] = df["status"].eq("正常").map({True: "0", False: "1"})
+            df["dept_id"] = pd.to_numeric(df["dept_id"], errors="coerce")
+
+            # 一次查询所有已存在的用户(全表范围)及其中有数据权限的用户，默认密码只计算一次哈希
+            exists_users = await UserCRUD(auth).get_by_usernames_crud(
+                usernames=df["username"].unique().tolist()
+            )
+            scoped_user_ids = await UserCRUD(auth).get_scoped_ids_crud(
+                ids=[user.id for user in exists_users.values()]
+            )
+            password_hash = await PwdUtil.set_password_hash_async(password="123456")  # 设置默认密码
+            # 手机号、邮箱唯一，部门编号是外键：写入前批量校验，有问题的行单独报错，不让整批写入失败
+            mobile_owners, email_owners = await UserCRUD(auth).get_contact_owners_crud(
+                mobiles=df["mobile"].dropna().unique().tolist(), emails=df["email"].dropna().unique().tolist()
+            )
+            dept_ids = await DeptCRUD(auth).get_exist_ids_crud(
+                ids=[int(dept_id) for dept_id in df["dept_id"].dropna().unique()]
+            )
+
             error_msgs = []
             success_count = 0
-            count = 0
-
-            # 处理每一行数据
-            for _index, row in df.iterrows():
+            create_rows: dict[str, dict] = {}
+            update_rows: dict[int, dict] = {}
+            # 本文件中已使用的手机号、邮箱 -> 用户名
+            file_mobiles: dict[str, str] = {}
+            file_emails: dict[str, str] = {}
+
+            # 逐行校验，写入在校验完成后分批执行
+            for count, row in enumerate(df.to_dict("records"), start=1):
                 try:
-                    count = count + 1
-                    # 数据转换
-                    gender = 1 if row["gender"] == "男" else (2 if row["gender"] == "女" else 1)
-                    status = "0" if row["status"] == "正常" else "1"
+                    if pd.isna(row["dept_id"]):
+                        error_msgs.append(f"第{count}行: 部门编号格式不正确")
+                        continue
+                    if int(row["dept_id"]) not in dept_ids:
+                        error_msgs.append(f"第{count}行: 部门编号 {int(row['dept_id'])} 不存在")
+                        continue
 
                     # 构建用户数据
                     user_data = {
-                        "username": str(row["username"]).strip(),
-                        "name": str(row["name"]).strip(),
-                        "email": str(row["email"]).strip(),
-                        "mobile": str(row["mobile"]).strip(),
-                        "gender": gender,
-                        "status": status,
+                        "username": row["username"],
+                        "name": row["name"],
+                        "email": row["email"],
+                        "mobile": row["mobile"],
+                        "gender": row["gender"],
+                        "status": row["status"],
                         "dept_id": int(row["dept_id"]),
-                        "password": PwdUtil.set_password_hash(password="123456"),  # 设置默认密码
+                        "password": password_hash,
                     }
 
-                    # 处理用户导入
-                    exists_user = await UserCRUD(auth).get_by_username_crud(
-                        username=user_data["username"]
-                    )
-                    if exists_user:
+                    # 处理用户导入，同一文件中重复的用户名按已存在处理
+                    exists_user = exists_users.get(user_data["username"])
+                    user_id = exists_user.id if exists_user else None
+                    conflicts = []
+                    for label, value, owners, file_values in (
+                        ("手机号", user_data["mobile"], mobile_owners, file_mobiles),
+                        ("邮箱", user_data["email"], email_owners, file_emails),
+                    ):
+                        if not value:
+                            continue
+                        if owners.get(value, user_id) != user_id:
+                            conflicts.append(f"{label} {value} 已被其他用户使用")
+                        elif file_values.get(value, user_data["username"]) != user_data["username"]:
+                            conflicts.append(f"{label} {value} 与本文件中其他行重复")
+                    if conflicts:
+                        error_msgs.append(f"第{count}行: {'，'.join(conflicts)}")
+                        continue
+
+                    if exists_user or user_data["username"] in create_rows:
                         # 检查是否是超级管理员
-                        if exists_user.is_superuser:
+                        if exists_user and exists_user.is_superuser:
                             error_msgs.append(f"第{count}行: 超级管理员不允许修改")
                             continue
+                        if update_support and exists_user and exists_user.id not in scoped_user_ids:
+                            error_msgs.append(f"第{count}行: 用户 {user_data['username']} 已存在，无权限修改")
+                            continue
                         if update_support:
-                            user_update_data = UserUpdateSchema(**user_data)
-                            await UserCRUD(auth).update(id=exists_user.id, data=user_update_data)
+                            user_update_data = UserUpdateSchema(**user_data).model_dump(
+                                exclude_unset=True, include=set(user_data)
+                            )
+                            if exists_user:
+                                update_rows[exists_user.id] = {"id": exists_user.id, **user_update_data}
+                            else:
+                                create_rows[user_data["username"]].update(user_update_data)
                             success_count += 1
                         else:
                             error_msgs.append(f"第{count}行: 用户 {user_data['username']} 已存在")
+                            continue
                     else:
-                        user_create_data = UserCreateSchema(**user_data)
-                        await UserCRUD(auth).create(data=user_create_data)
+                        user_create_data = UserCreateSchema(**user_data).model_dump(
+                            exclude={"role_ids", "position_ids"}
+                        )
+                        create_rows[user_data["username"]] = user_create_data
                         success_count += 1
 
+                    # 只登记成功导入的行，被拒绝的行不占用手机号和邮箱
+                    if user_data["mobile"]:
+                        file_mobiles[user_data["mobile"]] = user_data["username"]
+                    if user_data["email"]:
+                        file_emails[user_data["email"]] = user_data["username"]
+
                 except Exception as e:
                     error_msgs.append(f"第{count}行: 异常{e!s}")
                     continue
 
+            # 分批写入
+            await UserCRUD(auth).bulk_create(data=list(create_rows.values()))
+            if update_rows:
+                await UserCRUD(auth).bulk_update(data=list(update_rows.values()))
+                await UserContextCache.invalidate(user_ids=list(update_rows), db=auth.db)
+
             # 返回详细的导入结果
             result = f"成功导入 {success_count} 条数据"
             if error_msgs:
@@ -642,19 +712,28 @@ class UserService:
         )
 
     @classmethod
-    async def export_user_list_service(cls, user_list: list[dict[str, Any]]) -> bytes:
+    async def export_user_list_service(
+        cls,
+        auth: AuthSchema,
+        search: UserQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+        file_type: Literal["xlsx", "csv"] = "xlsx",
+    ) -> AsyncIterator[bytes]:
         """
-        导出用户列表为Excel文件
+        流式导出用户列表，按批查询并写出，不一次加载全部用户
 
         参数:
-        - user_list (List[Dict[str, Any]]): 用户列表
+        - auth (AuthSchema): 认证信息模型
+        - search (UserQueryParam | None): 查询参数对象。
+        - order_by (list[dict[str, str]] | None): 排序参数列表。
+        - file_type (Literal["xlsx", "csv"]): 导出文件类型
 
         返回:
-        - bytes: Excel文件字节流
-        """
-        if not user_list:
-            raise CustomException(msg="没有数据可导出")
+        - AsyncIterator[bytes]: 导出文件内容分块
 
+        异常:
+        - CustomException: 没有数据可导出时抛出异常
+        """
         # 定义字段映射
         mapping_dict = {
             "id": "用户编号",
@@ -674,18 +753,33 @@ class UserService:
             "updated_id": "更新者ID",
         }
 
-        # 复制数据并转换
-        # creator = {'id': 1, 'name': '管理员', 'username': 'admin'}
-        data = user_list.copy()
-        for item in data:
+        def format_item(item: dict[str, Any]) -> None:
             item["status"] = "启用" if item.get("status") == "0" else "停用"
             gender = item.get("gender")
             item["gender"] = "男" if gender == "1" else ("女" if gender == "2" else "未知")
             item["is_superuser"] = "是" if item.get("is_superuser") else "否"
-            item["creator"] = (
-                item.get("creator", {}).get("name", "未知")
-                if isinstance(item.get("creator"), dict)
-                else "未知"
-            )
 
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+        async def batches() -> AsyncIterator[list[dict[str, Any]]]:
+            # 导出文件在响应开始前写完，可直接使用请求会话
+            async for batch in UserCRUD(auth).iter_out_list_crud(
+                search=search.__dict__ if search else None,
+                order_by=order_by,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+            ):
+                yield batch
+
+        # 先取第一批，没有数据时在响应开始前报错
+        user_batches = batches()
+        first_batch = await anext(user_batches, None)
+        if not first_batch:
+            await user_batches.aclose()
+            raise CustomException(msg="没有数据可导出")
+
+        async def all_batches() -> AsyncIterator[list[dict[str, Any]]]:
+            yield first_batch
+            async for batch in user_batches:
+                yield batch
+
+        return await ExcelUtil.stream_export(
+            all_batches(), mapping_dict=mapping_dict, formatter=format_item, file_type=file_type
+        )
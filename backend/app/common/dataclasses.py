@@ -69,3 +69,9 @@ class SnowflakeInfo:
     cluster_id: int
     node_id: int
     sequence: int
+
+
+@dataclasses.dataclass(frozen=True)
+class RolePermission:
+    permissions: frozenset[str]
+    menu_ids: frozenset[int]
@@ -49,6 +49,10 @@ class RedisInitKeyConfig(Enum):
         "key": "scheduler_job_lock",
         "remark": "定时任务初始化锁",
     }
+    BOM_IMPORT_JOB = {"key": "bom_import_job", "remark": "BOM导入任务"}
+    USER_CONTEXT = {"key": "user_context", "remark": "认证用户上下文"}
+    ROLE_PERMISSION = {"key": "role_permission", "remark": "角色权限索引"}
+    SYSTEM_CONFIG_VERSION = {"key": "system_config_version", "remark": "系统配置版本"}
 
     @property
     def key(self) -> str:
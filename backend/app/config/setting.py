@@ -7,7 +7,7 @@ from urllib.parse import quote_plus
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from app.common.enums import EnvironmentEnum
-from app.config.path_conf import BASE_DIR, ENV_DIR
+from app.config.path_conf import BASE_DIR, ENV_DIR, LOG_DIR
 
 
 class Settings(BaseSettings):
@@ -104,6 +104,7 @@ class Settings(BaseSettings):
     REDIS_DB_NAME: int = 1
     REDIS_USER: str = ""
     REDIS_PASSWORD: str = ""
+    REDIS_SCAN_COUNT: int = 1000  # 遍历键名时每次SCAN的COUNT提示值，越大往返越少、单次阻塞越长
 
     # ================================================= #
     # ******************** 验证码配置 ******************* #
@@ -126,6 +127,21 @@ class Settings(BaseSettings):
         "HEAD",
         "OPTIONS",
     ]  # 需要记录的请求方法
+    OPERATION_LOG_QUEUE_SIZE: int = 10000  # 操作日志写入队列长度
+    OPERATION_LOG_BATCH_SIZE: int = 200  # 每批写入的最大条数
+    OPERATION_LOG_FLUSH_INTERVAL: float = 1.0  # 不足一批时的最长等待时间(秒)
+    OPERATION_LOG_OVERFLOW: Literal["drop", "disk"] = "disk"  # 队列已满或写入失败时丢弃或暂存到磁盘
+    OPERATION_LOG_SPILL_FILE: Path = LOG_DIR.joinpath("operation_log_spill.jsonl")  # 磁盘暂存文件
+    OPERATION_LOG_DRAIN_TIMEOUT: float = 10.0  # 应用关闭时等待队列写完的最长时间(秒)
+
+    # ================================================= #
+    # ******************* IP归属地配置 ****************** #
+    # ================================================= #
+    # 离线IP库(ip2region xdb格式)，项目不附带，获取方式见 README；不要放在 STATIC_ROOT 下(会被公开下载)
+    IP_LOCATION_DB_FILE: Path = BASE_DIR.joinpath("data", "ip2region.xdb")
+    IP_LOCATION_CACHE_SIZE: int = 10000  # 进程内缓存的IP数
+    IP_LOCATION_REMOTE_ENABLE: bool = False  # 离线库不存在或未命中时是否查询在线接口
+    IP_LOCATION_REMOTE_TIMEOUT: float = 3.0  # 在线接口超时时间(秒)
 
     # ================================================= #
     # ******************* Gzip压缩配置 ******************* #
@@ -174,11 +190,44 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = ""
 
+    # ================================================= #
+    # ******************* 权限缓存配置 ****************** #
+    # ================================================= #
+    USER_CONTEXT_CACHE_ENABLE: bool = True  # 是否缓存认证用户上下文(用户、角色、角色部门)
+    USER_CONTEXT_CACHE_SIZE: int = 1024  # 每个进程内缓存的用户数
+    USER_CONTEXT_CACHE_EXPIRE: int = 60 * 30  # Redis中用户上下文快照过期时间(秒)
+    SYSTEM_CONFIG_REFRESH_INTERVAL: float = 30.0  # 中间件系统配置快照的版本号检查间隔(秒)，变更通知丢失时的兜底
+
     # ================================================= #
     # ******************* 请求限制配置 ****************** #
     # ================================================= #
     REQUEST_LIMITER_REDIS_PREFIX: str = "fastapiadmin:request_limiter:"
 
+    # ================================================= #
+    # ******************* 密码哈希配置 ****************** #
+    # ================================================= #
+    PASSWORD_HASH_ROUNDS: int = 12  # bcrypt 加密轮数
+    PASSWORD_HASH_MAX_WORKERS: int = 4  # 密码哈希线程数(同时计算的哈希数)
+    PASSWORD_HASH_MAX_QUEUE: int = 256  # 最大排队任务数,超出后拒绝新任务
+    PASSWORD_REHASH_ENABLE: bool = True  # 登录时把轮数与当前配置不同的旧哈希重新加密
+
+    # ================================================= #
+    # ******************* 数据导出配置 ****************** #
+    # ================================================= #
+    EXPORT_BATCH_SIZE: int = 2000  # 流式导出每批查询的行数
+
+    # ================================================= #
+    # ******************* 图纸解析配置 ****************** #
+    # ================================================= #
+    DXF_PARSE_MAX_WORKERS: int = 2  # 解析进程数(同时解析的图纸数)
+    DXF_PARSE_MAX_QUEUE: int = 20  # 最大排队任务数,超出后拒绝新任务
+    DXF_PARSE_TIMEOUT: int = 300  # 单个解析任务超时时间(秒)
+    BOM_IMPORT_JOB_EXPIRE: int = 60 * 60 * 24  # 导入任务状态及结果保留时间(秒)
+    DXF_BATCH_MAX_FILES: int = 200  # 批量导入单次最多图纸数(含ZIP内文件)
+    DRAWING_CACHE_ENABLE: bool = True  # 是否缓存图纸解析结果(按文件内容哈希)
+    DRAWING_CACHE_DIR: Path = BASE_DIR.joinpath("cache", "drawing")  # 缓存目录
+    DRAWING_CACHE_MAX_SIZE: int = 1024 * 1024 * 1024  # 缓存目录最大占用(1GB),超出后淘汰最久未用的
+
     # ================================================= #
     # ******************* 重构配置 ******************* #
     # ================================================= #
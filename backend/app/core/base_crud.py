@@ -1,17 +1,40 @@
+import base64
 import builtins
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+import json
+from collections.abc import AsyncIterator, Iterable, Sequence
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, get_args
 
 from pydantic import BaseModel
-from sqlalchemy import Select, asc, delete, desc, func, select, update
+from sqlalchemy import (
+    Insert,
+    Select,
+    and_,
+    asc,
+    delete,
+    desc,
+    false,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
 from sqlalchemy import inspect as sa_inspect
-from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only, noload, selectinload
 from sqlalchemy.sql.elements import ColumnElement
 
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.core.base_model import MappedBase
 from app.core.exceptions import CustomException
 from app.core.permission import Permission
+from app.utils.common_util import uuid4_str
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Result
@@ -25,6 +48,9 @@ OutSchemaType = TypeVar("OutSchemaType", bound=BaseModel)
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """基础数据层"""
 
+    # 批量操作每条语句的最大行数
+    BULK_BATCH_SIZE = 500
+
     def __init__(self, model: type[ModelType], auth: AuthSchema) -> None:
         """
         初始化CRUDBase类
@@ -101,6 +127,41 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except Exception as e:
             raise CustomException(msg=f"列表查询失败: {e!s}")
 
+    async def list_projection(
+        self,
+        out_schema: type[OutSchemaType],
+        search: dict | None = None,
+        order_by: builtins.list[dict[str, str]] | None = None,
+    ) -> builtins.list[dict]:
+        """
+        根据条件获取列表，只查询输出模型需要的列和关系并直接序列化
+
+        输出模型只含列字段时按行构造，不创建ORM对象；含关系字段时只加载用到的列和关系，
+        不使用模型默认的预加载选项。
+
+        参数:
+        - out_schema (Type[OutSchemaType]): 输出数据模型
+        - search (Optional[Dict]): 查询条件,格式为 {'id': value, 'name': value}
+        - order_by (Optional[List[Dict[str, str]]]): 排序字段,格式为 [{'id': 'asc'}, {'name': 'desc'}]
+
+        返回:
+        - List[Dict]: 输出数据字典列表
+
+        异常:
+        - CustomException: 查询失败时抛出异常
+        """
+        try:
+            conditions = await self.__build_conditions(**search) if search else []
+            order = order_by or [{"id": "asc"}]
+            sql, rows = self.__projection_select(out_schema)
+            sql = sql.where(*conditions).order_by(*self.__order_by(order))
+            sql = await self.__filter_permissions(sql)
+            result: Result = await self.auth.db.execute(sql)
+            objs = result.all() if rows else result.scalars().all()
+            return self.__dump_items(objs, out_schema, rows)
+        except Exception as e:
+            raise CustomException(msg=f"列表查询失败: {e!s}")
+
     async def tree_list(
         self,
         search: dict | None = None,
@@ -155,6 +216,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         search: dict,
         out_schema: type[OutSchemaType],
         preload: builtins.list[str | Any] | None = None,
+        projection: bool = False,
     ) -> dict:
         """
         获取分页数据
@@ -166,6 +228,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         - search (Dict): 查询条件
         - out_schema (Type[OutSchemaType]): 输出数据模型
         - preload (Optional[List[Union[str, Any]]]): 预加载关系
+        - projection (bool): 是否只查询输出模型需要的列和关系，为 True 时忽略 preload
 
         返回:
         - Dict: 分页数据
@@ -176,42 +239,179 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         try:
             conditions = await self.__build_conditions(**search) if search else []
             order = order_by or [{"id": "asc"}]
-            sql = select(self.model).where(*conditions).order_by(*self.__order_by(order))
-            # 应用预加载选项
-            for opt in self.__loader_options(preload):
-                sql = sql.options(opt)
-            sql = await self.__filter_permissions(sql)
-
-            # 优化count查询：使用主键计数而非全表扫描
-            mapper = sa_inspect(self.model)
-            pk_cols = list(getattr(mapper, "primary_key", []))
-            if pk_cols:
-                # 使用主键的第一列进行计数（主键必定非NULL，性能更好）
-                count_sql = select(func.count(pk_cols[0])).select_from(self.model)
+            if projection:
+                sql, rows = self.__projection_select(out_schema)
             else:
-                # 降级方案：使用count(*)
-                count_sql = select(func.count()).select_from(self.model)
-
-            if conditions:
-                count_sql = count_sql.where(*conditions)
-            count_sql = await self.__filter_permissions(count_sql)
+                sql, rows = select(self.model), False
+                # 应用预加载选项
+                for opt in self.__loader_options(preload):
+                    sql = sql.options(opt)
+            sql = sql.where(*conditions).order_by(*self.__order_by(order))
+            sql = await self.__filter_permissions(sql)
 
-            total_result = await self.auth.db.execute(count_sql)
-            total = total_result.scalar() or 0
+            total = await self.__count(conditions)
 
             result: Result = await self.auth.db.execute(sql.offset(offset).limit(limit))
-            objs = result.scalars().all()
+            objs = result.all() if rows else result.scalars().all()
 
             return {
                 "page_no": offset // limit + 1 if limit else 1,
                 "page_size": limit or 10,
                 "total": total,
                 "has_next": offset + limit < total,
-                "items": [out_schema.model_validate(obj).model_dump() for obj in objs],
+                "items": self.__dump_items(objs, out_schema, rows),
+            }
+        except Exception as e:
+            raise CustomException(msg=f"分页查询失败: {e!s}")
+
+    async def cursor_page(
+        self,
+        limit: int,
+        order_by: builtins.list[dict[str, str]],
+        search: dict,
+        out_schema: type[OutSchemaType],
+        cursor: str | None = None,
+        count_mode: Literal["exact", "estimate", "none"] = "exact",
+        preload: builtins.list[str | Any] | None = None,
+        projection: bool = False,
+    ) -> dict:
+        """
+        获取游标(keyset)分页数据
+
+        按排序字段的值定位，不使用 OFFSET，翻到多深都只扫描一页的行。排序字段后自动追加主键保证顺序唯一，
+        排序字段最好为非空列并有对应索引，可为空的列按 NULL 最小排序(与数据库方言无关)。
+
+        参数:
+        - limit (int): 每页数量
+        - order_by (List[Dict[str, str]]): 排序字段
+        - search (Dict): 查询条件
+        - out_schema (Type[OutSchemaType]): 输出数据模型
+        - cursor (str | None): 上次返回的 next_cursor/prev_cursor，为空时返回第一页
+        - count_mode (str): 总数计算方式，exact 精确计数，estimate 无查询条件时取表统计信息的估算值，none 不计算
+        - preload (Optional[List[Union[str, Any]]]): 预加载关系
+        - projection (bool): 是否只查询输出模型需要的列和关系，为 True 时忽略 preload
+
+        返回:
+        - Dict: 分页数据，包含 next_cursor/prev_cursor
+
+        异常:
+        - CustomException: 参数或游标无效、查询失败时抛出异常
+        """
+        if limit < 1:
+            raise CustomException(msg="游标分页每页数量必须大于0")
+        try:
+            conditions = await self.__build_conditions(**search) if search else []
+            keys = self.__cursor_keys(order_by or [{"id": "asc"}])
+            signature = ",".join(f"{field}:{'desc' if is_desc else 'asc'}" for field, _, is_desc in keys)
+
+            if projection:
+                sql, rows = self.__projection_select(out_schema, extra_fields=[field for field, _, _ in keys])
+            else:
+                sql, rows = select(self.model), False
+                for opt in self.__loader_options(preload):
+                    sql = sql.options(opt)
+            sql = sql.where(*conditions)
+            base_sql = sql
+            sql = await self.__filter_permissions(sql)
+            filtered = bool(conditions) or sql is not base_sql
+
+            # 解析游标，prev 方向时反转排序取上一页
+            reverse = False
+            if cursor:
+                values, direction = self.__decode_cursor(cursor, keys, signature)
+                reverse = direction == "prev"
+                sql = sql.where(self.__keyset_condition(keys, values, reverse))
+            sql = sql.order_by(*self.__keyset_order(keys, reverse))
+
+            # 多取一行判断是否还有下一页(或上一页)
+            result: Result = await self.auth.db.execute(sql.limit(limit + 1))
+            objs = list(result.all() if rows else result.scalars().all())
+            has_more = len(objs) > limit
+            objs = objs[:limit]
+            if reverse:
+                objs.reverse()
+                has_next, has_prev = True, has_more
+            else:
+                has_next, has_prev = has_more, bool(cursor)
+
+            total = None
+            total_estimated = False
+            if count_mode == "exact":
+                total = await self.__count(conditions)
+            elif count_mode == "estimate" and not filtered:
+                total = await self.__estimate_count()
+                total_estimated = total is not None
+                if total is None:
+                    total = await self.__count(conditions)
+
+            return {
+                "page_size": limit,
+                "total": total,
+                "total_estimated": total_estimated,
+                "has_next": has_next,
+                "has_prev": has_prev,
+                "next_cursor": self.__encode_cursor(objs[-1], keys, signature, "next") if has_next and objs else None,
+                "prev_cursor": self.__encode_cursor(objs[0], keys, signature, "prev") if has_prev and objs else None,
+                "items": self.__dump_items(objs, out_schema, rows),
             }
+        except CustomException:
+            raise
         except Exception as e:
             raise CustomException(msg=f"分页查询失败: {e!s}")
 
+    async def iter_projection(
+        self,
+        out_schema: type[OutSchemaType],
+        search: dict | None = None,
+        order_by: builtins.list[dict[str, str]] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[builtins.list[dict]]:
+        """
+        分批遍历满足条件的全部数据，只查询输出模型需要的列和关系
+
+        按 keyset 方式逐批查询(与游标分页相同)，每批只在内存中保留 batch_size 行，用于大表导出。
+        排序字段后自动追加主键保证顺序唯一。
+
+        参数:
+        - out_schema (Type[OutSchemaType]): 输出数据模型
+        - search (Optional[Dict]): 查询条件
+        - order_by (Optional[List[Dict[str, str]]]): 排序字段
+        - batch_size (int): 每批行数
+
+        返回:
+        - AsyncIterator[List[Dict]]: 逐批输出的数据字典列表
+
+        异常:
+        - CustomException: 参数无效、查询失败时抛出异常
+        """
+        if batch_size < 1:
+            raise CustomException(msg="分批查询每批数量必须大于0")
+        try:
+            conditions = await self.__build_conditions(**search) if search else []
+            keys = self.__cursor_keys(order_by or [{"id": "asc"}])
+            sql, rows = self.__projection_select(out_schema, extra_fields=[field for field, _, _ in keys])
+            sql = await self.__filter_permissions(sql.where(*conditions))
+            sql = sql.order_by(*self.__keyset_order(keys, False))
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException(msg=f"分批查询失败: {e!s}")
+
+        values = None
+        while True:
+            try:
+                batch_sql = sql if values is None else sql.where(self.__keyset_condition(keys, values, False))
+                result: Result = await self.auth.db.execute(batch_sql.limit(batch_size))
+                objs = list(result.all() if rows else result.scalars().all())
+                items = self.__dump_items(objs, out_schema, rows)
+            except Exception as e:
+                raise CustomException(msg=f"分批查询失败: {e!s}")
+            if items:
+                values = [getattr(objs[-1], field) for field, _, _ in keys]
+                yield items
+            if len(objs) < batch_size:
+                return
+
     async def create(self, data: CreateSchemaType | dict) -> ModelType:
         """
         创建新对象
@@ -359,6 +559,167 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except Exception as e:
             raise CustomException(msg=f"批量更新失败: {e!s}")
 
+    async def bulk_create(
+        self, data: builtins.list[CreateSchemaType | dict]
+    ) -> builtins.list[ModelType]:
+        """
+        批量创建对象，按批次执行多行INSERT
+
+        支持 RETURNING 的数据库(PostgreSQL、SQLite)直接返回插入的行；MySQL 不支持 RETURNING，
+        插入后按 uuid 查回新对象，模型没有 uuid 字段时 MySQL 下返回空列表。
+
+        参数:
+        - data (List[Union[CreateSchemaType, Dict]]): 对象属性列表
+
+        返回:
+        - List[ModelType]: 新创建的对象实例，与 data 顺序一致
+
+        异常:
+        - CustomException: 创建失败时抛出异常
+        """
+        try:
+            rows = [self.__audit_values(item, create=True) for item in data]
+            if not rows:
+                return []
+
+            # 预先生成 uuid，用于把返回的行与输入对应，不必要求数据库按参数顺序返回
+            has_uuid = "uuid" in sa_inspect(self.model).columns
+            if has_uuid:
+                for row in rows:
+                    row.setdefault("uuid", uuid4_str())
+
+            objs = []
+            if self.auth.db.get_bind().dialect.insert_executemany_returning:
+                stmt = insert(self.model).returning(self.model, sort_by_parameter_order=not has_uuid)
+                for chunk in self.__chunks(rows):
+                    objs.extend((await self.auth.db.scalars(stmt, chunk)).all())
+                if not has_uuid:
+                    return objs
+            else:
+                for chunk in self.__chunks(rows):
+                    await self.auth.db.execute(insert(self.model), chunk)
+                if not has_uuid:
+                    return []
+                uuid_column = self.model.uuid
+                for chunk in self.__chunks([row["uuid"] for row in rows]):
+                    objs.extend((await self.auth.db.scalars(select(self.model).where(uuid_column.in_(chunk)))).all())
+            objs_by_uuid = {obj.uuid: obj for obj in objs}
+            return [objs_by_uuid[row["uuid"]] for row in rows]
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException(msg=f"批量创建失败: {e!s}")
+
+    async def bulk_update(self, data: builtins.list[dict]) -> int:
+        """
+        按主键批量更新对象，每批一条 executemany 语句
+
+        所有对象都必须在数据权限范围内，否则整批不更新。
+
+        参数:
+        - data (List[Dict]): 更新的属性及值，每项必须包含主键 id，各项的字段可以不同
+
+        返回:
+        - int: 更新的对象数
+
+        异常:
+        - CustomException: 对象不存在、无权限或更新失败时抛出异常
+        """
+        try:
+            mapper = sa_inspect(self.model)
+            pk_cols = list(getattr(mapper, "primary_key", []))
+            if not pk_cols:
+                raise CustomException(msg="模型缺少主键，无法更新")
+            if len(pk_cols) > 1:
+                raise CustomException(msg="暂不支持复合主键的批量更新")
+            pk_key = mapper.get_property_by_column(pk_cols[0]).key
+            if not data:
+                return 0
+            if any(item.get(pk_key) is None for item in data):
+                raise CustomException(msg=f"批量更新数据缺少主键 {pk_key}")
+
+            # 权限确认：只允许更新有权限的数据
+            ids = list({item[pk_key] for item in data})
+            allowed = 0
+            for chunk in self.__chunks(ids):
+                sql = await self.__filter_permissions(select(pk_cols[0]).where(pk_cols[0].in_(chunk)))
+                allowed += len((await self.auth.db.execute(sql)).all())
+            if allowed < len(ids):
+                raise CustomException(msg="更新失败，对象不存在或无权限访问")
+
+            rows = [self.__audit_values(item, create=False) for item in data]
+            for chunk in self.__chunks(rows):
+                await self.auth.db.execute(update(self.model), chunk)
+            return len(rows)
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException(msg=f"批量更新失败: {e!s}")
+
+    async def upsert(
+        self,
+        data: builtins.list[CreateSchemaType | dict],
+        index_elements: builtins.list[str],
+        update_fields: builtins.list[str] | None = None,
+    ) -> tuple[int, int]:
+        """
+        批量插入或更新对象，冲突由数据库处理(MySQL: ON DUPLICATE KEY UPDATE，
+        PostgreSQL/SQLite: ON CONFLICT)
+
+        已存在的行需要更新时，必须全部在数据权限范围内，否则整批不写入。
+
+        参数:
+        - data (List[Union[CreateSchemaType, Dict]]): 对象属性列表，index_elements 的值不能重复
+        - index_elements (List[str]): 冲突判断字段，需有唯一约束
+        - update_fields (Optional[List[str]]): 冲突时更新的字段，None 表示 data 中除冲突字段和创建审计字段外的全部字段，
+          空列表表示跳过已存在的行
+
+        返回:
+        - Tuple[int, int]: 新增的行数，已存在(被更新或跳过)的行数
+
+        异常:
+        - CustomException: 无权限、数据库不支持或写入失败时抛出异常
+        """
+        try:
+            rows = [self.__audit_values(item, create=True) for item in data]
+            if not rows:
+                return 0, 0
+            columns = sa_inspect(self.model).columns
+            if update_fields is None:
+                protected = {*index_elements, "id", "uuid", "created_time", "created_id"}
+                update_fields = [key for key in rows[0] if key not in protected]
+            else:
+                update_fields = list(update_fields)
+            if update_fields:
+                # ON CONFLICT/ON DUPLICATE KEY 不会触发 onupdate，更新人和更新时间需显式写入
+                if "updated_id" in rows[0] and "updated_id" not in update_fields:
+                    update_fields.append("updated_id")
+                if "updated_time" in columns and "updated_time" not in update_fields:
+                    update_fields.append("updated_time")
+
+            dialect = self.auth.db.get_bind().dialect.name
+            key_cols = [getattr(self.model, key) for key in index_elements]
+            existing = 0
+            for chunk in self.__chunks(rows):
+                keys = [tuple(row[key] for key in index_elements) for row in chunk]
+                if len(key_cols) == 1:
+                    condition = key_cols[0].in_([key[0] for key in keys])
+                else:
+                    condition = tuple_(*key_cols).in_(keys)
+                sql = select(*key_cols).where(condition)
+                found = len((await self.auth.db.execute(sql)).all())
+                if update_fields and found:
+                    scoped_sql = await self.__filter_permissions(sql)
+                    if scoped_sql is not sql and len((await self.auth.db.execute(scoped_sql)).all()) < found:
+                        raise CustomException(msg="更新失败，对象不存在或无权限访问")
+                existing += found
+                await self.auth.db.execute(self.__upsert_stmt(dialect, chunk, index_elements, update_fields))
+            return len(rows) - existing, existing
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException(msg=f"批量写入失败: {e!s}")
+
     async def __filter_permissions(self, sql: Select) -> Select:
         """
         过滤数据权限（仅用于Select）。
@@ -417,6 +778,203 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 conditions.append(attr == value)
         return conditions
 
+    async def __count(self, conditions: builtins.list[ColumnElement]) -> int:
+        """
+        统计满足条件且有数据权限的记录数
+
+        参数:
+        - conditions (List[ColumnElement]): 查询条件
+
+        返回:
+        - int: 记录数
+        """
+        # 优化count查询：使用主键计数而非全表扫描
+        mapper = sa_inspect(self.model)
+        pk_cols = list(getattr(mapper, "primary_key", []))
+        if pk_cols:
+            # 使用主键的第一列进行计数（主键必定非NULL，性能更好）
+            count_sql = select(func.count(pk_cols[0])).select_from(self.model)
+        else:
+            # 降级方案：使用count(*)
+            count_sql = select(func.count()).select_from(self.model)
+
+        if conditions:
+            count_sql = count_sql.where(*conditions)
+        count_sql = await self.__filter_permissions(count_sql)
+
+        total_result = await self.auth.db.execute(count_sql)
+        return total_result.scalar() or 0
+
+    async def __estimate_count(self) -> int | None:
+        """
+        从数据库统计信息读取整表的估算行数，不扫描表
+
+        返回:
+        - int | None: 估算行数，数据库不支持或尚无统计信息时返回 None
+        """
+        table_name = getattr(self.model, "__tablename__", None)
+        dialect = self.auth.db.get_bind().dialect.name
+        if dialect == "mysql":
+            sql = text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+            )
+        elif dialect == "postgresql":
+            sql = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)")
+        else:
+            return None
+        estimate = (await self.auth.db.execute(sql, {"table_name": table_name})).scalar()
+        # PostgreSQL 未 ANALYZE 过的表 reltuples 为 -1
+        return int(estimate) if estimate is not None and estimate >= 0 else None
+
+    def __cursor_keys(self, order_by: builtins.list[dict[str, str]]) -> builtins.list[tuple[str, Any, bool]]:
+        """
+        游标分页的排序键，末尾追加主键保证顺序唯一
+
+        参数:
+        - order_by (List[Dict[str, str]]): 排序字段列表
+
+        返回:
+        - List[Tuple[str, Any, bool]]: (字段名, 列, 是否降序) 列表
+
+        异常:
+        - CustomException: 排序字段不是数据列或模型没有单一主键时抛出异常
+        """
+        columns = sa_inspect(self.model).columns
+        keys = []
+        for order in order_by:
+            for field, direction in order.items():
+                if field not in columns:
+                    raise CustomException(msg=f"游标分页排序字段 {field} 不存在")
+                keys.append((field, getattr(self.model, field), direction.lower() == "desc"))
+        pk_cols = list(getattr(sa_inspect(self.model), "primary_key", []))
+        if len(pk_cols) != 1:
+            raise CustomException(msg="游标分页需要模型有单一主键")
+        if pk_cols[0].key not in {field for field, _, _ in keys}:
+            # 与最后一个排序字段同向，便于使用 (排序字段, 主键) 组合索引
+            keys.append((pk_cols[0].key, getattr(self.model, pk_cols[0].key), keys[-1][2] if keys else False))
+        return keys
+
+    @staticmethod
+    def __keyset_order(keys: builtins.list[tuple[str, Any, bool]], reverse: bool) -> builtins.list[ColumnElement]:
+        """
+        构建 keyset 排序子句，可为空的列显式按 NULL 最小排序
+
+        各数据库对 NULL 的默认排序位置不同(MySQL/SQLite 升序在前，PostgreSQL 升序在后)，
+        先按 IS NULL 排序使顺序与 __keyset_condition 一致。
+
+        参数:
+        - keys (List[Tuple[str, Any, bool]]): 排序键
+        - reverse (bool): 是否向前翻页
+
+        返回:
+        - List[ColumnElement]: 排序子句列表
+        """
+        clauses = []
+        for _, column, is_desc in keys:
+            descending = is_desc != reverse
+            if column.expression.nullable:
+                clauses.append(asc(column.is_(None)) if descending else desc(column.is_(None)))
+            clauses.append(desc(column) if descending else asc(column))
+        return clauses
+
+    @staticmethod
+    def __keyset_condition(
+        keys: builtins.list[tuple[str, Any, bool]], values: builtins.list[Any], reverse: bool
+    ) -> ColumnElement:
+        """
+        构建 keyset 条件：(c1, c2, ...) 在游标位置之后，支持各列不同的排序方向，NULL 视为最小值
+
+        参数:
+        - keys (List[Tuple[str, Any, bool]]): 排序键
+        - values (List[Any]): 游标位置各列的值
+        - reverse (bool): 是否向前翻页
+
+        返回:
+        - ColumnElement: 条件表达式
+        """
+        def equals(column: Any, value: Any) -> ColumnElement:
+            return column.is_(None) if value is None else column == value
+
+        def after(column: Any, value: Any, descending: bool) -> ColumnElement:
+            if value is None:
+                # NULL 最小：降序时其后没有更小的值，升序时其后为全部非空值
+                return false() if descending else column.is_not(None)
+            if descending:
+                return or_(column < value, column.is_(None)) if column.expression.nullable else column < value
+            return column > value
+
+        branches = []
+        for i, (_, column, is_desc) in enumerate(keys):
+            prefix = [equals(prev_column, value) for (_, prev_column, _), value in zip(keys[:i], values[:i], strict=True)]
+            branches.append(and_(*prefix, after(column, values[i], is_desc != reverse)))
+        return or_(*branches)
+
+    @staticmethod
+    def __encode_cursor(
+        obj: Any, keys: builtins.list[tuple[str, Any, bool]], signature: str, direction: str
+    ) -> str:
+        """
+        以对象的排序键值生成不透明游标
+
+        参数:
+        - obj (Any): 当前页首行或末行对象
+        - keys (List[Tuple[str, Any, bool]]): 排序键
+        - signature (str): 排序签名，排序条件变化时游标失效
+        - direction (str): next 或 prev
+
+        返回:
+        - str: base64url 编码的游标
+        """
+        def encode(value: Any) -> Any:
+            if isinstance(value, (datetime, date, time)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return str(value)
+            return value
+
+        payload = {"k": [encode(getattr(obj, field)) for field, _, _ in keys], "d": direction, "o": signature}
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    @staticmethod
+    def __decode_cursor(
+        cursor: str, keys: builtins.list[tuple[str, Any, bool]], signature: str
+    ) -> tuple[builtins.list[Any], str]:
+        """
+        解析游标
+
+        参数:
+        - cursor (str): 游标
+        - keys (List[Tuple[str, Any, bool]]): 排序键
+        - signature (str): 当前排序签名
+
+        返回:
+        - Tuple[List[Any], str]: 各排序列的值及翻页方向
+
+        异常:
+        - CustomException: 游标无效或与当前排序条件不一致时抛出异常
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            raw_values, direction = payload["k"], payload["d"]
+            if payload["o"] != signature or direction not in ("next", "prev") or len(raw_values) != len(keys):
+                raise ValueError
+            values = []
+            for (_, column, _), value in zip(keys, raw_values, strict=True):
+                try:
+                    python_type = column.type.python_type
+                except NotImplementedError:
+                    python_type = None
+                if isinstance(value, str) and python_type in (datetime, date, time):
+                    value = python_type.fromisoformat(value)
+                elif isinstance(value, str) and python_type is Decimal:
+                    value = Decimal(value)
+                values.append(value)
+            return values, direction
+        except Exception:
+            raise CustomException(msg="分页游标无效或排序条件已改变")
+
     def __order_by(self, order_by: builtins.list[dict[str, str]]) -> builtins.list[ColumnElement]:
         """
         获取排序字段
@@ -437,6 +995,183 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 columns.append(desc(column) if direction.lower() == "desc" else asc(column))
         return columns
 
+    def __audit_values(self, data: CreateSchemaType | UpdateSchemaType | dict, create: bool) -> dict:
+        """
+        转换为列值字典并写入审计字段
+
+        参数:
+        - data (Union[CreateSchemaType, UpdateSchemaType, Dict]): 对象属性
+        - create (bool): 是否为新建，新建时同时写入创建人
+
+        返回:
+        - Dict: 列值字典
+        """
+        if isinstance(data, dict):
+            row = dict(data)
+        else:
+            row = data.model_dump() if create else data.model_dump(exclude_unset=True)
+        columns = sa_inspect(self.model).columns
+        if self.auth.user:
+            if create and "created_id" in columns:
+                row["created_id"] = self.auth.user.id
+            if "updated_id" in columns:
+                row["updated_id"] = self.auth.user.id
+        if not create and "updated_time" in columns:
+            row.setdefault("updated_time", datetime.now())
+        return row
+
+    def __chunks(self, items: builtins.list) -> builtins.list[builtins.list]:
+        """按 BULK_BATCH_SIZE 分批，避免单条语句的参数个数超出数据库限制"""
+        return [items[start:start + self.BULK_BATCH_SIZE] for start in range(0, len(items), self.BULK_BATCH_SIZE)]
+
+    def __upsert_stmt(
+        self,
+        dialect: str,
+        rows: builtins.list[dict],
+        index_elements: builtins.list[str],
+        update_fields: builtins.list[str],
+    ) -> Insert:
+        """
+        按数据库方言生成多行 INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE
+
+        参数:
+        - dialect (str): 数据库方言名称
+        - rows (List[Dict]): 待插入的行
+        - index_elements (List[str]): 冲突判断字段
+        - update_fields (List[str]): 冲突时更新的字段，为空表示跳过冲突行
+
+        返回:
+        - Insert: 可执行的INSERT语句
+
+        异常:
+        - CustomException: 数据库不支持时抛出异常
+        """
+        table = self.model.__table__
+        if dialect == "mysql":
+            stmt = mysql_insert(table).values(rows)
+            # MySQL 没有 DO NOTHING，把冲突字段更新为自身等同于跳过
+            fields = update_fields or index_elements[:1]
+            return stmt.on_duplicate_key_update({field: stmt.inserted[field] for field in fields})
+        if dialect == "postgresql":
+            stmt = pg_insert(table).values(rows)
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(table).values(rows)
+        else:
+            raise CustomException(msg=f"批量写入不支持当前数据库: {dialect}")
+        if not update_fields:
+            return stmt.on_conflict_do_nothing(index_elements=index_elements)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={field: stmt.excluded[field] for field in update_fields},
+        )
+
+    @staticmethod
+    def __nested_schema(annotation: Any) -> type[BaseModel] | None:
+        """从字段类型(如 Schema | None、list[Schema])中取出嵌套的输出模型"""
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return annotation
+        for arg in get_args(annotation):
+            schema = CRUDBase.__nested_schema(arg)
+            if schema is not None:
+                return schema
+        return None
+
+    @staticmethod
+    def __reads_any_attribute(schema: type[BaseModel]) -> bool:
+        """输出模型有 mode=before/wrap 的模型校验器时，校验器可能读取字段以外的属性"""
+        return any(
+            decorator.info.mode in ("before", "wrap")
+            for decorator in schema.__pydantic_decorators__.model_validators.values()
+        )
+
+    @staticmethod
+    def __schema_loader_options(
+        model: type[MappedBase], schema: type[BaseModel], path: tuple[type[BaseModel], ...] = ()
+    ) -> builtins.list[Any]:
+        """
+        按输出模型生成加载选项：只加载模型字段对应的列和关系，其余关系不加载
+
+        输出模型有 mode=before/wrap 的模型校验器，或字段对应模型的非列属性时，加载全部列；
+        嵌套模型递归处理，自引用的嵌套模型使用关系的默认加载方式。
+
+        参数:
+        - model (Type[MappedBase]): 数据模型类
+        - schema (Type[BaseModel]): 输出数据模型
+        - path (Tuple[Type[BaseModel], ...]): 递归路径上的输出模型
+
+        返回:
+        - List[Any]: 加载选项列表
+        """
+        mapper = sa_inspect(model)
+        columns = []
+        full_columns = CRUDBase.__reads_any_attribute(schema)
+        options = []
+        for name, field in schema.model_fields.items():
+            if name in mapper.column_attrs:
+                columns.append(getattr(model, name))
+            elif name in mapper.relationships:
+                relationship = mapper.relationships[name]
+                columns.extend(
+                    getattr(model, mapper.get_property_by_column(column).key)
+                    for column in relationship.local_columns
+                    if column.table is mapper.local_table
+                )
+                loader = selectinload(getattr(model, name))
+                nested = CRUDBase.__nested_schema(field.annotation)
+                if nested is not None and nested not in path:
+                    loader = loader.options(
+                        *CRUDBase.__schema_loader_options(relationship.mapper.class_, nested, (*path, schema))
+                    )
+                options.append(loader)
+            elif hasattr(model, name):
+                full_columns = True
+        if not full_columns:
+            options.append(load_only(*columns))
+        options.append(noload("*"))
+        return options
+
+    def __projection_select(
+        self, out_schema: type[OutSchemaType], extra_fields: Iterable[str] = ()
+    ) -> tuple[Select, bool]:
+        """
+        按输出模型构建只读取所需数据的查询
+
+        输出模型只含列字段时只查询这些列，按行构造输出；含关系字段时查询实体，
+        只加载输出模型用到的列和关系；输出模型的校验器可能读取任意属性时退回完整实体查询。
+
+        参数:
+        - out_schema (Type[OutSchemaType]): 输出数据模型
+        - extra_fields (Iterable[str]): 额外需要查询的列(如游标排序键)
+
+        返回:
+        - Tuple[Select, bool]: 查询语句，是否按行构造输出
+        """
+        mapper = sa_inspect(self.model)
+        if self.__reads_any_attribute(out_schema):
+            sql = select(self.model)
+            for opt in self.__loader_options(None):
+                sql = sql.options(opt)
+            return sql, False
+        fields = builtins.list(out_schema.model_fields)
+        if any(name not in mapper.column_attrs and hasattr(self.model, name) for name in fields):
+            # 含关系或其他非列属性，查询实体
+            return select(self.model).options(*self.__schema_loader_options(self.model, out_schema)), False
+        names = dict.fromkeys(
+            [
+                *(column.key for column in mapper.primary_key),
+                *(name for name in fields if name in mapper.column_attrs),
+                *extra_fields,
+            ]
+        )
+        return select(*(getattr(self.model, name).label(name) for name in names)), True
+
+    @staticmethod
+    def __dump_items(objs: Sequence[Any], out_schema: type[OutSchemaType], rows: bool) -> builtins.list[dict]:
+        """按输出模型序列化查询结果，按行查询时直接由行字典构造"""
+        if rows:
+            return [out_schema.model_validate(row._asdict()).model_dump() for row in objs]
+        return [out_schema.model_validate(obj).model_dump() for obj in objs]
+
     def __loader_options(
         self, preload: builtins.list[str | Any] | None = None
     ) -> builtins.list[Any]:
@@ -1,4 +1,5 @@
 import json
+from typing import Literal
 
 from fastapi import Query
 
@@ -16,6 +17,14 @@ class PaginationQueryParam:
             default=None,
             description="排序字段,格式:[{'field1': 'asc'}, {'field2': 'desc'}]",
         ),
+        cursor: str | None = Query(
+            default=None,
+            description="游标分页:传空字符串获取第一页,之后传返回的next_cursor/prev_cursor;不传时按页码分页",
+        ),
+        count_mode: Literal["exact", "estimate", "none"] = Query(
+            default="exact",
+            description="游标分页总数:exact精确计数,estimate无筛选时返回估算值,none不计算",
+        ),
     ) -> None:
         """
         初始化分页查询参数。
@@ -24,12 +33,16 @@ class PaginationQueryParam:
         - page_no (int | None): 当前页码，默认 None。
         - page_size (int | None): 每页数量，默认 None，最大 100。
         - order_by (str | None): 排序字段，格式 'field,asc;field2,desc'。
+        - cursor (str | None): 游标，不为 None 时使用游标分页。
+        - count_mode (str): 游标分页的总数计算方式。
 
         返回:
         - None
         """
         self.page_no = page_no
         self.page_size = page_size
+        self.cursor = cursor
+        self.count_mode = count_mode
         # 将字符串格式的order_by转换为服务层需要的List[Dict[str, str]]格式
         if order_by:
             try:
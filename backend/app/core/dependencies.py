@@ -10,11 +10,14 @@ from app.api.v1.module_system.auth.schema import AuthSchema
 from app.api.v1.module_system.user.crud import UserCRUD
 from app.api.v1.module_system.user.model import UserModel
 from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
 from app.core.database import async_db_session
 from app.core.exceptions import CustomException
 from app.core.logger import log
 from app.core.redis_crud import RedisCURD
-from app.core.security import OAuth2Schema, decode_access_token
+from app.core.role_permission import RolePermissionCache
+from app.core.security import OAuth2Schema, decode_request_token
+from app.core.user_cache import UserContextCache
 
 
 async def db_getter() -> AsyncGenerator[AsyncSession, None]:
@@ -64,7 +67,8 @@ async def get_current_user(
     if token.startswith("Bearer"):
         token = token.split(" ")[1]
 
-    payload = decode_access_token(token)
+    # 中间件已解析过的令牌不再重复解码
+    payload = decode_request_token(request, token)
     if not payload or not hasattr(payload, "is_refresh") or payload.is_refresh:
         raise CustomException(msg="非法凭证", code=10401, status_code=401)
 
@@ -76,28 +80,44 @@ async def get_current_user(
     if not session_id:
         raise CustomException(msg="认证已失效", code=10401, status_code=401)
 
-    # 检查用户是否在线
-    online_ok = await RedisCURD(redis).exists(
-        key=f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}"
-    )
-    if not online_ok:
-        raise CustomException(msg="认证已失效", code=10401, status_code=401)
-
+    online_key = f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}"
+    user_id = user_info.get("user_id")
     # 关闭数据权限过滤，避免当前用户查询被拦截
     auth = AuthSchema(db=db, check_data_scope=False)
-    username = user_info.get("user_name")
-    if not username:
-        raise CustomException(msg="认证已失效", code=10401, status_code=401)
-    # 获取用户信息，使用深层预加载确保RoleModel.creator被正确加载
-    user = await UserCRUD(auth).get_by_username_crud(
-        username=username,
-        preload=[
-            "dept",
-            selectinload(UserModel.roles),
-            "positions",
-            "created_by",
-        ],
-    )
+
+    if settings.USER_CONTEXT_CACHE_ENABLE and user_id:
+        # 登录状态和缓存版本一次读取，命中缓存时不查询数据库
+        online_ok, user = await UserContextCache.get_user(
+            redis=redis, db=db, user_id=user_id, online_key=online_key
+        )
+        if not online_ok:
+            raise CustomException(msg="认证已失效", code=10401, status_code=401)
+    else:
+        # 检查用户是否在线
+        online_ok = await RedisCURD(redis).exists(key=online_key)
+        if not online_ok:
+            raise CustomException(msg="认证已失效", code=10401, status_code=401)
+
+        username = user_info.get("user_name")
+        if not username:
+            raise CustomException(msg="认证已失效", code=10401, status_code=401)
+        # 获取用户信息，使用深层预加载确保RoleModel.creator被正确加载
+        user = await UserCRUD(auth).get_by_username_crud(
+            username=username,
+            preload=[
+                "dept",
+                selectinload(UserModel.roles),
+                "positions",
+                "created_by",
+            ],
+        )
+        if user:
+            # 过滤可用的角色和职位
+            if hasattr(user, "roles"):
+                user.roles = [role for role in user.roles if role and role.status]
+            if hasattr(user, "positions"):
+                user.positions = [pos for pos in user.positions if pos and pos.status]
+
     if not user:
         raise CustomException(msg="用户不存在", code=10401, status_code=401)
     if user.status == "1":
@@ -107,12 +127,6 @@ async def get_current_user(
     request.scope["user_id"] = user.id
     request.scope["user_username"] = user.username
 
-    # 过滤可用的角色和职位
-    if hasattr(user, "roles"):
-        user.roles = [role for role in user.roles if role and role.status]
-    if hasattr(user, "positions"):
-        user.positions = [pos for pos in user.positions if pos and pos.status]
-
     auth.user = user
     return auth
 
@@ -163,13 +177,12 @@ class AuthPermission:
         if not auth.user or not auth.user.roles:
             raise CustomException(msg="无权限操作", code=10403, status_code=403)
 
-        # 获取用户权限集合
-        user_permissions = {
-            menu.permission
-            for role in auth.user.roles
-            for menu in role.menus
-            if role.status == "0" and menu.permission and menu.status == "0"
-        }
+        # 获取用户权限集合(按角色预先计算的索引)
+        user_permissions = (
+            await RolePermissionCache.get(
+                db=auth.db, role_ids=[role.id for role in auth.user.roles if role.status == "0"]
+            )
+        ).permissions
 
         # 权限验证 - 满足任一权限即可
         if not any(perm in user_permissions for perm in self.permissions):
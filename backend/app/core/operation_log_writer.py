@@ -0,0 +1,264 @@
+import asyncio
+import json
+import threading
+from collections.abc import Coroutine
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.log.crud import OperationLogCRUD
+from app.api.v1.module_system.log.schema import OperationLogCreateSchema
+from app.config.setting import settings
+from app.core.database import async_db_session
+from app.core.logger import log
+from app.utils.ip_local_util import IpLocalUtil
+
+# 队列中的日志：(请求时间, 日志数据)
+LogItem = tuple[datetime, OperationLogCreateSchema]
+
+
+class OperationLogWriter:
+    """
+    操作日志异步批量写入
+
+    请求处理完成后只把日志放入有界队列，由后台任务按批(OPERATION_LOG_BATCH_SIZE 条或等待
+    OPERATION_LOG_FLUSH_INTERVAL 秒)查询IP归属地并一次写入，请求不再等待IP查询和日志事务。
+    队列已满或写入失败时按 OPERATION_LOG_OVERFLOW 丢弃或追加到磁盘暂存文件，暂存的日志在
+    队列空闲且数据库可写时补写。应用关闭时等待队列写完，超时未写完的日志(包括正在写入的一批)
+    同样按溢出策略处理。暂存文件的读写在线程中执行，不阻塞事件循环。
+    """
+
+    _queue: "asyncio.Queue[LogItem] | None" = None
+    _worker: asyncio.Task | None = None
+    _pending: list[LogItem] = []
+    _tasks: set[asyncio.Task] = set()
+    # 暂存文件的追加和改名可能在多个线程中同时进行
+    _spill_lock = threading.Lock()
+    _written: int = 0
+    _dropped: int = 0
+    _spilled: int = 0
+
+    @classmethod
+    def start(cls) -> None:
+        """创建队列并启动后台写入任务（应用启动时调用）"""
+        if cls._worker is not None:
+            return
+        cls._queue = asyncio.Queue(maxsize=settings.OPERATION_LOG_QUEUE_SIZE)
+        cls._worker = asyncio.create_task(cls._run(), name="operation-log-writer")
+
+    @classmethod
+    def put(cls, data: OperationLogCreateSchema) -> None:
+        """
+        提交一条操作日志，不等待写入
+
+        参数:
+        - data (OperationLogCreateSchema): 日志数据，login_location 为空时由后台任务查询。
+        """
+        item = (datetime.now(), data)
+        if cls._queue is None:
+            # 未启动后台任务时(如未经过 lifespan)单独写入
+            cls._spawn(cls._flush([item]))
+            return
+        try:
+            cls._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            cls._spawn(cls._overflow([item]))
+
+    @classmethod
+    def _spawn(cls, coro: Coroutine[Any, Any, Any]) -> None:
+        """在后台执行，保留任务引用直到完成"""
+        task = asyncio.get_running_loop().create_task(coro)
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    async def stop(cls) -> None:
+        """等待队列写完并停止后台任务（应用关闭时调用）"""
+        if cls._queue is None or cls._worker is None:
+            return
+        try:
+            await asyncio.wait_for(cls._queue.join(), timeout=settings.OPERATION_LOG_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            log.warning(f"操作日志队列未能在 {settings.OPERATION_LOG_DRAIN_TIMEOUT}s 内写完")
+        cls._worker.cancel()
+        try:
+            await cls._worker
+        except asyncio.CancelledError:
+            pass
+        # 被取消时正在写入的一批仍在 _pending 中，其事务已回滚
+        remaining = cls._pending
+        while not cls._queue.empty():
+            remaining.append(cls._queue.get_nowait())
+        if remaining:
+            await cls._overflow(remaining)
+        cls._queue, cls._worker, cls._pending = None, None, []
+
+    @classmethod
+    def status(cls) -> dict:
+        """
+        获取写入队列状态
+
+        返回:
+        - dict: 队列长度、已写入、丢弃、暂存到磁盘的日志数。
+        """
+        return {
+            "queue_size": cls._queue.qsize() if cls._queue else 0,
+            "max_queue": settings.OPERATION_LOG_QUEUE_SIZE,
+            "written": cls._written,
+            "dropped": cls._dropped,
+            "spilled": cls._spilled,
+        }
+
+    @classmethod
+    async def _run(cls) -> None:
+        """后台任务：凑满一批或等待超时后写入"""
+        assert cls._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            cls._pending = [await cls._queue.get()]
+            deadline = loop.time() + settings.OPERATION_LOG_FLUSH_INTERVAL
+            while len(cls._pending) < settings.OPERATION_LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    cls._pending.append(await asyncio.wait_for(cls._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            # 写入完成前保留在 _pending 中，stop() 取消后台任务时不会丢失这一批
+            batch = cls._pending
+            written = await cls._flush(batch)
+            cls._pending = []
+            for _ in batch:
+                cls._queue.task_done()
+            if written and cls._queue.empty():
+                await cls._replay()
+
+    @classmethod
+    async def _flush(cls, batch: list[LogItem]) -> bool:
+        """
+        查询IP归属地并一次写入一批日志
+
+        参数:
+        - batch (list[LogItem]): 日志列表。
+
+        返回:
+        - bool: 是否写入成功，失败的日志已按溢出策略处理。
+        """
+        await cls._resolve_locations([data for _, data in batch])
+        try:
+            async with async_db_session() as session:
+                async with session.begin():
+                    await OperationLogCRUD(AuthSchema(db=session)).bulk_create(
+                        data=[
+                            {**data.model_dump(), "created_time": created_time, "updated_time": created_time}
+                            for created_time, data in batch
+                        ]
+                    )
+        except Exception as e:
+            log.error(f"写入操作日志失败({len(batch)}条): {e!s}")
+            await cls._overflow(batch)
+            return False
+        cls._written += len(batch)
+        return True
+
+    @classmethod
+    async def _resolve_locations(cls, items: list[OperationLogCreateSchema]) -> None:
+        """并发查询一批日志中不重复的IP归属地"""
+        ips = list({item.request_ip for item in items if item.request_ip and item.login_location is None})
+        if not ips:
+            return
+        results = await asyncio.gather(*(IpLocalUtil.get_ip_location(ip) for ip in ips), return_exceptions=True)
+        locations = {ip: None if isinstance(result, BaseException) else result for ip, result in zip(ips, results, strict=True)}
+        for item in items:
+            if item.request_ip and item.login_location is None:
+                item.login_location = locations.get(item.request_ip)
+
+    @classmethod
+    async def _overflow(cls, batch: list[LogItem]) -> None:
+        """按溢出策略丢弃或追加到磁盘暂存文件"""
+        if settings.OPERATION_LOG_OVERFLOW == "disk":
+            try:
+                await asyncio.to_thread(cls._append_spill_file, batch)
+                cls._spilled += len(batch)
+                return
+            except Exception as e:
+                log.error(f"操作日志暂存到磁盘失败: {e!s}")
+        cls._dropped += len(batch)
+        log.warning(f"丢弃操作日志 {len(batch)} 条")
+
+    @classmethod
+    def _append_spill_file(cls, batch: list[LogItem]) -> None:
+        """把日志追加到磁盘暂存文件(在线程中执行)"""
+        lines = "".join(
+            json.dumps({"created_time": created_time.isoformat(), "data": data.model_dump()}, ensure_ascii=False) + "\n"
+            for created_time, data in batch
+        )
+        path = settings.OPERATION_LOG_SPILL_FILE
+        with cls._spill_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+
+    @classmethod
+    def _take_spill_file(cls) -> Path | None:
+        """
+        把暂存文件改名后交给补写(在线程中执行)，补写期间新溢出的日志写入新文件
+
+        返回:
+        - Path | None: 待补写的文件，没有暂存的日志时为 None。
+        """
+        path = settings.OPERATION_LOG_SPILL_FILE
+        replay_path = path.with_name(f"{path.name}.replay")
+        # 上次补写未完成时先补写遗留的文件
+        if replay_path.exists():
+            return replay_path
+        with cls._spill_lock:
+            if not path.is_file() or not path.stat().st_size:
+                return None
+            path.replace(replay_path)
+        return replay_path
+
+    @staticmethod
+    def _read_spill_batch(f: IO[str], size: int) -> tuple[list[LogItem], bool]:
+        """
+        从暂存文件读取最多 size 条日志(在线程中执行)
+
+        返回:
+        - tuple[list[LogItem], bool]: 读取的日志，是否已读到文件末尾。
+        """
+        batch: list[LogItem] = []
+        while len(batch) < size:
+            line = f.readline()
+            if not line:
+                return batch, True
+            try:
+                record = json.loads(line)
+                batch.append(
+                    (
+                        datetime.fromisoformat(record["created_time"]),
+                        OperationLogCreateSchema.model_validate(record["data"]),
+                    )
+                )
+            except Exception as e:
+                log.error(f"跳过无法解析的暂存操作日志: {e!s}")
+        return batch, False
+
+    @classmethod
+    async def _replay(cls) -> None:
+        """补写磁盘暂存文件中的日志，再次失败的日志重新暂存"""
+        replay_path = await asyncio.to_thread(cls._take_spill_file)
+        if replay_path is None:
+            return
+        f = await asyncio.to_thread(replay_path.open, encoding="utf-8")
+        try:
+            done = False
+            while not done:
+                batch, done = await asyncio.to_thread(cls._read_spill_batch, f, settings.OPERATION_LOG_BATCH_SIZE)
+                if batch:
+                    await cls._flush(batch)
+        finally:
+            await asyncio.to_thread(f.close)
+        await asyncio.to_thread(replay_path.unlink, missing_ok=True)
+        log.info("已补写磁盘暂存的操作日志")
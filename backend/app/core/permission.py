@@ -1,12 +1,11 @@
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.sql.elements import ColumnElement
 
 from app.api.v1.module_system.auth.schema import AuthSchema
-from app.api.v1.module_system.dept.model import DeptModel
+from app.api.v1.module_system.dept.model import DeptClosureModel
 from app.api.v1.module_system.user.model import UserModel
-from app.utils.common_util import get_child_id_map, get_child_recursion
 
 
 class Permission:
@@ -80,13 +79,51 @@ class Permission:
         if self.auth.user.is_superuser:
             return None
 
+        # 可访问的部门范围，None表示不限制，两个集合都为空表示只能查看自己的数据；同一请求内只计算一次
+        memo_key = ("dept_scope", self.auth.user.id)
+        if memo_key not in self.auth._data_scope:
+            self.auth._data_scope[memo_key] = self.__dept_scope()
+        dept_scope = self.auth._data_scope[memo_key]
+        if dept_scope is None:
+            return None
+
+        # 如果有部门权限（2、3、5任一），使用部门过滤
+        dept_ids, subtree_root_ids = dept_scope
+        if (dept_ids or subtree_root_ids) and getattr(self.model, "created_by", None) is not None:
+            # 与闭包表做一次不相关的半连接：本部门/自定义部门只取自身(depth=0)，本部门及以下取整棵子树
+            scope_conditions = []
+            if subtree_root_ids:
+                scope_conditions.append(DeptClosureModel.ancestor_id.in_(subtree_root_ids))
+            if dept_ids:
+                scope_conditions.append(
+                    and_(DeptClosureModel.ancestor_id.in_(dept_ids), DeptClosureModel.depth == 0)
+                )
+            scope_users = (
+                select(UserModel.id)
+                .join(DeptClosureModel, DeptClosureModel.descendant_id == UserModel.dept_id)
+                .where(or_(*scope_conditions))
+            )
+            return self.model.created_id.in_(scope_users)
+
+        # 仅本人数据权限（1）、没有角色或没有任何有效权限范围，以及模型没有created_by关系时，只能查看自己的数据
+        created_id_attr = getattr(self.model, "created_id", None)
+        if created_id_attr is not None:
+            return created_id_attr == self.auth.user.id
+        return None
+
+    def __dept_scope(self) -> tuple[frozenset[int], frozenset[int]] | None:
+        """
+        根据用户角色计算可访问的部门范围
+
+        多个角色的权限取并集：全部数据 > 部门权限（2、3、5的并集）> 仅本人
+
+        Returns:
+            None表示不限制，否则为 (只含自身的部门ID, 含所有子部门的部门ID)
+        """
         # 如果用户没有角色,则只能查看自己的数据
         roles = getattr(self.auth.user, "roles", []) or []
         if not roles:
-            created_id_attr = getattr(self.model, "created_id", None)
-            if created_id_attr is not None:
-                return created_id_attr == self.auth.user.id
-            return None
+            return frozenset(), frozenset()
 
         # 获取用户所有角色的权限范围
         data_scopes = set()
@@ -102,54 +139,21 @@ class Permission:
         if self.DATA_SCOPE_ALL in data_scopes:
             return None
 
-        # 收集所有可访问的部门ID（2、3、5权限的并集）
-        accessible_dept_ids = set()
+        # 收集所有可访问的部门（2、3、5权限的并集）
+        dept_ids = set()
+        subtree_root_ids = set()
         user_dept_id = getattr(self.auth.user, "dept_id", None)
 
         # 处理自定义数据权限（5）
         if self.DATA_SCOPE_CUSTOM in data_scopes:
-            accessible_dept_ids.update(custom_dept_ids)
+            dept_ids.update(custom_dept_ids)
 
         # 处理本部门数据权限（2）
         if self.DATA_SCOPE_DEPT in data_scopes and user_dept_id is not None:
-            accessible_dept_ids.add(user_dept_id)
+            dept_ids.add(user_dept_id)
 
-        # 处理本部门及以下数据权限（3）
+        # 处理本部门及以下数据权限（3），子部门由闭包表在查询时展开
         if self.DATA_SCOPE_DEPT_AND_CHILD in data_scopes and user_dept_id is not None:
-            try:
-                # 查询所有部门并递归获取子部门
-                dept_sql = select(DeptModel)
-                dept_result = await self.auth.db.execute(dept_sql)
-                dept_objs = dept_result.scalars().all()
-                id_map = get_child_id_map(dept_objs)
-                # get_child_recursion返回的结果已包含自身ID和所有子部门ID
-                dept_with_children_ids = get_child_recursion(id=user_dept_id, id_map=id_map)
-                accessible_dept_ids.update(dept_with_children_ids)
-            except Exception:
-                # 查询失败时降级到本部门
-                accessible_dept_ids.add(user_dept_id)
-
-        # 如果有部门权限（2、3、5任一），使用部门过滤
-        if accessible_dept_ids:
-            creator_rel = getattr(self.model, "created_by", None)
-            # 优先使用关系过滤（性能更好）
-            if creator_rel is not None and hasattr(UserModel, "dept_id"):
-                return creator_rel.has(UserModel.dept_id.in_(list(accessible_dept_ids)))
-            # 降级方案：如果模型没有created_by关系但有created_id，则只能查看自己的数据
-            created_id_attr = getattr(self.model, "created_id", None)
-            if created_id_attr is not None:
-                return created_id_attr == self.auth.user.id
-            return None
+            subtree_root_ids.add(user_dept_id)
 
-        # 处理仅本人数据权限（1）
-        if self.DATA_SCOPE_SELF in data_scopes:
-            created_id_attr = getattr(self.model, "created_id", None)
-            if created_id_attr is not None:
-                return created_id_attr == self.auth.user.id
-            return None
-
-        # 默认情况：如果用户有角色但没有任何有效权限范围，只能查看自己的数据
-        created_id_attr = getattr(self.model, "created_id", None)
-        if created_id_attr is not None:
-            return created_id_attr == self.auth.user.id
-        return None
+        return frozenset(dept_ids - subtree_root_ids), frozenset(subtree_root_ids)
@@ -1,9 +1,10 @@
 import json
-from collections.abc import Awaitable
+from collections.abc import AsyncIterator, Awaitable
 from typing import Any
 
 from redis.asyncio.client import Redis
 
+from app.config.setting import settings
 from app.core.logger import log
 
 
@@ -30,6 +31,58 @@ class RedisCURD:
             log.error(f"批量获取缓存失败: {e!s}")
             return []
 
+    async def scan_keys(
+        self, pattern: str = "*", count: int | None = None, type_: str | None = None
+    ) -> AsyncIterator[list[str]]:
+        """按批迭代缓存键名
+
+        使用 SCAN 分多次遍历键空间，每次只遍历 count 个槽位，不会像 KEYS 一样长时间阻塞 Redis。
+        SCAN 可能重复返回同一个键，这里已去重；遍历期间新增或删除的键不保证返回。
+
+        参数:
+        - pattern (str, optional): 匹配模式,默认值为"*"。
+        - count (int | None, optional): 每次 SCAN 的 COUNT 提示值,默认值为 settings.REDIS_SCAN_COUNT。
+        - type_ (str | None, optional): 只返回指定类型(string/hash/list/set/zset/stream)的键,在服务端过滤(需要 Redis 6.0+),默认不过滤。
+
+        返回:
+        - AsyncIterator[list[str]]: 每次 SCAN 得到的非空键名列表,如果获取失败则停止迭代
+        """
+        count = count or settings.REDIS_SCAN_COUNT
+        seen: set[str] = set()
+        cursor = 0
+        while True:
+            try:
+                cursor, keys = await self.redis.scan(cursor=cursor, match=pattern, count=count, _type=type_)
+            except Exception as e:
+                log.error(f"扫描缓存键名失败: {e!s}")
+                return
+            keys = [key for key in keys if key not in seen]
+            if keys:
+                seen.update(keys)
+                yield keys
+            if not cursor:
+                return
+
+    async def scan_items(
+        self, pattern: str = "*", count: int | None = None, type_: str | None = None
+    ) -> AsyncIterator[list[tuple[str, Any]]]:
+        """按批迭代缓存键名和值
+
+        每批键名用一次 MGET 读取值，只适用于字符串类型的键，其他类型的键值为 None。
+
+        参数:
+        - pattern (str, optional): 匹配模式,默认值为"*"。
+        - count (int | None, optional): 每次 SCAN 的 COUNT 提示值,默认值为 settings.REDIS_SCAN_COUNT。
+        - type_ (str | None, optional): 只返回指定类型的键(需要 Redis 6.0+),默认不过滤。
+
+        返回:
+        - AsyncIterator[list[tuple[str, Any]]]: (键名, 值) 列表,扫描与读取之间过期的键值为 None
+        """
+        async for keys in self.scan_keys(pattern=pattern, count=count, type_=type_):
+            values = await self.mget(keys)
+            if values:
+                yield list(zip(keys, values, strict=True))
+
     async def get_keys(self, pattern: str = "*") -> list:
         """获取缓存键名
 
@@ -39,12 +92,10 @@ class RedisCURD:
         返回:
         - list: 返回匹配的缓存键名列表,如果获取失败则返回空列表
         """
-        try:
-            keys = await self.redis.keys(f"{pattern}")
-            return keys
-        except Exception as e:
-            log.error(f"获取缓存键名失败: {e!s}")
-            return []
+        keys = []
+        async for batch in self.scan_keys(pattern=pattern):
+            keys.extend(batch)
+        return keys
 
     async def get(self, key: str) -> Any:
         """获取缓存
@@ -191,8 +242,7 @@ class RedisCURD:
         - bool: 如果清空缓存成功则返回True,否则返回False
         """
         try:
-            keys = await self.redis.keys(f"{pattern}")
-            if keys:
+            async for keys in self.scan_keys(pattern=pattern):
                 await self.redis.delete(*keys)
             return True
         except Exception as e:
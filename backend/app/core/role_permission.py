@@ -0,0 +1,177 @@
+import asyncio
+from collections.abc import Iterable
+
+from redis.asyncio.client import Redis
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.menu.model import MenuModel
+from app.api.v1.module_system.role.model import RoleMenusModel
+from app.common.dataclasses import RolePermission
+from app.common.enums import RedisInitKeyConfig
+from app.core.logger import log
+
+# 前端导航使用的菜单类型(目录、菜单、外链)
+NAV_MENU_TYPES = (1, 2, 4)
+
+
+class RolePermissionCache:
+    """
+    角色权限索引
+
+    每个角色的可用权限标识和导航菜单ID只计算一次，以不可变集合保存在进程内，权限校验时按角色合并后直接查找，
+    不再通过 role.menus 加载整棵菜单。索引按 (全局版本, 角色版本) 失效：
+    - 全局版本：菜单变更(权限标识、状态、删除)时递增，使所有角色失效；
+    - 角色版本：角色菜单关系变更时递增，只使该角色失效。
+    版本号保存在 Redis 中，使多个进程的索引同时失效。
+    """
+
+    _redis: Redis | None = None
+    _entries: dict[int, tuple[str, RolePermission]] = {}
+    _tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def init(cls, redis: Redis) -> None:
+        """
+        设置用于读取版本号的 Redis 连接(应用启动时调用)
+
+        参数:
+        - redis (Redis): Redis连接。
+        """
+        cls._redis = redis
+
+    @classmethod
+    def _global_version_key(cls) -> str:
+        return f"{RedisInitKeyConfig.ROLE_PERMISSION.key}:version"
+
+    @classmethod
+    def _role_version_key(cls, role_id: int) -> str:
+        return f"{RedisInitKeyConfig.ROLE_PERMISSION.key}:version:{role_id}"
+
+    @classmethod
+    async def _versions(cls, role_ids: list[int]) -> dict[int, str] | None:
+        """一次读取全局版本和各角色版本，Redis 不可用时返回 None"""
+        if cls._redis is None:
+            return None
+        try:
+            values = await cls._redis.mget(
+                cls._global_version_key(), *[cls._role_version_key(role_id) for role_id in role_ids]
+            )
+        except Exception as e:
+            log.error(f"读取角色权限版本失败: {e!s}")
+            return None
+        global_version = values[0] or 0
+        return {role_id: f"{global_version}:{value or 0}" for role_id, value in zip(role_ids, values[1:], strict=True)}
+
+    @classmethod
+    async def get(cls, db: AsyncSession, role_ids: Iterable[int]) -> RolePermission:
+        """
+        获取多个角色合并后的权限索引
+
+        参数:
+        - db (AsyncSession): 数据库会话，索引未命中时使用。
+        - role_ids (Iterable[int]): 角色ID。
+
+        返回:
+        - RolePermission: 合并后的权限标识和导航菜单ID。
+        """
+        role_ids = sorted(set(role_ids))
+        if not role_ids:
+            return RolePermission(permissions=frozenset(), menu_ids=frozenset())
+
+        versions = await cls._versions(role_ids)
+        entries: dict[int, RolePermission] = {}
+        missing = []
+        for role_id in role_ids:
+            cached = cls._entries.get(role_id)
+            if versions is not None and cached and cached[0] == versions[role_id]:
+                entries[role_id] = cached[1]
+            else:
+                missing.append(role_id)
+
+        if missing:
+            loaded = await cls._load(db, missing)
+            for role_id in missing:
+                entries[role_id] = loaded[role_id]
+                if versions is not None:
+                    cls._entries[role_id] = (versions[role_id], loaded[role_id])
+
+        if len(entries) == 1:
+            return next(iter(entries.values()))
+        return RolePermission(
+            permissions=frozenset().union(*(entry.permissions for entry in entries.values())),
+            menu_ids=frozenset().union(*(entry.menu_ids for entry in entries.values())),
+        )
+
+    @classmethod
+    async def _load(cls, db: AsyncSession, role_ids: list[int]) -> dict[int, RolePermission]:
+        """一次查询计算多个角色的可用权限标识和导航菜单ID"""
+        rows = await db.execute(
+            select(RoleMenusModel.role_id, MenuModel.id, MenuModel.type, MenuModel.permission)
+            .join(MenuModel, MenuModel.id == RoleMenusModel.menu_id)
+            .where(RoleMenusModel.role_id.in_(role_ids), MenuModel.status == "0")
+        )
+        permissions: dict[int, set[str]] = {role_id: set() for role_id in role_ids}
+        menu_ids: dict[int, set[int]] = {role_id: set() for role_id in role_ids}
+        for role_id, menu_id, menu_type, permission in rows:
+            if permission:
+                permissions[role_id].add(permission)
+            if menu_type in NAV_MENU_TYPES:
+                menu_ids[role_id].add(menu_id)
+        return {
+            role_id: RolePermission(
+                permissions=frozenset(permissions[role_id]), menu_ids=frozenset(menu_ids[role_id])
+            )
+            for role_id in role_ids
+        }
+
+    @classmethod
+    async def invalidate(cls, role_ids: Iterable[int] | None = None, db: AsyncSession | None = None) -> None:
+        """
+        使角色权限索引失效
+
+        参数:
+        - role_ids (Iterable[int] | None): 菜单关系变更的角色ID，为 None 时(菜单变更)使所有角色失效。
+        - db (AsyncSession | None): 执行变更的数据库会话，传入时在事务提交后再失效一次，
+          避免提交前其他请求把旧数据按新版本写回索引。
+        """
+        keys = (
+            [cls._global_version_key()]
+            if role_ids is None
+            else [cls._role_version_key(role_id) for role_id in set(role_ids)]
+        )
+        await cls._bump(keys)
+        if db is not None:
+            event.listen(db.sync_session, "after_commit", lambda session: cls._schedule_bump(keys), once=True)
+
+    @classmethod
+    async def _bump(cls, keys: list[str]) -> None:
+        """递增版本号并清理本进程内的索引"""
+        if not keys:
+            return
+        global_key = cls._global_version_key()
+        if global_key in keys:
+            cls._entries.clear()
+        else:
+            prefix = f"{global_key}:"
+            for key in keys:
+                cls._entries.pop(int(key.removeprefix(prefix)), None)
+        if cls._redis is None:
+            return
+        try:
+            pipe = cls._redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(key)
+            await pipe.execute()
+        except Exception as e:
+            log.error(f"更新角色权限版本失败: {e!s}")
+
+    @classmethod
+    def _schedule_bump(cls, keys: list[str]) -> None:
+        """在事务提交回调中异步递增版本号"""
+        try:
+            task = asyncio.get_running_loop().create_task(cls._bump(keys))
+        except RuntimeError:
+            return
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
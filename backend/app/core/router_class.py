@@ -7,12 +7,9 @@ from fastapi import Request, Response
 from fastapi.routing import APIRoute
 from user_agents import parse
 
-from app.api.v1.module_system.auth.schema import AuthSchema
 from app.api.v1.module_system.log.schema import OperationLogCreateSchema
-from app.api.v1.module_system.log.service import OperationLogService
 from app.config.setting import settings
-from app.core.database import async_db_session
-from app.utils.ip_local_util import IpLocalUtil
+from app.core.operation_log_writer import OperationLogWriter
 
 """
 在 FastAPI 中，route_class 参数用于自定义路由的行为。
@@ -123,8 +120,6 @@ class OperationLogRoute(APIRoute):
                 if request.client:
                     request_ip = request.client.host
 
-            login_location = await IpLocalUtil.get_ip_location(request_ip) if request_ip else None
-
             # 判断请求是否来自api文档
             referer = request.headers.get("referer")
             request_from_swagger = referer and referer.endswith("docs")
@@ -134,30 +129,26 @@ class OperationLogRoute(APIRoute):
                 # 如果请求来自api文档，则不记录日志
                 pass
             else:
-                async with async_db_session() as session:
-                    async with session.begin():
-                        auth = AuthSchema(db=session)
-                        await OperationLogService.create_log_service(
-                            data=OperationLogCreateSchema(
-                                type=log_type,
-                                request_path=request.url.path,
-                                request_method=request.method,
-                                request_payload=payload,
-                                request_ip=request_ip,
-                                login_location=login_location,
-                                request_os=user_agent.os.family,
-                                request_browser=user_agent.browser.family,
-                                response_code=response.status_code,
-                                response_json=response_data.decode()
-                                if isinstance(response_data, (bytes, bytearray))
-                                else str(response_data),
-                                process_time=process_time,
-                                description=route.summary,
-                                created_id=current_user_id,
-                                updated_id=current_user_id,
-                            ),
-                            auth=auth,
-                        )
+                # 放入写入队列后直接返回，IP归属地由后台写入任务查询
+                OperationLogWriter.put(
+                    OperationLogCreateSchema(
+                        type=log_type,
+                        request_path=request.url.path,
+                        request_method=request.method,
+                        request_payload=payload,
+                        request_ip=request_ip,
+                        request_os=user_agent.os.family,
+                        request_browser=user_agent.browser.family,
+                        response_code=response.status_code,
+                        response_json=response_data.decode()
+                        if isinstance(response_data, (bytes, bytearray))
+                        else str(response_data),
+                        process_time=process_time,
+                        description=route.summary,
+                        created_id=current_user_id,
+                        updated_id=current_user_id,
+                    )
+                )
 
             return response
 
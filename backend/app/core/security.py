@@ -146,3 +146,25 @@ def decode_access_token(token: str) -> JWTPayloadSchema:
 
     except jwt.InvalidTokenError:
         raise CustomException(msg="token已失效,请重新登录", code=10401, status_code=401)
+
+
+def decode_request_token(request: Request, token: str) -> JWTPayloadSchema:
+    """
+    解析请求携带的JWT访问令牌,复用 RequestLogMiddleware 已解析并保存在 scope 中的结果
+
+    参数:
+    - request (Request): FastAPI请求对象。
+    - token (str): JWT访问令牌字符串。
+
+    返回:
+    - JWTPayloadSchema: 解析后的JWT有效载荷。
+
+    异常:
+    - CustomException: 解析失败时抛出,状态码为401。
+    """
+    cached = request.scope.get("token_payload")
+    if cached and cached[0] == token:
+        return cached[1]
+    payload = decode_access_token(token)
+    request.scope["token_payload"] = (token, payload)
+    return payload
@@ -0,0 +1,179 @@
+import asyncio
+import dataclasses
+import ipaddress
+from collections.abc import Iterable
+
+from redis.asyncio.client import Redis
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import log
+
+
+class IpSet:
+    """
+    IP地址集合，支持单个地址和CIDR网段
+
+    单个地址按字符串直接查找；网段按 (IP版本, 前缀长度) 分组保存网络号，
+    查找时每个前缀长度只做一次集合查找，与网段数量无关。
+    """
+
+    def __init__(self, items: Iterable[str] = ()) -> None:
+        """
+        编译IP列表
+
+        参数:
+        - items (Iterable[str]): IP地址或CIDR网段，无法解析的项按原字符串匹配。
+        """
+        self._exact: set[str] = set()
+        self._networks: dict[int, dict[int, set[int]]] = {4: {}, 6: {}}
+        for item in items:
+            item = str(item).strip()
+            if not item:
+                continue
+            self._exact.add(item)
+            if "/" not in item:
+                continue
+            try:
+                network = ipaddress.ip_network(item, strict=False)
+            except ValueError:
+                continue
+            shift = network.max_prefixlen - network.prefixlen
+            self._networks[network.version].setdefault(network.prefixlen, set()).add(
+                int(network.network_address) >> shift
+            )
+
+    def __contains__(self, ip: object) -> bool:
+        if not isinstance(ip, str) or not ip:
+            return False
+        if ip in self._exact:
+            return True
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        networks = self._networks[address.version]
+        if not networks:
+            return False
+        value = int(address)
+        return any((value >> (address.max_prefixlen - prefixlen)) in prefixes for prefixlen, prefixes in networks.items())
+
+
+@dataclasses.dataclass(frozen=True)
+class MiddlewareConfig:
+    demo_enable: bool = False
+    ip_white_list: IpSet = dataclasses.field(default_factory=IpSet)
+    white_api_list_path: frozenset[str] = frozenset()
+    ip_black_list: IpSet = dataclasses.field(default_factory=IpSet)
+
+
+class SystemConfigCache:
+    """
+    进程内的中间件系统配置快照
+
+    演示模式、IP黑白名单和API白名单在进程内保存为编译后的快照，请求处理时直接读取，不访问 Redis。
+    系统配置变更时 ParamsService 调用 notify 递增版本号并发布通知，各进程的后台任务收到通知后重新加载；
+    后台任务同时每隔 SYSTEM_CONFIG_REFRESH_INTERVAL 秒比较一次版本号，防止订阅断开期间漏掉通知。
+    """
+
+    _redis: Redis | None = None
+    _config: MiddlewareConfig = MiddlewareConfig()
+    _version: str | None = None
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def _version_key(cls) -> str:
+        return RedisInitKeyConfig.SYSTEM_CONFIG_VERSION.key
+
+    @classmethod
+    def get(cls) -> MiddlewareConfig:
+        """
+        获取当前配置快照
+
+        返回:
+        - MiddlewareConfig: 配置快照，未初始化时为默认配置(不拦截)。
+        """
+        return cls._config
+
+    @classmethod
+    async def init(cls, redis: Redis) -> None:
+        """
+        加载配置并启动变更监听任务(应用启动时调用，需在系统配置写入 Redis 之后)
+
+        参数:
+        - redis (Redis): Redis连接。
+        """
+        cls._redis = redis
+        await cls.refresh()
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls._listen(), name="system-config-listener")
+
+    @classmethod
+    async def close(cls) -> None:
+        """停止变更监听任务（应用关闭时调用）"""
+        task, cls._task = cls._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    @classmethod
+    async def refresh(cls) -> None:
+        """从 Redis 重新加载配置并编译为快照"""
+        # 延迟导入，避免与 ParamsService 循环导入
+        from app.api.v1.module_system.params.service import ParamsService
+
+        if cls._redis is None:
+            return
+        try:
+            version = await cls._redis.get(cls._version_key())
+            config = await ParamsService.get_system_config_for_middleware(cls._redis)
+        except Exception as e:
+            log.error(f"加载系统配置失败: {e!s}")
+            return
+        cls._config = MiddlewareConfig(
+            demo_enable=config["demo_enable"] in ["true", "True"],
+            ip_white_list=IpSet(config["ip_white_list"]),
+            white_api_list_path=frozenset(config["white_api_list_path"]),
+            ip_black_list=IpSet(config["ip_black_list"]),
+        )
+        cls._version = version
+
+    @classmethod
+    async def notify(cls, redis: Redis) -> None:
+        """
+        通知所有进程系统配置已变更，并立即刷新本进程的快照
+
+        参数:
+        - redis (Redis): Redis连接。
+        """
+        try:
+            version = await redis.incr(cls._version_key())
+            await redis.publish(cls._version_key(), version)
+        except Exception as e:
+            log.error(f"发布系统配置变更失败: {e!s}")
+        cls._redis = cls._redis or redis
+        await cls.refresh()
+
+    @classmethod
+    async def _listen(cls) -> None:
+        """后台任务：订阅变更通知，并定期比较版本号"""
+        while True:
+            try:
+                assert cls._redis is not None
+                async with cls._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(cls._version_key())
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=settings.SYSTEM_CONFIG_REFRESH_INTERVAL
+                        )
+                        if message is not None or await cls._redis.get(cls._version_key()) != cls._version:
+                            await cls.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"系统配置变更监听异常: {e!s}")
+                await asyncio.sleep(settings.SYSTEM_CONFIG_REFRESH_INTERVAL)
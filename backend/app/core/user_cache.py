@@ -0,0 +1,245 @@
+import asyncio
+import json
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from redis.asyncio.client import Redis
+from sqlalchemy import event, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.api.v1.module_system.dept.model import DeptModel
+from app.api.v1.module_system.role.model import RoleModel
+from app.api.v1.module_system.user.model import UserModel
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.base_model import MappedBase
+from app.core.logger import log
+
+
+class UserContextCache:
+    """
+    认证用户上下文缓存
+
+    get_current_user 每次请求都要加载用户及其角色、角色部门。这里把加载结果序列化后按
+    (全局版本, 用户版本) 存入 Redis，并在进程内用 LRU 保存解析后的快照：
+    - 全局版本：角色、部门变更时递增，使所有用户失效；
+    - 用户版本：用户本身变更时递增，只使该用户失效。
+    两个版本号与登录状态在同一次 Redis 往返中读取，版本一致时直接使用进程内快照，不再查询数据库。
+
+    角色菜单不在快照中，权限标识和菜单ID由 RolePermissionCache 按角色提供。
+    每次请求由快照还原新的脱离会话的用户对象，请求之间不共享，修改它不会影响其他请求和缓存。
+    """
+
+    _redis: Redis | None = None
+    _lru: "OrderedDict[int, tuple[str, dict[str, Any]]]" = OrderedDict()
+    _tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def init(cls, redis: Redis) -> None:
+        """
+        设置用于失效通知的 Redis 连接(应用启动时调用)
+
+        参数:
+        - redis (Redis): Redis连接。
+        """
+        cls._redis = redis
+
+    @classmethod
+    def _global_version_key(cls) -> str:
+        return f"{RedisInitKeyConfig.USER_CONTEXT.key}:version"
+
+    @classmethod
+    def _user_version_key(cls, user_id: int) -> str:
+        return f"{RedisInitKeyConfig.USER_CONTEXT.key}:version:{user_id}"
+
+    @classmethod
+    async def get_user(
+        cls, redis: Redis, db: AsyncSession, user_id: int, online_key: str
+    ) -> tuple[bool, UserModel | None]:
+        """
+        检查登录状态并获取用户上下文
+
+        参数:
+        - redis (Redis): Redis连接。
+        - db (AsyncSession): 数据库会话，缓存未命中时使用。
+        - user_id (int): 用户ID。
+        - online_key (str): 登录令牌的 Redis 键。
+
+        返回:
+        - tuple[bool, UserModel | None]: 是否在线，本次请求独有的用户对象(不存在时为 None)。
+        """
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.exists(online_key)
+            pipe.mget(cls._global_version_key(), cls._user_version_key(user_id))
+            online, (global_version, user_version) = await pipe.execute()
+        except Exception as e:
+            log.error(f"获取登录状态失败: {e!s}")
+            return False, None
+        if not online:
+            return False, None
+
+        version = f"{global_version or 0}:{user_version or 0}"
+        cached = cls._lru.get(user_id)
+        if cached and cached[0] == version:
+            cls._lru.move_to_end(user_id)
+            return True, cls._load_user(cached[1])
+
+        snapshot_key = f"{RedisInitKeyConfig.USER_CONTEXT.key}:{user_id}:{version}"
+        snapshot = None
+        try:
+            raw = await redis.get(snapshot_key)
+            snapshot = json.loads(raw) if raw else None
+        except Exception as e:
+            log.error(f"读取用户上下文缓存失败: {e!s}")
+
+        if snapshot is None:
+            # 只加载角色和角色部门，不沿 lazy="selectin" 关系级联加载菜单等
+            user = (
+                await db.execute(
+                    select(UserModel)
+                    .where(UserModel.id == user_id)
+                    .options(
+                        noload("*"),
+                        selectinload(UserModel.roles).options(
+                            noload("*"), selectinload(RoleModel.depts).noload("*")
+                        ),
+                    )
+                )
+            ).scalar_one_or_none()
+            if not user:
+                return True, None
+            snapshot = cls._dump_user(user)
+            try:
+                await redis.set(
+                    snapshot_key,
+                    json.dumps(snapshot, ensure_ascii=False),
+                    ex=settings.USER_CONTEXT_CACHE_EXPIRE,
+                )
+            except Exception as e:
+                log.error(f"写入用户上下文缓存失败: {e!s}")
+
+        cls._lru[user_id] = (version, snapshot)
+        cls._lru.move_to_end(user_id)
+        while len(cls._lru) > settings.USER_CONTEXT_CACHE_SIZE:
+            cls._lru.popitem(last=False)
+        return True, cls._load_user(snapshot)
+
+    @classmethod
+    async def invalidate(cls, user_ids: Iterable[int] | None = None, db: AsyncSession | None = None) -> None:
+        """
+        使用户上下文缓存失效
+
+        参数:
+        - user_ids (Iterable[int] | None): 变更的用户ID，为 None 时(角色、菜单、部门变更)使所有用户失效。
+        - db (AsyncSession | None): 执行变更的数据库会话，传入时在事务提交后再失效一次，
+          避免提交前其他请求把旧数据按新版本写回缓存。
+        """
+        keys = (
+            [cls._global_version_key()]
+            if user_ids is None
+            else [cls._user_version_key(user_id) for user_id in set(user_ids)]
+        )
+        await cls._bump(keys)
+        if db is not None:
+            event.listen(db.sync_session, "after_commit", lambda session: cls._schedule_bump(keys), once=True)
+
+    @classmethod
+    async def _bump(cls, keys: list[str]) -> None:
+        """递增版本号并清理本进程内的缓存"""
+        if not keys:
+            return
+        global_key = cls._global_version_key()
+        if global_key in keys:
+            cls._lru.clear()
+        else:
+            prefix = f"{global_key}:"
+            for key in keys:
+                cls._lru.pop(int(key.removeprefix(prefix)), None)
+        if cls._redis is None:
+            return
+        try:
+            pipe = cls._redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(key)
+            await pipe.execute()
+        except Exception as e:
+            log.error(f"更新用户上下文缓存版本失败: {e!s}")
+
+    @classmethod
+    def _schedule_bump(cls, keys: list[str]) -> None:
+        """在事务提交回调中异步递增版本号"""
+        try:
+            task = asyncio.get_running_loop().create_task(cls._bump(keys))
+        except RuntimeError:
+            return
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    def _dump_columns(cls, obj: MappedBase, exclude: tuple[str, ...] = ()) -> dict[str, Any]:
+        """把模型的列值转换为可 JSON 序列化的字典"""
+        data = {}
+        for attr in sa_inspect(type(obj)).column_attrs:
+            if attr.key in exclude:
+                continue
+            value = getattr(obj, attr.key)
+            if isinstance(value, (datetime, date, time)):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            data[attr.key] = value
+        return data
+
+    @classmethod
+    def _load_columns(cls, model: type[MappedBase], data: dict[str, Any]) -> MappedBase:
+        """由列值字典还原脱离会话的模型对象"""
+        columns = sa_inspect(model).columns
+        obj = model()
+        for key, value in data.items():
+            if isinstance(value, str) and key in columns:
+                try:
+                    python_type = columns[key].type.python_type
+                except NotImplementedError:
+                    python_type = None
+                if python_type in (datetime, date, time):
+                    value = python_type.fromisoformat(value)
+                elif python_type is Decimal:
+                    value = Decimal(value)
+            set_committed_value(obj, key, value)
+        return obj
+
+    @classmethod
+    def _dump_user(cls, user: UserModel) -> dict[str, Any]:
+        """序列化用户及其角色、角色部门(不含密码)"""
+        return {
+            "user": cls._dump_columns(user, exclude=("password",)),
+            "roles": [
+                {
+                    "role": cls._dump_columns(role),
+                    "depts": [dept.id for dept in role.depts],
+                }
+                for role in user.roles
+                if role
+            ],
+        }
+
+    @classmethod
+    def _load_user(cls, snapshot: dict[str, Any]) -> UserModel:
+        """由快照还原用户对象，关系直接设为已加载状态，不触发懒加载和反向关联；只保留可用角色"""
+        user = cls._load_columns(UserModel, snapshot["user"])
+        roles = []
+        for item in snapshot["roles"]:
+            if not item["role"].get("status"):
+                continue
+            role = cls._load_columns(RoleModel, item["role"])
+            set_committed_value(role, "depts", [cls._load_columns(DeptModel, {"id": id}) for id in item["depts"]])
+            roles.append(role)
+        set_committed_value(user, "roles", roles)
+        return user
@@ -36,7 +36,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
     from app.api.v1.module_system.dict.service import DictDataService
     from app.api.v1.module_system.params.service import ParamsService
     from app.plugin.module_application.job.tools.ap_scheduler import SchedulerUtil
+    from app.plugin.module_projects.datas.parse_pool import ParsePool
     from app.core.database import redis_connect  # 💡 导入你的这个函数
+    from app.core.user_cache import UserContextCache
+    from app.core.role_permission import RolePermissionCache
+    from app.core.system_config import SystemConfigCache
+    from app.core.operation_log_writer import OperationLogWriter
+    from app.utils.hash_bcrpy_util import PwdUtil
+    from app.utils.ip_local_util import IpLocalUtil
     try:
         await InitializeData().init_db()
         log.info(f"✅ {settings.DATABASE_TYPE}数据库初始化完成")
@@ -44,12 +51,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
         # 即使 import_modules_async 也会调，这里手动调一次能确保万无一失
         await redis_connect(app, status=True) 
         log.info("✅ Redis 物理连接已确立并挂载到 app.state")
+        UserContextCache.init(app.state.redis)
+        RolePermissionCache.init(app.state.redis)
         await import_modules_async(
             modules=settings.EVENT_LIST, desc="全局事件", app=app, status=True
         )
         log.info("✅ 全局事件模块加载完成")
         await ParamsService().init_config_service(redis=app.state.redis)
         log.info("✅ Redis系统配置初始化完成")
+        await SystemConfigCache.init(app.state.redis)
+        log.info("✅ 系统配置监听任务已启动")
         await DictDataService().init_dict_service(redis=app.state.redis)
         log.info("✅ Redis数据字典初始化完成")
         await SchedulerUtil.init_system_scheduler(redis=app.state.redis)
@@ -61,6 +72,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
             ws_callback=ws_limit_callback,
         )
         log.info("✅ 请求限流器初始化完成")
+        OperationLogWriter.start()
+        log.info("✅ 操作日志写入任务已启动")
 
         # 导入并显示最终的启动信息面板
         from app.common.enums import EnvironmentEnum
@@ -83,6 +96,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
     yield
 
     try:
+        # 先写完队列中的操作日志，再关闭数据库等资源
+        await OperationLogWriter.stop()
+        log.info("✅ 操作日志写入任务已停止")
+        await SystemConfigCache.close()
+        log.info("✅ 系统配置监听任务已停止")
         await import_modules_async(
             modules=settings.EVENT_LIST, desc="全局事件", app=app, status=False
         )
@@ -91,6 +109,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
         log.info("✅ 定时任务调度器已关闭")
         await FastAPILimiter.close()
         log.info("✅ 请求限制器已关闭")
+        ParsePool.shutdown()
+        log.info("✅ 图纸解析进程池已关闭")
+        PwdUtil.shutdown()
+        log.info("✅ 密码哈希线程池已关闭")
+        await IpLocalUtil.close()
         console_close()
 
     except Exception as e:
@@ -283,14 +283,19 @@ async def get_job_log_list_controller(
     - JSONResponse: 查询定时任务日志列表的JSON响应
     """
     order_by = [{"created_time": "desc"}]
-    result_dict_list = await JobLogService.get_job_log_list_service(
-        auth=auth, search=search, order_by=order_by
-    )
-    result_dict = await PaginationService.paginate(
-        data_list=result_dict_list,
-        page_no=page.page_no,
-        page_size=page.page_size,
-    )
+    if page.cursor is not None:
+        result_dict = await JobLogService.get_job_log_cursor_page_service(
+            auth=auth, page=page, search=search, order_by=order_by
+        )
+    else:
+        result_dict_list = await JobLogService.get_job_log_list_service(
+            auth=auth, search=search, order_by=order_by
+        )
+        result_dict = await PaginationService.paginate(
+            data_list=result_dict_list,
+            page_no=page.page_no,
+            page_size=page.page_size,
+        )
     log.info("查询定时任务日志列表成功")
     return SuccessResponse(data=result_dict, msg="查询定时任务日志列表成功")
 
@@ -8,6 +8,7 @@ from .model import JobLogModel, JobModel
 from .schema import (
     JobCreateSchema,
     JobLogCreateSchema,
+    JobLogOutSchema,
     JobLogUpdateSchema,
     JobUpdateSchema,
 )
@@ -161,6 +162,36 @@ class JobLogCRUD(CRUDBase[JobLogModel, JobLogCreateSchema, JobLogUpdateSchema]):
         """
         return await self.list(search=search, order_by=order_by, preload=preload)
 
+    async def get_obj_log_cursor_page_crud(
+        self,
+        page_size: int,
+        cursor: str | None,
+        count_mode: str,
+        search: dict | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> dict:
+        """
+        游标分页获取定时任务日志
+
+        参数:
+        - page_size (int): 每页数量
+        - cursor (str | None): 分页游标
+        - count_mode (str): 总数计算方式
+        - search (dict | None): 查询参数字典
+        - order_by (list[dict[str, str]] | None): 排序参数列表
+
+        返回:
+        - dict: 分页数据
+        """
+        return await self.cursor_page(
+            limit=page_size,
+            order_by=order_by or [{"created_time": "desc"}],
+            search=search or {},
+            out_schema=JobLogOutSchema,
+            cursor=cursor,
+            count_mode=count_mode,
+        )
+
     async def delete_obj_log_crud(self, ids: list[int]) -> None:
         """
         删除定时任务日志
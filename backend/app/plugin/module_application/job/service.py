@@ -1,4 +1,5 @@
 from app.api.v1.module_system.auth.schema import AuthSchema
+from app.core.base_params import PaginationQueryParam
 from app.core.exceptions import CustomException
 from app.utils.cron_util import CronUtil
 from app.utils.excel_util import ExcelUtil
@@ -260,6 +261,34 @@ class JobLogService:
         )
         return [JobLogOutSchema.model_validate(obj).model_dump() for obj in obj_list]
 
+    @classmethod
+    async def get_job_log_cursor_page_service(
+        cls,
+        auth: AuthSchema,
+        page: PaginationQueryParam,
+        search: JobLogQueryParam | None = None,
+        order_by: list[dict] | None = None,
+    ) -> dict:
+        """
+        游标分页获取定时任务日志
+
+        参数:
+        - auth (AuthSchema): 认证信息模型
+        - page (PaginationQueryParam): 分页查询参数模型
+        - search (JobLogQueryParam | None): 查询参数模型
+        - order_by (list[dict] | None): 排序参数列表
+
+        返回:
+        - dict: 分页数据
+        """
+        return await JobLogCRUD(auth).get_obj_log_cursor_page_crud(
+            page_size=page.page_size,
+            cursor=page.cursor,
+            count_mode=page.count_mode,
+            search=search.__dict__ if search else None,
+            order_by=order_by,
+        )
+
     @classmethod
     async def delete_job_log_service(cls, auth: AuthSchema, ids: list[int]) -> None:
         """
@@ -8,7 +8,22 @@ from app.core.database import async_db_session
 from app.core.exceptions import CustomException
 from datetime import datetime
 
+# OrdersOut 中从关联部件打平的字段
+COMPONENT_FIELDS = ("code", "spec", "count", "material", "unit_mass", "total_mass", "remark")
+
 class OrdersService:
+    @classmethod
+    def _orders_out_columns(cls) -> list:
+        """
+        OrdersOut 需要的列：工单自身的列加关联部件的列，列表查询按行直接构造输出，不加载ORM对象
+        :return: 查询列
+        """
+        order_columns = [
+            column for name, column in OrdersModel.__table__.columns.items()
+            if name in OrdersOut.model_fields and name not in COMPONENT_FIELDS
+        ]
+        return [*order_columns, *(getattr(ComponentsModel, name).label(name) for name in COMPONENT_FIELDS)]
+
     @classmethod
     async def get_uncreate_list_service(cls, page_no: int, page_size: int, search: any):
         """
@@ -22,7 +37,7 @@ class OrdersService:
             # 1. 构建左连接查询：ComponentsModel为主，关联 OrdersModel
             # 逻辑：找出那些在 OrdersModel 中没有对应记录的组件
             stmt = (
-                select(ComponentsModel)
+                select(*(getattr(ComponentsModel, name) for name in ("wtcode", *COMPONENT_FIELDS)))
                 .outerjoin(OrdersModel, ComponentsModel.wtcode == OrdersModel.wtcode)
                 .where(OrdersModel.wtcode.is_(None))
             )
@@ -44,12 +59,12 @@ class OrdersService:
             if page_size > 0:
                 stmt = stmt.offset((page_no - 1) * page_size).limit(page_size)
 
-            # 6. 执行查询
+            # 6. 执行查询，只取输出需要的列
             result = await session.execute(stmt)
-            items = result.scalars().all()
+            items = result.all()
 
-            # 7. 格式化数据：利用 Pydantic 模型验证实现自动打平和前缀映射
-            data_list = [ComponentsUncreateOut.model_validate(comp).model_dump(mode='json') for comp in items]
+            # 7. 格式化数据：由行直接构造
+            data_list = [ComponentsUncreateOut.model_validate(row._asdict()).model_dump(mode='json') for row in items]
 
             return {
                 "items": data_list,
@@ -71,8 +86,8 @@ class OrdersService:
         async with async_db_session() as session:
             # 1. 构建查询：OrdersModel 为主，关联 ComponentsModel 以便过滤项目和万通码
             stmt = (
-                select(OrdersModel)
-                .options(selectinload(OrdersModel.component))
+                select(*cls._orders_out_columns())
+                .select_from(OrdersModel)
                 .join(ComponentsModel, OrdersModel.wtcode == ComponentsModel.wtcode)
                 .where(
                     or_(
@@ -102,12 +117,12 @@ class OrdersService:
             if page_size > 0:
                 stmt = stmt.offset((page_no - 1) * page_size).limit(page_size)
 
-            # 6. 执行查询
+            # 6. 执行查询，部件字段已在查询中打平
             result = await session.execute(stmt)
-            items = result.scalars().all()
+            items = result.all()
 
-            # 7. 格式化数据：利用 Pydantic 模型的 model_validator 实现自动打平映射
-            data_list = [OrdersOut.model_validate(order).model_dump(mode='json') for order in items]
+            # 7. 格式化数据：由行直接构造
+            data_list = [OrdersOut.model_validate(row._asdict()).model_dump(mode='json') for row in items]
 
             return {
                 "items": data_list,
@@ -126,9 +141,11 @@ class OrdersService:
         :return: 分页结果
         """
         async with async_db_session() as session:
-            # 构建查询语句，预加载关联的组件数据
-            stmt = select(OrdersModel).options(
-                selectinload(OrdersModel.component)  # 替换为selectinload，对齐常用ORM写法
+            # 构建查询语句，只取输出需要的工单列和关联部件列
+            stmt = (
+                select(*cls._orders_out_columns())
+                .select_from(OrdersModel)
+                .outerjoin(ComponentsModel, OrdersModel.wtcode == ComponentsModel.wtcode)
             )
             
             # 过滤条件（可根据实际需求扩展）
@@ -148,9 +165,9 @@ class OrdersService:
             
             # 执行查询
             result = await session.execute(stmt)
-            # 格式化数据
-            items = result.scalars().all()
-            data_list = [OrdersOut.model_validate(order).model_dump(mode='json') for order in items]
+            # 格式化数据：由行直接构造
+            items = result.all()
+            data_list = [OrdersOut.model_validate(row._asdict()).model_dump(mode='json') for row in items]
             
             return {
                 "items": data_list,
@@ -4,6 +4,7 @@ from app.plugin.module_projects.projects.model import ProjectsModel
 from .schema import ComponentsCreate, ComponentsUpdate, ComponentsFilter, ComponentsOut
 from app.core.database import async_db_session
 from app.core.exceptions import CustomException
+from app.plugin.module_projects.rollups.service import RollupService
 
 class ComponentsService:
     @classmethod
@@ -63,6 +64,7 @@ class ComponentsService:
 
                 component = ComponentsModel(**data.model_dump(exclude_unset=True))
                 session.add(component)
+                await RollupService.refresh_components(session, [component.wtcode])
             return component
 
     @classmethod
@@ -86,8 +88,10 @@ class ComponentsService:
                     if not project:
                         raise CustomException(msg=f"项目编号 {data.project_code} 不存在")
 
+                old_wtcode = component.wtcode
                 for key, value in data.model_dump(exclude_unset=True).items():
                     setattr(component, key, value)
+                await RollupService.refresh_components(session, [old_wtcode, component.wtcode])
             return component
 
     @classmethod
@@ -101,3 +105,4 @@ class ComponentsService:
                 
                 for component in components:
                     await session.delete(component)
+                await RollupService.refresh_components(session, [component.wtcode for component in components])
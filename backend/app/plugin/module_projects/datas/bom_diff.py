@@ -0,0 +1,57 @@
+import math
+from typing import Any
+
+
+def values_equal(old: Any, new: Any) -> bool:
+    """
+    比较字段值，浮点数按相对误差比较
+
+    MySQL 的 FLOAT 是单精度，读回的质量会带尾差(1.1 -> 1.100000023841858)，
+    直接比较会把未变化的零件误判为修改。
+
+    参数:
+    - old (Any): 已保存的值。
+    - new (Any): 新解析的值。
+
+    返回:
+    - bool: 是否视为相等。
+    """
+    if isinstance(old, float) or isinstance(new, float):
+        if old is None or new is None:
+            return old is new
+        return math.isclose(old, new, rel_tol=1e-6, abs_tol=1e-9)
+    return old == new
+
+
+def diff_rows(
+    stored: dict[str, dict],
+    incoming: dict[str, dict],
+    fields: tuple[str, ...],
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    按 wtcode 比较已保存的行和新解析的行
+
+    参数:
+    - stored (dict[str, dict]): {wtcode: 数据库中的行}。
+    - incoming (dict[str, dict]): {wtcode: 新解析的行}。
+    - fields (tuple[str, ...]): 参与比较的字段。
+
+    返回:
+    - tuple[list[dict], list[dict], list[dict]]: 新增的行、删除的行、修改项；
+      修改项为 {"wtcode": ..., "changes": {字段: {"old": ..., "new": ...}}}。
+    """
+    added = [row for wtcode, row in incoming.items() if wtcode not in stored]
+    removed = [row for wtcode, row in stored.items() if wtcode not in incoming]
+    modified = []
+    for wtcode, row in incoming.items():
+        old_row = stored.get(wtcode)
+        if old_row is None:
+            continue
+        changes = {
+            field: {"old": old_row.get(field), "new": row.get(field)}
+            for field in fields
+            if not values_equal(old_row.get(field), row.get(field))
+        }
+        if changes:
+            modified.append({"wtcode": wtcode, "changes": changes})
+    return added, removed, modified
@@ -1,14 +1,17 @@
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Form, Request, UploadFile, Body
+from fastapi import APIRouter, Depends, Form, Path, Request, UploadFile, Body
 from fastapi.responses import JSONResponse
+from redis.asyncio.client import Redis
 
+from app.api.v1.module_system.auth.schema import AuthSchema
 from app.common.response import SuccessResponse
+from app.core.dependencies import AuthPermission, redis_getter
 from app.core.logger import log
 from app.core.router_class import OperationLogRoute
 
 from .service import DatasService
-from .schema import SaveDatasSchema
+from .schema import BomRevisionSchema, BulkSaveDatasSchema, SaveDatasSchema
 
 # 注意：prefix 设为 /datas，因为 module_projects 会自动生成 /projects 前缀
 # 最终路径将是 /api/v1/projects/datas/upload
@@ -39,12 +42,120 @@ async def upload_file_controller(
     description="保存解析后的数据到数据库",
 )
 async def save_data_controller(
-    payload: SaveDatasSchema
+    payload: SaveDatasSchema,
+    auth: Annotated[AuthSchema, Depends(AuthPermission(check_data_scope=False))],
 ) -> JSONResponse:
     """
     保存前端数据到数据库
     """
-    result =await DatasService.save_datas_service(payload)
+    result =await DatasService.save_datas_service(auth=auth, payload=payload)
     msg = f"保存数据成功! 新增项目: {result.get('projects_added')}, 新增部件: {result.get('components_added')}, 新增零件: {result.get('parts_added')}"
     log.info(msg)
     return SuccessResponse(data=result, msg=msg)
+
+@DatasRouter.post(
+    "/savedatas/bulk",
+    summary="批量保存BOM",
+    description="一次保存项目下的多个部件及其零件，按万通码批量插入或更新",
+)
+async def bulk_save_data_controller(
+    payload: BulkSaveDatasSchema,
+    auth: Annotated[AuthSchema, Depends(AuthPermission(check_data_scope=False))],
+) -> JSONResponse:
+    """
+    批量保存BOM到数据库
+    """
+    result = await DatasService.bulk_save_datas_service(auth=auth, payload=payload)
+    msg = (
+        f"批量保存成功! 新增项目: {result['projects_added']}, "
+        f"部件 新增/更新/跳过: {result['components_added']}/{result['components_updated']}/{result['components_skipped']}, "
+        f"零件 新增/更新/跳过: {result['parts_added']}/{result['parts_updated']}/{result['parts_skipped']}"
+    )
+    log.info(msg)
+    return SuccessResponse(data=result, msg=msg)
+
+@DatasRouter.post(
+    "/diff",
+    summary="比较BOM修订",
+    description="与已保存的部件和零件比较，返回新增、删除、修改明细；apply为true时只写入差异",
+)
+async def diff_data_controller(
+    payload: BomRevisionSchema,
+    auth: Annotated[AuthSchema, Depends(AuthPermission(check_data_scope=False))],
+) -> JSONResponse:
+    """
+    比较BOM修订并可选写入差异
+    """
+    result = await DatasService.diff_datas_service(auth=auth, payload=payload)
+    stats = result["stats"]
+    msg = (
+        f"{'已写入' if result['applied'] else '比较完成'}! "
+        f"零件 新增/删除/修改: {stats['parts_added']}/{stats['parts_removed']}/{stats['parts_modified']}"
+    )
+    log.info(msg)
+    return SuccessResponse(data=result, msg=msg)
+
+@DatasRouter.post(
+    "/import",
+    summary="创建BOM导入任务",
+    description="上传图纸后立即返回任务ID，解析在后台执行",
+)
+async def create_import_job_controller(
+    file: UploadFile,
+    redis: Annotated[Redis, Depends(redis_getter)],
+    target_path: Annotated[str | None, Form(description="目标目录路径")] = None,
+) -> JSONResponse:
+    """
+    创建BOM导入任务
+    """
+    result_dict = await DatasService.create_import_job_service(
+        redis=redis, file=file, target_path=target_path
+    )
+    log.info(f"创建BOM导入任务成功: {result_dict['job_id']}")
+    return SuccessResponse(data=result_dict, msg="创建导入任务成功")
+
+@DatasRouter.post(
+    "/import/batch",
+    summary="创建批量导入BOM任务",
+    description="一次上传多个图纸或包含图纸的ZIP，立即返回任务ID；批量转换和并发解析在后台执行，结果为每个图纸的BOM概要",
+)
+async def batch_import_controller(
+    files: list[UploadFile],
+    redis: Annotated[Redis, Depends(redis_getter)],
+) -> JSONResponse:
+    """
+    创建批量导入BOM任务
+    """
+    result_dict = await DatasService.batch_import_service(redis=redis, files=files)
+    log.info(f"创建批量导入BOM任务成功: {result_dict['job_id']}")
+    return SuccessResponse(data=result_dict, msg="创建批量导入任务成功")
+
+@DatasRouter.get(
+    "/import/{job_id}",
+    summary="获取BOM导入任务状态",
+    description="查询导入任务的阶段和进度",
+)
+async def get_import_job_controller(
+    job_id: Annotated[str, Path(description="任务ID")],
+    redis: Annotated[Redis, Depends(redis_getter)],
+) -> JSONResponse:
+    """
+    获取导入任务状态
+    """
+    result_dict = await DatasService.get_import_job_service(redis=redis, job_id=job_id)
+    return SuccessResponse(data=result_dict, msg="获取导入任务状态成功")
+
+@DatasRouter.get(
+    "/import/{job_id}/result",
+    summary="获取BOM导入任务结果",
+    description="任务完成后获取解析后的树形BOM数据",
+)
+async def get_import_job_result_controller(
+    job_id: Annotated[str, Path(description="任务ID")],
+    redis: Annotated[Redis, Depends(redis_getter)],
+) -> JSONResponse:
+    """
+    获取导入任务结果
+    """
+    result_dict = await DatasService.get_import_job_result_service(redis=redis, job_id=job_id)
+    return SuccessResponse(data=result_dict, msg="获取导入任务结果成功")
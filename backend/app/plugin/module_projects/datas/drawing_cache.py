@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from app.config.setting import settings
+from app.core.logger import log
+
+# 解析器版本：dwg2dxf/dxf2dict/getwtcode/list2tree 的输出发生变化时必须递增，
+# 使旧版本解析出的缓存结果失效
+PARSER_VERSION = "1"
+
+
+class DrawingCache:
+    """
+    图纸解析缓存
+
+    以文件内容的 sha256 和解析器版本作为键，在磁盘上保存转换后的 DXF 和
+    list2tree 的最终结果。同一图纸重复上传时直接返回缓存，不再重新转换和解析。
+    缓存目录超过 DRAWING_CACHE_MAX_SIZE 时按最近使用时间淘汰。
+    主进程和解析进程都会读写该目录，所有写入都先写临时文件再原子替换。
+    """
+
+    DXF_NAME = "drawing.dxf"
+    RESULT_NAME = "result.json"
+
+    @classmethod
+    def file_hash(cls, file_path: str) -> str:
+        """
+        计算文件内容哈希
+
+        参数:
+        - file_path (str): 文件路径。
+
+        返回:
+        - str: sha256 十六进制摘要。
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def _entry_dir(cls, digest: str) -> Path:
+        """缓存条目目录"""
+        return Path(settings.DRAWING_CACHE_DIR) / f"{digest}_v{PARSER_VERSION}"
+
+    @classmethod
+    def _touch(cls, entry_dir: Path) -> None:
+        """更新条目的最近使用时间，用于淘汰排序"""
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+
+    @classmethod
+    def _atomic_write(cls, target: Path, write) -> None:
+        """写入临时文件后原子替换，避免读到写了一半的文件"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            write(tmp)
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    @classmethod
+    def get_result(cls, digest: str) -> dict | None:
+        """
+        获取缓存的解析结果
+
+        参数:
+        - digest (str): 文件内容哈希。
+
+        返回:
+        - dict | None: 解析结果，未命中返回None。
+        """
+        entry_dir = cls._entry_dir(digest)
+        try:
+            result = json.loads((entry_dir / cls.RESULT_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        cls._touch(entry_dir)
+        return result
+
+    @classmethod
+    def put_result(cls, digest: str, result: dict) -> None:
+        """
+        保存解析结果
+
+        参数:
+        - digest (str): 文件内容哈希。
+        - result (dict): list2tree 处理后的结果。
+        """
+        content = json.dumps(result, ensure_ascii=False)
+        try:
+            cls._atomic_write(
+                cls._entry_dir(digest) / cls.RESULT_NAME,
+                lambda path: path.write_text(content, encoding="utf-8"),
+            )
+        except OSError as e:
+            log.error(f"保存图纸解析缓存失败: {e!s}")
+            return
+        cls.evict()
+
+    @classmethod
+    def get_dxf(cls, digest: str) -> str | None:
+        """
+        获取缓存的DXF文件路径
+
+        参数:
+        - digest (str): 文件内容哈希。
+
+        返回:
+        - str | None: DXF文件路径，未命中返回None。
+        """
+        entry_dir = cls._entry_dir(digest)
+        dxf_path = entry_dir / cls.DXF_NAME
+        if not dxf_path.is_file():
+            return None
+        cls._touch(entry_dir)
+        return str(dxf_path)
+
+    @classmethod
+    def put_dxf(cls, digest: str, dxf_path: str) -> str:
+        """
+        缓存转换后的DXF文件
+
+        参数:
+        - digest (str): 源文件内容哈希。
+        - dxf_path (str): 转换后的DXF文件路径。
+
+        返回:
+        - str: 缓存中的DXF路径，缓存失败时返回原路径。
+        """
+        target = cls._entry_dir(digest) / cls.DXF_NAME
+        try:
+            cls._atomic_write(target, lambda path: shutil.copyfile(dxf_path, path))
+        except OSError as e:
+            log.error(f"保存DXF缓存失败: {e!s}")
+            return dxf_path
+        cls.evict()
+        return str(target)
+
+    @classmethod
+    def evict(cls) -> None:
+        """缓存目录超过上限时，按最近使用时间从旧到新删除条目"""
+        root = Path(settings.DRAWING_CACHE_DIR)
+        if not root.is_dir():
+            return
+        entries = []
+        total = 0
+        for entry_dir in root.iterdir():
+            if not entry_dir.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry_dir.iterdir() if f.is_file())
+                entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            except OSError:
+                continue  # 条目可能正被其他进程删除
+            total += size
+        if total <= settings.DRAWING_CACHE_MAX_SIZE:
+            return
+        for _, size, entry_dir in sorted(entries):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            if total <= settings.DRAWING_CACHE_MAX_SIZE:
+                break
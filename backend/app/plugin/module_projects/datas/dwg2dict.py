@@ -1,12 +1,22 @@
+import binascii
 import os
 import re
 import subprocess
 
+import ezdxf
+from ezdxf.entities import factory
+from ezdxf.entities.subentity import entity_linker
+from ezdxf.lldxf.extendedtags import ExtendedTags
+from ezdxf.lldxf.tagger import ascii_tags_loader, tag_compiler
+from ezdxf.lldxf.validator import is_binary_dxf_file, is_dxf_file
+from ezdxf.math import Vec3
+
 
 def dwg2dxf(
         dwg_path: str, 
         dxf_dir: str=None,
-        fix_CODEPAGE: bool=False
+        fix_CODEPAGE: bool=False,
+        timeout: int=None
     ) -> str:
     """
     封装 ODA 转换，并修复转换后的韩文乱码问题
@@ -14,7 +24,8 @@ def dwg2dxf(
         dwg_path (str): 要转换的dwg文件路径
         dxf_dir (str): 转换后的文件存放目录
         fix_CODEPAGE (bool): 是否修复dxf文件的编码要求
-    Return: 
+        timeout (int): ODA转换超时时间(秒)，None表示不限制
+    Return:
         str: 转换后的dxf文件路径
 
     # 1. 安装ODA
@@ -72,7 +83,8 @@ def dwg2dxf(
             cmd, 
             # env=env, 
             check=True, 
-            capture_output=True
+            capture_output=True,
+            timeout=timeout
         )
 
 
@@ -107,13 +119,61 @@ def dwg2dxf(
             
     except subprocess.CalledProcessError as e:
         return f"{e.stderr.decode()}"    
+    except subprocess.TimeoutExpired:
+        return f"ODAFileConverter timeout {timeout}s: {dwg_path}"
     
     return dxf_path
 
 
-import ezdxf
-from ezdxf.math import Vec3
-import binascii
+def dwgdir2dxf(
+        dwg_dir: str,
+        dxf_dir: str=None,
+        timeout: int=None
+    ) -> dict[str, str]:
+    """
+    封装 ODA 目录转换，一次调用转换目录下的全部dwg文件
+    Args:
+        dwg_dir (str): 要转换的dwg文件所在目录
+        dxf_dir (str): 转换后的文件存放目录，默认与dwg文件同目录
+        timeout (int): ODA转换超时时间(秒)，None表示不限制
+    Return:
+        dict[str, str]: {dwg文件路径: 转换后的dxf文件路径，失败时为错误信息}
+    """
+    if not os.path.isdir(dwg_dir): return {}
+    dwg_paths = sorted(
+        os.path.join(dwg_dir, f) for f in os.listdir(dwg_dir)
+        if os.path.splitext(f)[1] == ".dwg"
+    )
+    if not dwg_paths: return {}
+    if dxf_dir: os.makedirs(dxf_dir, exist_ok=True)
+    else: dxf_dir = dwg_dir
+
+    # 与 dwg2dxf 相同的参数，只是把单个文件名换成通配过滤
+    cmd = [
+        "ODAFileConverter",
+        os.path.abspath(dwg_dir),
+        dxf_dir,
+        "ACAD2004", "DXF", "0", "1", "*.dwg"
+    ]
+    try:
+        subprocess.run(
+            cmd,
+            check=True,
+            capture_output=True,
+            timeout=timeout
+        )
+    except subprocess.CalledProcessError as e:
+        return {dwg_path: f"{e.stderr.decode()}" for dwg_path in dwg_paths}
+    except subprocess.TimeoutExpired:
+        return {dwg_path: f"ODAFileConverter timeout {timeout}s: {dwg_dir}" for dwg_path in dwg_paths}
+
+    result = {}
+    for dwg_path in dwg_paths:  # 单个文件转换失败时 ODA 不会报错，只是没有输出
+        dxf_path = os.path.join(dxf_dir, os.path.basename(dwg_path).replace(".dwg", ".dxf"))
+        result[dwg_path] = dxf_path if os.path.isfile(dxf_path) else f"Not converted {dwg_path}"
+    return result
+
+
 pattern_blank = re.compile(r"\s+")
 pattern_format = re.compile(r'\\[fFhHwWkK].*?;|[{}]|\\P')
 pattern_m5 = re.compile(r'\\[Mm]\+5([0-9A-Fa-f]{4})')
@@ -154,21 +214,20 @@ def check_text(         # 把value拆分成{key: value}的格式，结果保存
             # 把value去掉value1后的部分传给自己，做迭代运算
             return check_text(key1, project_info[key1], project_info, project_info_keys)
 
-# 遍历MTEXT块，寻找项目信息
-def get_project_info(doc) -> dict:
+# 遍历MTEXT文本，寻找项目信息
+def get_project_info(mtext_list: list[str]) -> dict:
     """
-    深度遍历 DXF，以汉字解析方式提取MTEXT
+    以汉字解析方式从MTEXT文本中提取项目信息
     Args:
-        doc: dxf文件对象
+        mtext_list (list[str]): 模型空间中MTEXT的原始文本，按文件中的顺序
     Return: 
         dict: 项目信息
     """
     project_info = {}
     project_info_bak = None     # 项目信息备份，用于与第二个项目信息进行比对
     project_info_keys = ["项目名称", "合同号", "部件名称", "数量"]
-    mtexts = doc.modelspace().query("MTEXT")
-    for mtext in mtexts:        # 获取真正的text文字，进行空格分隔
-        for text in replace_sub(mtext.dxf.text).split():
+    for mtext in mtext_list:    # 获取真正的text文字，进行空格分隔
+        for text in replace_sub(mtext).split():
             if "项目名称" in text:
                 project_info["文件数量"] = project_info.get("文件数量", 0) + 1  # 获取页数统计，与其他页数对比
             check_text(None, text, project_info, project_info_keys)
@@ -180,6 +239,59 @@ def get_project_info(doc) -> dict:
         project_info_bak = project_info # 备份项目信息，方便下次进行比较
     return project_info
 
+# 流式扫描模型空间，只构建需要的实体
+def iter_modelspace(dxf_path: str, types: tuple[str, ...], encoding: str="gbk"):
+    """
+    单次顺序读取 DXF 标签流，按文件顺序产出模型空间中指定类型的实体
+    不加载整个文档，内存只与当前实体的标签数有关，与图纸大小无关
+    INSERT 后跟随的 ATTRIB 会挂到 insert.attribs 上，与 ezdxf.readfile 的结果一致
+    Args:
+        dxf_path (str): dxf文件路径
+        types (tuple[str, ...]): 需要的实体类型，如 ("INSERT", "MTEXT")
+        encoding (str): 文本编码，与 ezdxf.readfile 的 encoding 参数相同
+    Return:
+        Iterator[DXFGraphic]: 模型空间中的实体
+    """
+    if is_binary_dxf_file(dxf_path):    # 二进制DXF没有行结构，退回完整加载
+        doc = ezdxf.readfile(dxf_path, encoding=encoding)
+        yield from doc.modelspace().query(" ".join(types))
+        return
+    if not is_dxf_file(dxf_path):
+        raise OSError(f"File '{dxf_path}' is not a DXF file.")
+
+    requested = set(types)
+    if "INSERT" in requested:   # INSERT 的属性和结束标记是独立的实体
+        requested.update(("ATTRIB", "SEQEND"))
+    linked_entity = entity_linker() # 把 ATTRIB/SEQEND 链接到前一个 INSERT
+    queued = None       # 暂存的实体，等后面的 ATTRIB 收集完再产出
+    tags = []           # 当前实体的标签，不需要的实体不收集
+    in_entities = False
+    prev_tag = None
+    with open(dxf_path, encoding=encoding, errors="surrogateescape") as fp:
+        for tag in tag_compiler(ascii_tags_loader(fp)):
+            if not in_entities:
+                in_entities = (
+                    tag.code == 2 and tag.value == "ENTITIES"
+                    and prev_tag is not None and prev_tag.code == 0 and prev_tag.value == "SECTION"
+                )
+                prev_tag = tag
+                continue
+            if tag.code != 0:
+                if tags:
+                    tags.append(tag)
+                continue
+            if tags:    # 上一个实体的标签收集完成
+                entity = factory.load(ExtendedTags(tags))
+                if not linked_entity(entity) and entity.dxf.paperspace == 0:
+                    if queued:
+                        yield queued
+                    queued = entity
+            if tag.value == "ENDSEC":   # ENTITIES 段结束，后面的内容不再读取
+                break
+            tags = [tag] if tag.value in requested else []
+    if queued:
+        yield queued
+
 # 获取dxf文件数据
 def dxf2dict(dxf_path: str) -> dict:
     """
@@ -204,9 +316,13 @@ def dxf2dict(dxf_path: str) -> dict:
         "x",            # x坐标
         "y"             # y坐标
     ]
-    doc = ezdxf.readfile(dxf_path, encoding='gbk')
-    # 深度遍历模型空间中的 INSERT (块)
-    for insert in doc.modelspace().query("INSERT"):
+    mtext_list: list[str] = []  # MTEXT文本，扫描结束后再提取项目信息
+    # 单次扫描模型空间中的 INSERT (块) 和 MTEXT
+    for entity in iter_modelspace(dxf_path, ("INSERT", "MTEXT")):
+        if entity.dxftype() == "MTEXT":
+            mtext_list.append(entity.dxf.text)
+            continue
+        insert = entity
         block_name = insert.dxf.name            
         attr_text_list: list[str] = []
         for attr in insert.attribs:         # 提取属性文本 (ATTRIB)
@@ -240,7 +356,7 @@ def dxf2dict(dxf_path: str) -> dict:
     dxf_data_list.sort(key=lambda x: (x["x"], -x["y"])) # x轴增序，y轴降序
     dxf_data.update({"data": dxf_data_list})
     dxf_data["零件数量"] =  len(dxf_data_list)
-    project_info = get_project_info(doc)
+    project_info = get_project_info(mtext_list)
     if project_info.get("文件数量", 0) != dxf_data.get("文件个数", 0):
         msg = f"错误！！！表格个数❌ {project_info.get('文件数量', 0)} != {dxf_data.get('文件个数', 0)}"
         dxf_data["info"].append(msg)
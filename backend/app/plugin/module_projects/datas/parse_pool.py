@@ -0,0 +1,219 @@
+import asyncio
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from app.config.setting import settings
+from app.core.exceptions import CustomException
+from app.core.logger import log
+
+from .drawing_cache import DrawingCache
+from .dwg2dict import dwg2dxf, dwgdir2dxf, dxf2dict
+from .list2tree import list2tree
+from .wtdata import getwtcode
+
+
+def convert_drawing(file_path: str, digest: str | None = None) -> str:
+    """
+    DWG→DXF 转换，优先使用缓存中的DXF，在解析进程中执行
+
+    Args:
+        file_path (str): 上传的dwg/dxf文件路径
+        digest (str | None): 文件内容哈希，None表示不使用缓存
+    Return:
+        str: DXF文件路径，转换失败时为 dwg2dxf 返回的错误信息
+    """
+    if digest:
+        cached_dxf = DrawingCache.get_dxf(digest)
+        if cached_dxf:
+            return cached_dxf
+    dxf_path = dwg2dxf(file_path, timeout=settings.DXF_PARSE_TIMEOUT)
+    # 上传文件本身是dxf时不需要缓存副本
+    if digest and dxf_path != file_path and os.path.isfile(dxf_path):
+        return DrawingCache.put_dxf(digest, dxf_path)
+    return dxf_path
+
+
+def convert_drawings(file_paths: list[str], digests: list[str | None]) -> list[str]:
+    """
+    批量 DWG→DXF 转换，整个目录只调用一次 ODAFileConverter，在解析进程中执行
+
+    Args:
+        file_paths (list[str]): 同一目录下的dwg文件路径，目录中不应有其他dwg文件
+        digests (list[str | None]): 对应的文件内容哈希，None表示不使用缓存
+    Return:
+        list[str]: 与 file_paths 一一对应的DXF文件路径，转换失败时为错误信息
+    """
+    converted = dwgdir2dxf(
+        os.path.dirname(file_paths[0]),
+        timeout=settings.DXF_PARSE_TIMEOUT * len(file_paths),
+    )
+    dxf_paths = []
+    for file_path, digest in zip(file_paths, digests, strict=True):
+        dxf_path = converted.get(file_path, f"Not found {file_path}")
+        if digest and os.path.isfile(dxf_path):
+            dxf_path = DrawingCache.put_dxf(digest, dxf_path)
+        dxf_paths.append(dxf_path)
+    return dxf_paths
+
+
+def parse_drawing(file_path: str, digest: str | None = None) -> dict:
+    """
+    DWG→DXF→BOM 完整解析流程，在解析进程中执行
+
+    Args:
+        file_path (str): 上传的dwg/dxf文件路径
+        digest (str | None): 文件内容哈希，None表示不使用缓存
+    Return:
+        dict: list2tree 处理后的BOM数据
+    """
+    if digest:
+        cached_result = DrawingCache.get_result(digest)
+        if cached_result is not None:
+            return cached_result
+    result = list2tree(getwtcode(dxf2dict(convert_drawing(file_path, digest))))
+    if digest:
+        DrawingCache.put_result(digest, result)
+    return result
+
+
+class ParsePool:
+    """
+    图纸解析进程池
+
+    ODAFileConverter 转换和 ezdxf 解析都是阻塞/CPU密集操作，放到独立进程中执行，
+    避免卡住事件循环。并发数由 DXF_PARSE_MAX_WORKERS 限制，等待中的任务超过
+    DXF_PARSE_MAX_QUEUE 时直接拒绝。
+
+    任务超时或进程异常退出时，所在进程池被停用，新任务提交到新建的进程池；
+    停用的进程池中其他任务继续执行，全部结束后才终止其进程(包括超时的进程)。
+    ProcessPoolExecutor 中任一进程被终止都会使整个进程池失效，因此不能只终止超时的进程。
+    停用的进程池再出现异常时不会影响新的进程池。
+    """
+
+    _executor: ProcessPoolExecutor | None = None
+    _inflight: dict[ProcessPoolExecutor, int] = {}
+    _semaphore: asyncio.Semaphore | None = None
+    _waiting: int = 0
+    _running: int = 0
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        """
+        获取进程池，不存在时创建
+
+        使用 spawn 方式启动子进程，避免 fork 继承事件循环、数据库连接池等资源。
+        """
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(
+                max_workers=settings.DXF_PARSE_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return cls._executor
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """获取并发信号量"""
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(settings.DXF_PARSE_MAX_WORKERS)
+        return cls._semaphore
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor) -> None:
+        """终止进程池的所有进程"""
+        # ProcessPoolExecutor 无法取消已在运行的任务，只能直接终止子进程
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def _retire(cls, executor: ProcessPoolExecutor) -> None:
+        """停用进程池，下次提交时重新创建；已停用或已被替换的进程池不影响当前进程池"""
+        if cls._executor is executor:
+            cls._executor = None
+
+    @classmethod
+    def _release(cls, executor: ProcessPoolExecutor) -> None:
+        """任务结束，已停用的进程池中没有其他任务时终止其进程"""
+        cls._inflight[executor] -= 1
+        if cls._inflight[executor] > 0:
+            return
+        del cls._inflight[executor]
+        if executor is not cls._executor:
+            cls._terminate(executor)
+
+    @classmethod
+    async def run(cls, func: Callable[..., Any], *args: Any, timeout: int | None = None) -> Any:
+        """
+        在解析进程池中执行函数
+
+        参数:
+        - func (Callable): 模块级函数（需可被pickle）。
+        - *args (Any): 函数参数。
+        - timeout (int | None): 超时时间(秒)，默认 DXF_PARSE_TIMEOUT。
+
+        返回:
+        - Any: 函数返回值。
+
+        异常:
+        - CustomException: 排队已满、执行超时或解析进程异常退出时抛出。
+        """
+        timeout = timeout or settings.DXF_PARSE_TIMEOUT
+        semaphore = cls._get_semaphore()
+        if semaphore.locked() and cls._waiting >= settings.DXF_PARSE_MAX_QUEUE:
+            raise CustomException(msg="图纸解析任务繁忙，请稍后重试")
+
+        cls._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            cls._waiting -= 1
+
+        cls._running += 1
+        executor = cls._get_executor()
+        cls._inflight[executor] = cls._inflight.get(executor, 0) + 1
+        try:
+            future = executor.submit(func, *args)
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            log.error(f"图纸解析超时({timeout}s)，重建解析进程池")
+            cls._retire(executor)
+            raise CustomException(msg=f"图纸解析超时({timeout}s)")
+        except BrokenProcessPool:
+            log.error("解析进程异常退出，重建解析进程池")
+            cls._retire(executor)
+            raise CustomException(msg="图纸解析进程异常退出")
+        finally:
+            cls._release(executor)
+            cls._running -= 1
+            semaphore.release()
+
+    @classmethod
+    def status(cls) -> dict:
+        """
+        获取进程池状态
+
+        返回:
+        - dict: 进程数、执行中任务数、排队任务数。
+        """
+        return {
+            "max_workers": settings.DXF_PARSE_MAX_WORKERS,
+            "max_queue": settings.DXF_PARSE_MAX_QUEUE,
+            "running": cls._running,
+            "waiting": cls._waiting,
+        }
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """关闭进程池（应用关闭时调用）"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+        for executor in list(cls._inflight):
+            cls._terminate(executor)
+        cls._inflight = {}
+        cls._semaphore = None
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 from app.plugin.module_projects.projects.schema import ProjectsCreate
@@ -26,3 +26,51 @@ class SaveDatasSchema(BaseModel):
     projects: ProjectsImportSchema
     components: ComponentsImportSchema
     parts: List[PartsImportSchema]
+
+class BomComponentSchema(ComponentsImportSchema):
+    """批量保存中的一个部件及其零件"""
+    parts: List[PartsImportSchema] = Field(default_factory=list, description="零件列表")
+
+class BulkSaveDatasSchema(BaseModel):
+    """批量保存BOM，一次可保存同一项目下的多个部件"""
+    projects: ProjectsImportSchema
+    components: List[BomComponentSchema] = Field(..., min_length=1, description="部件列表")
+    mode: Literal["insert", "upsert"] = Field(
+        "insert", description="万通码已存在时的处理方式(insert:跳过 upsert:更新)"
+    )
+
+class BomRevisionSchema(BaseModel):
+    """BOM修订：与已保存的部件和零件比较，可选择只写入差异"""
+    projects: ProjectsImportSchema
+    components: List[BomComponentSchema] = Field(..., min_length=1, description="部件列表")
+    apply: bool = Field(False, description="是否写入差异，False时只返回比较结果")
+
+class ImportJobSchema(BaseModel):
+    """BOM导入任务状态"""
+    job_id: str = Field(..., description="任务ID")
+    filename: str = Field(..., description="文件名")
+    status: str = Field("pending", description="任务状态(pending/running/success/failed)")
+    stage: str = Field("queued", description="当前阶段(queued/converted/parsed/coded/built)")
+    progress: int = Field(0, description="进度百分比")
+    inserts: int = Field(0, description="已解析的明细行数量")
+    wtcodes: int = Field(0, description="已分配万通码的明细数量")
+    msg: Optional[str] = Field(None, description="错误信息")
+    created_time: str = Field(..., description="创建时间")
+    updated_time: str = Field(..., description="更新时间")
+
+class BatchImportFileSchema(ImportJobSchema):
+    """批量导入中单个图纸的BOM概要，完整结果通过 job_id 获取"""
+    component_code: Optional[str] = Field(None, description="部件编号")
+    component_name: Optional[str] = Field(None, description="部件名称")
+    project_name: Optional[str] = Field(None, description="项目名称")
+    contract_no: Optional[str] = Field(None, description="合同号")
+    part_count: int = Field(0, description="零件数量")
+    info: List[str] = Field(default_factory=list, description="解析过程中的提示信息")
+
+class BatchImportSchema(BaseModel):
+    """批量导入结果"""
+    batch_id: str = Field(..., description="批次ID")
+    total: int = Field(0, description="图纸总数")
+    success: int = Field(0, description="解析成功数")
+    failed: int = Field(0, description="解析失败数")
+    files: List[BatchImportFileSchema] = Field(default_factory=list, description="每个图纸的BOM概要")
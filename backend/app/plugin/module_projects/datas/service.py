@@ -1,32 +1,88 @@
+import asyncio
+import io
+import json
 import os
+import shutil
+import tempfile
+import uuid
+import zipfile
 from datetime import datetime
 from pathlib import Path
 
 from fastapi import UploadFile
+from redis.asyncio.client import Redis
 
+from app.common.enums import RedisInitKeyConfig
 from app.config.setting import settings
 from app.core.exceptions import CustomException
 from app.core.logger import log
 from app.core.database import async_db_session
-from sqlalchemy import select
+from app.core.redis_crud import RedisCURD
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.core.base_crud import CRUDBase
+from app.core.base_model import ModelMixin
+from app.utils.common_util import uuid4_str
 from app.plugin.module_projects.projects.model import ProjectsModel
 from app.plugin.module_projects.components.model import ComponentsModel
 from app.plugin.module_projects.parts.model import PartsModel
-from .schema import DatasUploadSchema, SaveDatasSchema
-from .dwg2dict import dwg2dxf, dxf2dict
+from app.plugin.module_projects.rollups.service import RollupService
+from .schema import (
+    BatchImportFileSchema,
+    BatchImportSchema,
+    BomComponentSchema,
+    BomRevisionSchema,
+    BulkSaveDatasSchema,
+    DatasUploadSchema,
+    ImportJobSchema,
+    ProjectsImportSchema,
+    SaveDatasSchema,
+)
+from .bom_diff import diff_rows
+from .drawing_cache import DrawingCache
+from .dwg2dict import dxf2dict
 from .list2tree import list2tree
+from .parse_pool import ParsePool, convert_drawing, convert_drawings, parse_drawing
 from .wtdata import getwtcode
 
 class DatasService:
     MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 100MB
+    DRAWING_EXTS = (".dwg", ".dxf")
+    # 每条多行INSERT的行数，避免超出SQLite等数据库的参数个数限制
+    BULK_CHUNK_SIZE = 500
+    BOM_COLUMNS = ("wtcode", "code", "spec", "count", "material", "unit_mass", "total_mass", "remark")
+    # 后台导入任务引用，防止任务在执行完之前被垃圾回收
+    _import_tasks: set[asyncio.Task] = set()
 
     @classmethod
-    async def upload_file_service(
+    def _resolve_save_dir(cls, target_path: str | None = None) -> str:
+        """
+        解析上传文件的保存目录，target_path 超出静态资源目录时忽略
+        """
+        # 使用静态资源目录下的 orders/data 目录
+        resource_root = str(settings.STATIC_ROOT)
+        save_dir = os.path.join(resource_root)
+
+        if target_path:
+            # 简单的路径组合，实际生产环境需要更严格的安全检查
+            # 这里为了简单，假设 target_path 是相对路径且不包含 ..
+            potential_path = os.path.join(save_dir, target_path.strip("/"))
+            # 确保路径在 save_dir 下
+            if os.path.commonpath([os.path.abspath(potential_path), os.path.abspath(save_dir)]) == os.path.abspath(save_dir):
+                 save_dir = potential_path
+        return save_dir
+
+    @classmethod
+    async def _save_upload_file(
         cls,
         file: UploadFile,
         target_path: str | None = None,
-        base_url: str | None = None,
-    ) -> dict:
+        filename: str | None = None,
+    ) -> str:
+        """
+        校验并保存上传文件，返回保存后的文件路径
+        """
         if not file or not file.filename:
             raise CustomException(msg="请选择要上传的文件")
 
@@ -34,32 +90,40 @@ class DatasService:
         if ".." in file.filename:
             raise CustomException(msg="文件名包含不安全字符")
 
-        try:
-            content = await file.read()
-            if len(content) > cls.MAX_UPLOAD_SIZE:
-                raise CustomException(msg=f"文件太大，最大支持{cls.MAX_UPLOAD_SIZE // (1024 * 1024)}MB")
+        content = await file.read()
+        if len(content) > cls.MAX_UPLOAD_SIZE:
+            raise CustomException(msg=f"文件太大，最大支持{cls.MAX_UPLOAD_SIZE // (1024 * 1024)}MB")
 
-            # 使用静态资源目录下的 orders/data 目录
-            resource_root = str(settings.STATIC_ROOT)
-            save_dir = os.path.join(resource_root)
-            
-            if target_path:
-                # 简单的路径组合，实际生产环境需要更严格的安全检查
-                # 这里为了简单，假设 target_path 是相对路径且不包含 ..
-                potential_path = os.path.join(save_dir, target_path.strip("/"))
-                # 确保路径在 save_dir 下
-                if os.path.commonpath([os.path.abspath(potential_path), os.path.abspath(save_dir)]) == os.path.abspath(save_dir):
-                     save_dir = potential_path
+        save_dir = cls._resolve_save_dir(target_path)
+        os.makedirs(save_dir, exist_ok=True)
 
-            os.makedirs(save_dir, exist_ok=True)
+        # 未指定文件名时每次请求使用独立文件名，避免并发上传互相覆盖源文件及转换出的 dxf
+        filename = filename or f"upload_{uuid.uuid4().hex}{os.path.splitext(file.filename)[1]}"
+        file_path = os.path.join(save_dir, filename)
 
-            filename = "upload_" + os.path.splitext(file.filename)[1]
-            file_path = os.path.join(save_dir, filename)
+        Path(file_path).write_bytes(content)
+        return file_path
 
-            Path(file_path).write_bytes(content)
+    @classmethod
+    async def upload_file_service(
+        cls,
+        file: UploadFile,
+        target_path: str | None = None,
+        base_url: str | None = None,
+    ) -> dict:
+        if not file or not file.filename:
+            raise CustomException(msg="请选择要上传的文件")
+
+        # 简单的安全检查
+        if ".." in file.filename:
+            raise CustomException(msg="文件名包含不安全字符")
+
+        try:
+            file_path = await cls._save_upload_file(file=file, target_path=target_path)
 
             # 生成访问 URL
             # 假设 STATIC_URL 是 /static
+            resource_root = str(settings.STATIC_ROOT)
             relative_path = os.path.relpath(file_path, resource_root)
             url_path = relative_path.replace(os.sep, "/")
             file_url = f"{settings.STATIC_URL}/{url_path}".replace("//", "/")
@@ -67,94 +131,653 @@ class DatasService:
             if base_url:
                  file_url = f"{base_url.rstrip('/')}{file_url}"
 
-            return list2tree(getwtcode(dxf2dict(dwg2dxf(file_path))))
+            # 同一图纸已解析过时直接返回缓存结果
+            digest = await cls._drawing_digest(file_path)
+            if digest:
+                cached_result = await asyncio.to_thread(DrawingCache.get_result, digest)
+                if cached_result is not None:
+                    return cached_result
+
+            # 转换和解析在解析进程池中执行，不阻塞事件循环
+            return await ParsePool.run(parse_drawing, file_path, digest)
 
         except Exception as e:
             log.error(f"文件上传失败: {e!s}")
             raise CustomException(msg=f"文件上传失败: {e!s}")
 
+    @classmethod
+    async def _drawing_digest(cls, file_path: str) -> str | None:
+        """计算图纸内容哈希，未启用解析缓存时返回None"""
+        if not settings.DRAWING_CACHE_ENABLE:
+            return None
+        return await asyncio.to_thread(DrawingCache.file_hash, file_path)
+
+    @classmethod
+    def _import_job_key(cls, job_id: str) -> str:
+        """导入任务状态的Redis键名"""
+        return f"{RedisInitKeyConfig.BOM_IMPORT_JOB.key}:{job_id}"
+
+    @classmethod
+    def _import_result_key(cls, job_id: str) -> str:
+        """导入任务结果的Redis键名"""
+        return f"{RedisInitKeyConfig.BOM_IMPORT_JOB.key}:{job_id}:result"
+
+    @classmethod
+    async def _update_import_job(cls, redis: Redis, job: ImportJobSchema, **kwargs) -> None:
+        """更新导入任务状态并写入Redis"""
+        for key, value in kwargs.items():
+            setattr(job, key, value)
+        job.updated_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        await RedisCURD(redis).set(
+            key=cls._import_job_key(job.job_id),
+            value=job.model_dump(),
+            expire=settings.BOM_IMPORT_JOB_EXPIRE,
+        )
+
+    @classmethod
+    async def create_import_job_service(
+        cls,
+        redis: Redis,
+        file: UploadFile,
+        target_path: str | None = None,
+    ) -> dict:
+        """
+        创建BOM导入任务：保存文件后立即返回任务ID，解析在后台执行
+        """
+        if not file or not file.filename:
+            raise CustomException(msg="请选择要上传的文件")
+
+        job_id = uuid.uuid4().hex
+        # 每个任务使用独立文件名，避免并发任务互相覆盖
+        filename = f"upload_{job_id}{os.path.splitext(file.filename)[1]}"
+        file_path = await cls._save_upload_file(file=file, target_path=target_path, filename=filename)
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        job = ImportJobSchema(job_id=job_id, filename=file.filename, created_time=now, updated_time=now)
+        await cls._update_import_job(redis, job)
+
+        task = asyncio.create_task(cls._run_import_job(redis, job, file_path))
+        cls._import_tasks.add(task)
+        task.add_done_callback(cls._import_tasks.discard)
+        return job.model_dump()
+
+    @classmethod
+    async def _run_import_job(cls, redis: Redis, job: ImportJobSchema, file_path: str) -> None:
+        """
+        后台执行导入任务，每完成一个阶段更新一次进度
+        """
+        try:
+            await cls._update_import_job(redis, job, status="running")
+
+            digest = await cls._drawing_digest(file_path)
+            res = await asyncio.to_thread(DrawingCache.get_result, digest) if digest else None
+            if res is None:
+                dxf_path = await ParsePool.run(convert_drawing, file_path, digest)
+                if not os.path.isfile(dxf_path):  # dwg2dxf 失败时返回错误信息
+                    raise CustomException(msg=f"图纸转换失败: {dxf_path}")
+                await cls._update_import_job(redis, job, stage="converted", progress=25)
+
+                res = await ParsePool.run(dxf2dict, dxf_path)
+                await cls._update_import_job(redis, job, stage="parsed", progress=50, inserts=len(res["data"]))
+
+                res = await ParsePool.run(getwtcode, res)
+                await cls._update_import_job(redis, job, stage="coded", progress=75, wtcodes=len(res["data"]))
+
+                res = await ParsePool.run(list2tree, res)
+                if digest:
+                    await asyncio.to_thread(DrawingCache.put_result, digest, res)
+
+            await RedisCURD(redis).set(
+                key=cls._import_result_key(job.job_id),
+                value=res,
+                expire=settings.BOM_IMPORT_JOB_EXPIRE,
+            )
+            await cls._update_import_job(redis, job, status="success", stage="built", progress=100)
+        except Exception as e:
+            log.error(f"BOM导入任务失败 {job.job_id}: {e!s}")
+            await cls._update_import_job(redis, job, status="failed", msg=str(e))
+
+    @classmethod
+    async def get_import_job_service(cls, redis: Redis, job_id: str) -> dict:
+        """
+        获取导入任务状态
+        """
+        data = await RedisCURD(redis).get(cls._import_job_key(job_id))
+        if not data:
+            raise CustomException(msg="导入任务不存在或已过期")
+        return json.loads(data)
+
+    @classmethod
+    async def get_import_job_result_service(cls, redis: Redis, job_id: str) -> dict:
+        """
+        获取导入任务解析结果
+        """
+        job = await cls.get_import_job_service(redis=redis, job_id=job_id)
+        if job["status"] != "success":
+            raise CustomException(msg=f"导入任务尚未完成: {job['status']}")
+        data = await RedisCURD(redis).get(cls._import_result_key(job_id))
+        if not data:
+            raise CustomException(msg="导入结果不存在或已过期")
+        return json.loads(data)
+
+    @classmethod
+    def _extract_zip_drawings(cls, content: bytes, batch_dir: str, start: int) -> list[tuple[str, str]]:
+        """
+        解压ZIP中的dwg/dxf图纸到批次目录，忽略目录结构和其他文件
+
+        参数:
+        - content (bytes): ZIP文件内容。
+        - batch_dir (str): 批次目录。
+        - start (int): 起始序号，用于生成不重名的文件名。
+
+        返回:
+        - list[tuple[str, str]]: [(原始文件名, 保存路径)]。
+        """
+        saved = []
+        try:
+            with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
+                for member in zip_file.infolist():
+                    filename = member.filename
+                    if not member.flag_bits & 0x800:  # 未标记UTF-8的文件名多为Windows下的GBK编码
+                        filename = filename.encode("cp437").decode("gbk", errors="replace")
+                    filename = os.path.basename(filename.rstrip("/"))
+                    ext = os.path.splitext(filename)[1].lower()
+                    if member.is_dir() or ext not in cls.DRAWING_EXTS:
+                        continue
+                    if member.file_size > cls.MAX_UPLOAD_SIZE:
+                        raise CustomException(msg=f"压缩包内文件太大: {filename}")
+                    if start + len(saved) >= settings.DXF_BATCH_MAX_FILES:
+                        raise CustomException(msg=f"图纸数量超出限制，最多{settings.DXF_BATCH_MAX_FILES}个")
+                    file_path = os.path.join(batch_dir, f"{start + len(saved):04d}{ext}")
+                    with zip_file.open(member) as src, open(file_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    saved.append((filename, file_path))
+        except zipfile.BadZipFile:
+            raise CustomException(msg="压缩包格式错误")
+        return saved
+
+    @classmethod
+    async def _save_batch_files(cls, files: list[UploadFile], batch_dir: str) -> list[tuple[str, str]]:
+        """
+        保存批量上传的图纸，ZIP会被解压；按序号重命名，避免同名文件互相覆盖
+
+        参数:
+        - files (list[UploadFile]): 上传的dwg/dxf/zip文件。
+        - batch_dir (str): 批次目录。
+
+        返回:
+        - list[tuple[str, str]]: [(原始文件名, 保存路径)]。
+
+        异常:
+        - CustomException: 文件过大、数量超限或没有图纸时抛出。
+        """
+        os.makedirs(batch_dir, exist_ok=True)
+        saved: list[tuple[str, str]] = []
+        for file in files:
+            if not file or not file.filename:
+                continue
+            content = await file.read()
+            if len(content) > cls.MAX_UPLOAD_SIZE:
+                raise CustomException(msg=f"文件太大，最大支持{cls.MAX_UPLOAD_SIZE // (1024 * 1024)}MB")
+            ext = os.path.splitext(file.filename)[1].lower()
+            if ext == ".zip":
+                saved.extend(await asyncio.to_thread(cls._extract_zip_drawings, content, batch_dir, len(saved)))
+            elif ext in cls.DRAWING_EXTS:
+                if len(saved) >= settings.DXF_BATCH_MAX_FILES:
+                    raise CustomException(msg=f"图纸数量超出限制，最多{settings.DXF_BATCH_MAX_FILES}个")
+                file_path = os.path.join(batch_dir, f"{len(saved):04d}{ext}")
+                await asyncio.to_thread(Path(file_path).write_bytes, content)
+                saved.append((os.path.basename(file.filename), file_path))
+        if not saved:
+            raise CustomException(msg="未找到可解析的dwg/dxf图纸")
+        return saved
+
+    @classmethod
+    async def batch_import_service(cls, redis: Redis, files: list[UploadFile]) -> dict:
+        """
+        创建批量导入任务：一个项目的全部图纸一次上传，保存到临时目录后立即返回任务ID，转换和解析在后台执行
+
+        任务状态和结果与单个图纸的导入任务相同，通过 /import/{job_id} 和 /import/{job_id}/result 获取；
+        结果为批次统计和每个图纸的BOM概要，每个图纸的完整结果按各自的 job_id 获取。
+
+        参数:
+        - redis (Redis): Redis客户端。
+        - files (list[UploadFile]): 上传的dwg/dxf文件或包含图纸的zip。
+
+        返回:
+        - dict: 导入任务状态。
+        """
+        # 批次文件只在解析期间使用，放在临时目录，不放在对外提供访问的静态资源目录
+        batch_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix="bom_batch_")
+        try:
+            saved = await cls._save_batch_files(files, batch_dir)
+        except BaseException:
+            await asyncio.to_thread(shutil.rmtree, batch_dir, True)
+            raise
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        job = ImportJobSchema(
+            job_id=uuid.uuid4().hex, filename=f"批量导入({len(saved)}个图纸)", created_time=now, updated_time=now
+        )
+        await cls._update_import_job(redis, job)
+
+        task = asyncio.create_task(cls._run_batch_import_job(redis, job, batch_dir, saved))
+        cls._import_tasks.add(task)
+        task.add_done_callback(cls._import_tasks.discard)
+        return job.model_dump()
+
+    @classmethod
+    async def _run_batch_import_job(
+        cls, redis: Redis, job: ImportJobSchema, batch_dir: str, saved: list[tuple[str, str]]
+    ) -> None:
+        """
+        后台执行批量导入任务，按解析进程数分组转换，再并发解析，结束后删除批次目录
+
+        未命中缓存的dwg平均分到 DXF_PARSE_MAX_WORKERS 个子目录，每个子目录只调用一次
+        ODAFileConverter。每个图纸的完整结果保存为一个已完成的导入任务。
+
+        参数:
+        - redis (Redis): Redis客户端。
+        - job (ImportJobSchema): 批量导入任务。
+        - batch_dir (str): 批次临时目录。
+        - saved (list[tuple[str, str]]): [(原始文件名, 保存路径)]。
+        """
+        try:
+            await cls._update_import_job(redis, job, status="running")
+            batch = await cls._batch_import(redis, job, batch_dir, saved)
+            await RedisCURD(redis).set(
+                key=cls._import_result_key(job.job_id),
+                value=batch.model_dump(),
+                expire=settings.BOM_IMPORT_JOB_EXPIRE,
+            )
+            await cls._update_import_job(
+                redis, job, status="success", stage="built", progress=100,
+                msg=f"成功: {batch.success}, 失败: {batch.failed}",
+            )
+        except Exception as e:
+            log.error(f"批量导入任务失败 {job.job_id}: {e!s}")
+            await cls._update_import_job(redis, job, status="failed", msg=str(e))
+        finally:
+            await asyncio.to_thread(shutil.rmtree, batch_dir, True)
+
+    @classmethod
+    async def _batch_import(
+        cls, redis: Redis, job: ImportJobSchema, batch_dir: str, saved: list[tuple[str, str]]
+    ) -> BatchImportSchema:
+        """分组转换、并发解析一个批次的图纸，并按完成数量更新任务进度"""
+        digests = await asyncio.gather(*(cls._drawing_digest(file_path) for _, file_path in saved))
+        results: list[dict | None] = list(await asyncio.gather(*(
+            asyncio.to_thread(DrawingCache.get_result, digest) if digest else asyncio.sleep(0)
+            for digest in digests
+        )))
+        cached_dxfs = await asyncio.gather(*(
+            asyncio.to_thread(DrawingCache.get_dxf, digest) if digest else asyncio.sleep(0)
+            for digest in digests
+        ))
+        errors: list[str | None] = [None] * len(saved)
+        sources = [file_path for _, file_path in saved]  # 解析入口：dxf路径或待转换的dwg路径
+        done = sum(result is not None for result in results)
+
+        async def advance(stage: str) -> None:
+            nonlocal done
+            done += 1
+            await cls._update_import_job(redis, job, stage=stage, progress=done * 99 // len(saved))
+
+        # 1. 需要转换的dwg按解析进程数分组，每组一次ODA转换
+        pending = [
+            i for i, source in enumerate(sources)
+            if results[i] is None and source.endswith(".dwg") and not cached_dxfs[i]
+        ]
+        group_count = min(settings.DXF_PARSE_MAX_WORKERS, len(pending))
+
+        async def convert_group(group: int, indexes: list[int]) -> None:
+            group_dir = os.path.join(batch_dir, f"group_{group}")
+            os.makedirs(group_dir, exist_ok=True)
+            paths = []
+            for i in indexes:
+                paths.append(os.path.join(group_dir, os.path.basename(sources[i])))
+                os.replace(sources[i], paths[-1])
+            try:
+                dxf_paths = await ParsePool.run(
+                    convert_drawings, paths, [digests[i] for i in indexes],
+                    timeout=settings.DXF_PARSE_TIMEOUT * (len(indexes) + 1),
+                )
+            except Exception as e:
+                dxf_paths = [str(e)] * len(indexes)
+            for i, dxf_path in zip(indexes, dxf_paths, strict=True):
+                if os.path.isfile(dxf_path):
+                    sources[i] = dxf_path
+                else:  # 转换失败时为错误信息
+                    errors[i] = f"图纸转换失败: {dxf_path}"
+                    await advance("converted")
+
+        await asyncio.gather(*(
+            convert_group(group, pending[group::group_count]) for group in range(group_count)
+        ))
+
+        # 2. 并发解析，同时提交的任务数不超过解析进程数，避免占满解析队列
+        semaphore = asyncio.Semaphore(settings.DXF_PARSE_MAX_WORKERS)
+
+        async def parse_one(i: int) -> None:
+            async with semaphore:
+                try:
+                    results[i] = await ParsePool.run(parse_drawing, sources[i], digests[i])
+                except Exception as e:
+                    errors[i] = str(e)
+            await advance("parsed")
+
+        await asyncio.gather(*(
+            parse_one(i) for i in range(len(saved)) if results[i] is None and errors[i] is None
+        ))
+
+        # 3. 每个图纸保存为一个已完成的导入任务，返回概要
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        batch = BatchImportSchema(batch_id=job.job_id, total=len(saved))
+        for (filename, _), res, error in zip(saved, results, errors, strict=True):
+            file_job = ImportJobSchema(job_id=uuid.uuid4().hex, filename=filename, created_time=now, updated_time=now)
+            if res is None:
+                log.error(f"批量导入图纸失败 {filename}: {error}")
+                await cls._update_import_job(redis, file_job, status="failed", msg=error)
+                batch.files.append(BatchImportFileSchema(**file_job.model_dump()))
+                batch.failed += 1
+                continue
+            await RedisCURD(redis).set(
+                key=cls._import_result_key(file_job.job_id),
+                value=res,
+                expire=settings.BOM_IMPORT_JOB_EXPIRE,
+            )
+            await cls._update_import_job(
+                redis, file_job, status="success", stage="built", progress=100, inserts=res.get("零件数量", 0)
+            )
+            batch.files.append(BatchImportFileSchema(
+                **file_job.model_dump(),
+                component_code=res.get("部件编号"),
+                component_name=res.get("部件名称"),
+                project_name=res.get("项目名称"),
+                contract_no=res.get("合同号"),
+                part_count=res.get("零件数量", 0),
+                info=res.get("info", []),
+            ))
+            batch.success += 1
+        return batch
+
+    @classmethod
+    async def save_datas_service(cls, auth: AuthSchema, payload: SaveDatasSchema) -> dict:
+        """
+        保存单个部件的BOM：已存在的项目、部件、零件跳过，不做修改
+        """
+        return await cls.bulk_save_datas_service(
+            auth,
+            BulkSaveDatasSchema(
+                projects=payload.projects,
+                components=[
+                    BomComponentSchema(**payload.components.model_dump(by_alias=True), parts=payload.parts)
+                ],
+            )
+        )
+
+    @classmethod
+    def _bom_rows(
+        cls, components: list[BomComponentSchema], user_id: int | None = None
+    ) -> tuple[dict[str, dict], dict[str, dict]]:
+        """
+        把部件及零件转换为待写入的行，同一请求内重复的万通码以最后一次为准
+        (否则 PostgreSQL 的 ON CONFLICT 会报错)
+
+        参数:
+        - components (list[BomComponentSchema]): 部件及零件。
+        - user_id (int | None): 操作人ID，写入创建人和更新人。
+
+        返回:
+        - tuple[dict[str, dict], dict[str, dict]]: {wtcode: 部件行}, {wtcode: 零件行}。
+        """
+        now = datetime.now()
+        component_rows: dict[str, dict] = {}
+        part_rows: dict[str, dict] = {}
+        for component in components:
+            component_rows[component.wtcode] = {
+                **component.model_dump(include=set(cls.BOM_COLUMNS)),
+                "uuid": uuid4_str(), "created_time": now, "updated_time": now,
+                "created_id": user_id, "updated_id": user_id,
+            }
+            for part in component.parts:
+                part_rows[part.wtcode] = {
+                    **part.model_dump(include=set(cls.BOM_COLUMNS)),
+                    "component_wtcode": component.wtcode,
+                    "uuid": uuid4_str(), "created_time": now, "updated_time": now,
+                    "created_id": user_id, "updated_id": user_id,
+                }
+        return component_rows, part_rows
+
+    @classmethod
+    async def _get_or_create_project(
+        cls,
+        session: AsyncSession,
+        projects: ProjectsImportSchema,
+        create: bool = True,
+        user_id: int | None = None,
+    ) -> tuple[ProjectsModel | None, int]:
+        """
+        按合同号或项目编码查找项目，不存在时新增
+
+        参数:
+        - session (AsyncSession): 数据库会话。
+        - projects (ProjectsImportSchema): 项目信息。
+        - create (bool): 不存在时是否新增。
+        - user_id (int | None): 操作人ID，新增时写入创建人和更新人。
+
+        返回:
+        - tuple[ProjectsModel | None, int]: 项目对象和新增数量(0或1)。
+        """
+        project_stmt = select(ProjectsModel).where(
+            (ProjectsModel.no == projects.no) |
+            (ProjectsModel.code == projects.code)
+        )
+        project = (await session.execute(project_stmt)).scalars().first()
+        if project or not create:
+            return project, 0
+        project = ProjectsModel(
+            name=projects.name, code=projects.code, no=projects.no, created_id=user_id, updated_id=user_id
+        )
+        session.add(project)
+        # 必须 flush 以确保后续部件能关联到项目编码
+        await session.flush()
+        return project, 1
+
+    @classmethod
+    async def _bulk_upsert(
+        cls,
+        auth: AuthSchema,
+        model: type[ModelMixin],
+        rows: list[dict],
+        update: bool,
+    ) -> tuple[int, int, int]:
+        """
+        分批多行写入，以 wtcode 判断是否已存在
+
+        参数:
+        - auth (AuthSchema): 认证信息，会话为写入使用的数据库会话。
+        - model (type[ModelMixin]): 模型类。
+        - rows (list[dict]): 待写入的行，wtcode 不重复。
+        - update (bool): 已存在时是否更新。
+
+        返回:
+        - tuple[int, int, int]: 新增、更新、跳过的行数。
+        """
+        added, existing = await CRUDBase(model, auth).upsert(
+            rows, index_elements=["wtcode"], update_fields=None if update else []
+        )
+        return (added, existing, 0) if update else (added, 0, existing)
 
     @classmethod
-    async def save_datas_service(cls, payload: SaveDatasSchema) -> dict:
+    async def bulk_save_datas_service(cls, auth: AuthSchema, payload: BulkSaveDatasSchema) -> dict:
         """
-        保存订单数据：先验证是否存在，不存在则插入
+        批量保存BOM：部件和零件按 wtcode 多行INSERT/UPSERT，几条语句写完整个BOM
+
+        参数:
+        - auth (AuthSchema): 认证信息模型，用户记录为创建人和更新人。
+        - payload (BulkSaveDatasSchema): 项目、部件及零件数据。
+
+        返回:
+        - dict: 项目、部件、零件的新增/更新/跳过数量。
         """
-        # 初始化统计数据
-        stats = {"project_added": 0, "component_added": 0, "parts_added": 0}
+        stats = {
+            "projects_added": 0,
+            "components_added": 0, "components_updated": 0, "components_skipped": 0,
+            "parts_added": 0, "parts_updated": 0, "parts_skipped": 0,
+        }
+        update = payload.mode == "upsert"
+        user_id = auth.user.id if auth.user else None
+        component_rows, part_rows = cls._bom_rows(payload.components, user_id)
+
         async with async_db_session() as session:
             async with session.begin():
+                session_auth = AuthSchema(db=session, user=auth.user, check_data_scope=auth.check_data_scope)
                 # 1. 处理项目信息 (根据 no 或 code 判断唯一性)
-                project_stmt = select(ProjectsModel).where(
-                    (ProjectsModel.no == payload.projects.no) | 
-                    (ProjectsModel.code == payload.projects.code)
+                project, stats["projects_added"] = await cls._get_or_create_project(
+                    session, payload.projects, user_id=user_id
                 )
-                project_result = await session.execute(project_stmt)
-                project = project_result.scalars().first()
-
-                if not project:
-                    project = ProjectsModel(
-                        name=payload.projects.name,
-                        code=payload.projects.code,
-                        no=payload.projects.no,
-                    )
-                    session.add(project)
-                    # 必须 flush 以确保后续组件能拿到 project_id 或正确的 code 关联
-                    await session.flush()
-                    stats["projects_added"] = 1  # 记录新增项目
-                else:
-                    # 如果项目已存在，直接使用查询到的对象，不进行任何修改
-                    pass
-
-                # 2. 处理组件信息 (根据 wtcode 判断唯一性)
-                component_stmt = select(ComponentsModel).where(
-                    ComponentsModel.wtcode == payload.components.wtcode
+
+                # 2. 部件，必须先于零件写入以满足外键
+                for row in component_rows.values():
+                    row["project_code"] = project.code
+                (
+                    stats["components_added"], stats["components_updated"], stats["components_skipped"]
+                ) = await cls._bulk_upsert(session_auth, ComponentsModel, list(component_rows.values()), update)
+
+                # 3. 零件，覆盖模式下已存在的零件可能从其他部件移过来，原部件的汇总也要刷新
+                affected = set(component_rows)
+                if update:
+                    part_wtcodes = list(part_rows)
+                    for start in range(0, len(part_wtcodes), cls.BULK_CHUNK_SIZE):
+                        affected.update((await session.execute(
+                            select(PartsModel.component_wtcode).distinct().where(
+                                PartsModel.wtcode.in_(part_wtcodes[start:start + cls.BULK_CHUNK_SIZE])
+                            )
+                        )).scalars().all())
+                (
+                    stats["parts_added"], stats["parts_updated"], stats["parts_skipped"]
+                ) = await cls._bulk_upsert(session_auth, PartsModel, list(part_rows.values()), update)
+
+                # 4. 部件汇总
+                await RollupService.refresh_components(session, affected)
+        return stats
+
+    @classmethod
+    async def _select_in(cls, session: AsyncSession, model: type[ModelMixin], column, values: list) -> list:
+        """按 IN 条件分批查询，避免参数个数超出数据库限制"""
+        objs = []
+        for start in range(0, len(values), cls.BULK_CHUNK_SIZE):
+            result = await session.execute(select(model).where(column.in_(values[start:start + cls.BULK_CHUNK_SIZE])))
+            objs.extend(result.scalars().all())
+        return objs
+
+    @classmethod
+    def _model_row(cls, obj: ModelMixin, fields: tuple[str, ...]) -> dict:
+        """把模型对象转换为用于比较的行"""
+        return {"id": obj.id, "wtcode": obj.wtcode, **{field: getattr(obj, field) for field in fields}}
+
+    @classmethod
+    async def diff_datas_service(cls, auth: AuthSchema, payload: BomRevisionSchema) -> dict:
+        """
+        比较新解析的BOM与已保存的部件和零件，apply 为 True 时在一个事务内只写入差异
+
+        零件按 wtcode 匹配：不存在的为新增，部件下已保存但本次没有的为删除，
+        字段不同(含所属部件变化)的为修改。部件只比较新增和修改，不删除。
+
+        参数:
+        - auth (AuthSchema): 认证信息模型，用户记录为创建人和更新人。
+        - payload (BomRevisionSchema): 项目、部件及零件数据。
+
+        返回:
+        - dict: 部件和零件的新增、删除、修改明细及统计。
+        """
+        user_id = auth.user.id if auth.user else None
+        component_rows, part_rows = cls._bom_rows(payload.components, user_id)
+        component_fields = tuple(c for c in cls.BOM_COLUMNS if c != "wtcode") + ("project_code",)
+        part_fields = tuple(c for c in cls.BOM_COLUMNS if c != "wtcode") + ("component_wtcode",)
+
+        async with async_db_session() as session:
+            async with session.begin():
+                project, projects_added = await cls._get_or_create_project(
+                    session, payload.projects, create=payload.apply, user_id=user_id
+                )
+                project_code = project.code if project else payload.projects.code
+                for row in component_rows.values():
+                    row["project_code"] = project_code
+
+                # 1. 一次查出相关的部件和零件：本次涉及的部件下的零件，以及本次万通码已存在的零件
+                stored_components = await cls._select_in(
+                    session, ComponentsModel, ComponentsModel.wtcode, list(component_rows)
                 )
-                comp_result = await session.execute(component_stmt)
-                component = comp_result.scalars().first()
-
-                if not component:
-                    component = ComponentsModel(
-                        # project_id=project.id,  # 建议使用 ID 关联更稳定
-                        project_code=project.code,
-                        # parent_code=payload.components.parent_code, # Aliased field
-                        wtcode=payload.components.wtcode,
-                        spec=payload.components.spec,
-                        code=payload.components.code,
-                        count=payload.components.count,
-                        material=payload.components.material,
-                        unit_mass=payload.components.unit_mass,
-                        total_mass=payload.components.total_mass,
-                        remark=payload.components.remark,
+                stored_parts = {
+                    obj.wtcode: obj for obj in await cls._select_in(
+                        session, PartsModel, PartsModel.component_wtcode, list(component_rows)
                     )
-                    session.add(component)
-                    await session.flush()
-                    stats["components_added"] = 1  # 记录新增组件
-
-                # 3. 处理明细信息 (Parts)
-                # 假设 parts 数量较多，先一次性查询出该组件下已存在的 wtcode
-                existing_parts_stmt = select(PartsModel.wtcode).where(
-                    PartsModel.component_wtcode == (component.wtcode if hasattr(component, 'wtcode') else None)
+                }
+                missing = [wtcode for wtcode in part_rows if wtcode not in stored_parts]
+                stored_parts.update(
+                    (obj.wtcode, obj) for obj in await cls._select_in(session, PartsModel, PartsModel.wtcode, missing)
+                )
+
+                # 2. 比较
+                stored_component_rows = {obj.wtcode: cls._model_row(obj, component_fields) for obj in stored_components}
+                stored_part_rows = {wtcode: cls._model_row(obj, part_fields) for wtcode, obj in stored_parts.items()}
+                components_added, _, components_modified = diff_rows(
+                    stored_component_rows, component_rows, component_fields
                 )
-                existing_parts_result = await session.execute(existing_parts_stmt)
-                existing_wtcodes = set(existing_parts_result.scalars().all())
-
-                for item in payload.parts:
-                    # 如果当前 wtcode 不在数据库中，则插入
-                    if item.wtcode not in existing_wtcodes:
-                        detail = PartsModel(
-                            # component_id=component.id, # 确保外键关联
-                            component_wtcode=component.wtcode,
-                            wtcode=item.wtcode,
-                            code=item.code,
-                            spec=item.spec,
-
-                            count=item.count,
-                            material=item.material,
-                            unit_mass=item.unit_mass,
-                            total_mass=item.total_mass,
-                            remark=item.remark,
+                parts_added, parts_removed, parts_modified = diff_rows(stored_part_rows, part_rows, part_fields)
+
+                # 3. 只写入差异
+                if payload.apply:
+                    if components_added:
+                        await session.execute(insert(ComponentsModel), components_added)
+                    for model, stored_rows, modified in (
+                        (ComponentsModel, stored_component_rows, components_modified),
+                        (PartsModel, stored_part_rows, parts_modified),
+                    ):
+                        if modified:
+                            await session.execute(update(model), [
+                                {
+                                    "id": stored_rows[item["wtcode"]]["id"],
+                                    "updated_time": datetime.now(),
+                                    "updated_id": user_id,
+                                    **{field: change["new"] for field, change in item["changes"].items()},
+                                }
+                                for item in modified
+                            ])
+                    removed_ids = [row["id"] for row in parts_removed]
+                    for start in range(0, len(removed_ids), cls.BULK_CHUNK_SIZE):
+                        await session.execute(
+                            delete(PartsModel).where(PartsModel.id.in_(removed_ids[start:start + cls.BULK_CHUNK_SIZE]))
                         )
-                        session.add(detail)
-                        stats["parts_added"] += 1  # 累加新增明细数量
-        # 5. 返回统计结果（你可以根据需要打印/记录日志/返回给前端）
-        return stats
+                    for start in range(0, len(parts_added), cls.BULK_CHUNK_SIZE):
+                        await session.execute(insert(PartsModel), parts_added[start:start + cls.BULK_CHUNK_SIZE])
+                    await RollupService.refresh_components(
+                        session, {*component_rows, *(row["component_wtcode"] for row in stored_part_rows.values())}
+                    )
+
+        def output(rows: list[dict], fields: tuple[str, ...]) -> list[dict]:
+            return [{"wtcode": row["wtcode"], **{field: row.get(field) for field in fields}} for row in rows]
+
+        return {
+            "applied": payload.apply,
+            "projects_added": projects_added,
+            "components": {
+                "added": output(components_added, component_fields),
+                "modified": components_modified,
+            },
+            "parts": {
+                "added": output(parts_added, part_fields),
+                "removed": output(parts_removed, part_fields),
+                "modified": parts_modified,
+            },
+            "stats": {
+                "components_added": len(components_added),
+                "components_modified": len(components_modified),
+                "parts_added": len(parts_added),
+                "parts_removed": len(parts_removed),
+                "parts_modified": len(parts_modified),
+                "parts_unchanged": len(part_rows) - len(parts_added) - len(parts_modified),
+            },
+        }
@@ -1,3 +1,4 @@
+from itertools import pairwise
 
 
 # 把列表分成专用件列表和外购件列表两个部分
@@ -13,16 +14,15 @@ def split_datas(base_code: str, datas: list) -> tuple:
 
 # 删除专用件列表中的杂项
 def del_dedicated(base_code: str, dedicated: list) -> tuple:
-    del_list = []           # 需要删除的列表
+    keep_list = []          # 保留的专用件
     info_list = []          # 需要返回的信息列表
-    for j, v in enumerate(dedicated):
+    for v in dedicated:
         if not is_comp_code(base_code, v["code"]):
             msg = f"删除专用件明细表中的外购件 {v['code']:20} {v['spec']:20}"
             info_list.append(msg)
-            del_list.append(j)  # 收集需要删除的索引
             print(msg)
-    for k in reversed(del_list):
-        dedicated.pop(k)    # 执行删除
+        else: keep_list.append(v)
+    dedicated[:] = keep_list    # 一次性删除，避免逐个pop的O(n²)
     return dedicated, info_list
 
 # 标准化编码规则
@@ -46,10 +46,10 @@ def comp_list(prev_list: list, curr_list: list) -> int:
     return index + 1
 
 import re
-pattern = r'(\d+)'
+pattern = re.compile(r'(\d+)')
 # 自定义字符串转整形
 def myint(code: str) -> int:
-    try: return int(re.findall(pattern, code)[0])
+    try: return int(pattern.findall(code)[0])
     except Exception as e: print(e); return 0
 
 # 自定义打印函数
@@ -150,6 +150,40 @@ def generate_wtcode(prev_wtcode: str, prev_code: str, curr_code: str) -> tuple:
             myprint(f'{"上级不连续编码":30} {prev_wtcode:30} {wtcode:30} {prev_code:30} {curr_code:30}')
             return ("upgap", wtcode)
 
+# 编码深度，即标准化后按"."分隔的级数
+def code_depth(code: str) -> int:
+    return standard(code).count(".") + 1
+
+# 一次线性遍历生成全部万通码，结果与逐行调用 generate_wtcode 相同
+def assign_wtcodes(first_wtcode: str, codes: list) -> list:
+    """
+    generate_wtcode 生成的万通码只取决于前后两个编码的深度差：
+    深度相同 -> 末级+1，深度增加 -> 追加".1"，深度减少n级 -> 倒数第n+1级+1并截断
+    因此每个编码只计算一次深度，万通码各级保存为整数，不再反复拆分和转换字符串
+    Args:
+        first_wtcode (str): 第一个编码的万通码(部件编号)
+        codes (list): 按顺序排列的编码
+    Return:
+        list: 与codes一一对应的万通码
+    """
+    depths = [code_depth(code) for code in codes]
+    segs = first_wtcode.split(".")  # 原始各级保持字符串，生成的级为整数
+    wtcodes = [first_wtcode]
+    for prev_depth, curr_depth in pairwise(depths):
+        if curr_depth > prev_depth:     # 下级编码
+            segs.append(1)
+        else:                           # 同级(n=1)或上级编码，倒数第n级+1
+            n = prev_depth - curr_depth + 1
+            if n > len(segs):           # 与 get_next_up_code 的越界行为一致
+                raise IndexError("list index out of range")
+            seg = segs[-n]
+            seq = (seg if isinstance(seg, int) else myint(seg)) + 1
+            del segs[len(segs) - n:]
+            if not segs: segs.append("")    # 与 ".".join([]) + "." + seq 的结果一致
+            segs.append(seq)
+        wtcodes.append(".".join(map(str, segs)))
+    return wtcodes
+
 # 检查数据并生成万通码
 def getwtcode(res: dict) -> dict:
     base_code = res["data"][0]["code"]    # 第一个默认为部件名称和编号
@@ -160,9 +194,11 @@ def getwtcode(res: dict) -> dict:
     dedicated, info_list = del_dedicated(base_code, dedicated)  # 删除专用件中的杂项
     res["info"].extend(info_list)
     # 处理专用件列表
-    dedicated[0]["wtcode"] = res["部件编号"]    # 第一个万通码默认是部件编号
+    # 第一个万通码默认是部件编号
+    wtcodes = assign_wtcodes(res["部件编号"], [item["code"] for item in dedicated])
+    for item, wtcode in zip(dedicated, wtcodes, strict=True):
+        item["wtcode"] = wtcode
     for m in range(1, len(dedicated)):
-        _, dedicated[m]["wtcode"] = generate_wtcode(dedicated[m - 1]["wtcode"], dedicated[m - 1]["code"], dedicated[m]["code"])
         if dedicated[m]["code"] == dedicated[0]["code"]:    # 如果有重复的部件编码
             msg = f"错误！！！部件编码重复❌ ({dedicated[m]['code']} {dedicated[m]['spec']} {dedicated[m]['total_mass']}), ({dedicated[0]['code']} {dedicated[0]['spec']} {dedicated[0]['total_mass']})"
             res["info"].append(msg)
@@ -175,9 +211,8 @@ def getwtcode(res: dict) -> dict:
         l = {'seq': '', 'code': '', 'spec': '外购件汇总', 'count': '1', 'material': '', 'unit_mass': '', 'total_mass': '', 'remark': '', 'x': '', 'y': ''}
         buy.insert(0, l)    # 给所有外购件加一个上级
         buy[0]["wtcode"] = get_first_buy_code(dedicated[len(dedicated) - 1]["wtcode"])
-        buy[1]["wtcode"] = get_child_code(buy[0]["wtcode"])        
-        for n in range(2, len(buy)):
-            buy[n]["wtcode"] = get_next_buy_code(buy[n - 1]["wtcode"])
+        for n in range(1, len(buy)):    # 与 get_child_code/get_next_buy_code 逐个递推的结果相同
+            buy[n]["wtcode"] = f"{buy[0]['wtcode']}.{n}"
         res["data"] = dedicated + buy   # 合并专用件和外购件
     else: res["data"] = dedicated
     return res
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, Query
 from app.common.response import SuccessResponse
 from app.core.base_params import PaginationQueryParam
 from .service import PartsService
-from .schema import PartsCreate, PartsUpdate, PartsFilter, PartsOut
+from .schema import PartsCreate, PartsUpdate, PartsFilter, PartsOut, PartsTreeFilter
 from app.core.router_class import OperationLogRoute
 from app.api.v1.module_system.auth.schema import AuthSchema
 from app.core.dependencies import AuthPermission
@@ -23,6 +23,14 @@ async def get_parts_list(
     )
     return SuccessResponse(data=data)
 
+@PartsRouter.get("/tree", summary="获取BOM树")
+async def get_parts_tree(
+    search: Annotated[PartsTreeFilter, Depends()],
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_projects:parts:query"]))]
+):
+    data = await PartsService.get_parts_tree_service(search=search)
+    return SuccessResponse(data=data)
+
 @PartsRouter.post("/create", summary="创建组件")
 async def create_parts(
     obj: PartsCreate,
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Integer, Float, ForeignKey
+from sqlalchemy import String, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.base_model import ModelMixin, UserMixin
 
@@ -11,7 +11,16 @@ class PartsModel(ModelMixin, UserMixin):
     零件表
     """
     __tablename__ = "projects_parts"
-    __table_args__ = {"comment": "零件表"}
+    # create_all 不会给已存在的表补建索引，已有数据库执行 sql/<数据库>/upgrade_2026-10-18_projects_parts_tree_index.sql
+    __table_args__ = (
+        # BOM树按部件和万通码前缀(LIKE 'x.%')查询子树
+        Index("ix_projects_parts_component_wtcode_wtcode", "component_wtcode", "wtcode"),
+        # PostgreSQL 在非C排序规则下，普通索引不能用于 LIKE 前缀匹配
+        Index(
+            "ix_projects_parts_wtcode_pattern", "wtcode", postgresql_ops={"wtcode": "text_pattern_ops"}
+        ).ddl_if(dialect="postgresql"),
+        {"comment": "零件表"},
+    )
     
     component_wtcode: Mapped[str] = mapped_column(String(64), ForeignKey("projects_components.wtcode"), comment="部件万通码")    
     wtcode: Mapped[str] = mapped_column(String(64), unique=True, index=True, comment="万通码")
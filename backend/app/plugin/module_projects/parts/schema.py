@@ -44,6 +44,16 @@ class PartsFilter(BaseModel):
     
     model_config = ConfigDict(extra="ignore")
 
+class PartsTreeFilter(BaseModel):
+    """
+    Parts tree query schema
+    """
+    component_wtcode: Optional[str] = Field(None, description="部件万通码")
+    prefix: Optional[str] = Field(None, description="子树根节点万通码，为空时为部件万通码")
+    depth: int = Field(2, ge=1, le=20, description="返回的层数，更深的节点通过 prefix 懒加载")
+
+    model_config = ConfigDict(extra="ignore")
+
 class PartsOut(PartsSchema):
     """
     Parts output schema
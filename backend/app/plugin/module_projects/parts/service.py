@@ -1,11 +1,19 @@
-from sqlalchemy import select, func, or_
+from sqlalchemy import case, func, literal, or_, select, union_all
 from .model import PartsModel
-from .schema import PartsCreate, PartsUpdate, PartsFilter, PartsOut
+from .schema import PartsCreate, PartsUpdate, PartsFilter, PartsOut, PartsTreeFilter
 from app.core.database import async_db_session
 from app.core.exceptions import CustomException
 from app.plugin.module_projects.components.model import ComponentsModel
+from app.plugin.module_projects.rollups.service import RollupService
 
 class PartsService:
+    TREE_COLUMNS = (
+        "id", "wtcode", "component_wtcode", "code", "spec", "count",
+        "material", "unit_mass", "total_mass", "remark",
+    )
+    # 每条 UNION ALL 汇总语句包含的节点数
+    TREE_STATS_CHUNK_SIZE = 100
+
     @classmethod
     async def get_parts_list_service(
         cls,
@@ -50,6 +58,132 @@ class PartsService:
                 # "page_size": page_size
             }
 
+    @classmethod
+    def _wtcode_key(cls, wtcode: str) -> tuple:
+        """万通码排序键，数字级按数值排序(X.2 排在 X.10 之前)"""
+        return tuple((0, int(seg), "") if seg.isdigit() else (1, 0, seg) for seg in wtcode.split("."))
+
+    @classmethod
+    def _level_expr(cls):
+        """万通码的层级(点号个数)，在SQL中计算"""
+        return func.length(PartsModel.wtcode) - func.length(func.replace(PartsModel.wtcode, ".", ""))
+
+    @classmethod
+    async def _subtree_stats(
+        cls, session, wtcodes: list[str], level: int, component_wtcode: str | None
+    ) -> dict[str, tuple[int, int, float]]:
+        """
+        在数据库中汇总节点的子节点数、后代数和后代质量，每批一条 UNION ALL 语句，只返回汇总结果
+
+        参数:
+        - session (AsyncSession): 数据库会话。
+        - wtcodes (list[str]): 同一层级的节点万通码。
+        - level (int): 节点层级，子节点为 level + 1 层。
+        - component_wtcode (str | None): 限定部件万通码。
+
+        返回:
+        - dict[str, tuple[int, int, float]]: {万通码: (子节点数, 后代数, 后代质量)}。
+        """
+        level_expr = cls._level_expr()
+        stats = {}
+        for start in range(0, len(wtcodes), cls.TREE_STATS_CHUNK_SIZE):
+            selects = []
+            for wtcode in wtcodes[start:start + cls.TREE_STATS_CHUNK_SIZE]:
+                stmt = select(
+                    literal(wtcode).label("wtcode"),
+                    func.coalesce(func.sum(case((level_expr == level + 1, 1), else_=0)), 0),
+                    func.count(),
+                    func.coalesce(func.sum(PartsModel.total_mass), 0),
+                ).where(PartsModel.wtcode.startswith(f"{wtcode}.", autoescape=True))
+                if component_wtcode:
+                    stmt = stmt.where(PartsModel.component_wtcode == component_wtcode)
+                selects.append(stmt)
+            rows = await session.execute(union_all(*selects) if len(selects) > 1 else selects[0])
+            for wtcode, child_count, descendant_count, descendant_mass in rows:
+                stats[wtcode] = (int(child_count), int(descendant_count), float(descendant_mass))
+        return stats
+
+    @classmethod
+    async def get_parts_tree_service(cls, search: PartsTreeFilter) -> dict:
+        """
+        获取BOM树：按万通码前缀查出 depth 层以内的节点，服务端组装层级并汇总子节点数量和质量
+
+        层级按万通码的点号个数计算，只查询 depth 层以内的节点；最深一层节点的子节点数、
+        后代数和后代质量由数据库分组汇总，不读取更深的零件。前端以 child_count 不为0的节点
+        万通码作为 prefix 再次请求即可懒加载。
+
+        参数:
+        - search (PartsTreeFilter): 部件万通码、子树前缀和层数。
+
+        返回:
+        - dict: 返回节点数和根节点列表。
+
+        异常:
+        - CustomException: 未指定部件万通码和前缀时抛出。
+        """
+        prefix = search.prefix or search.component_wtcode
+        if not prefix:
+            raise CustomException(msg="请指定部件万通码或子树前缀")
+        max_level = prefix.count(".") + search.depth
+
+        # 前缀匹配转义后以 LIKE 'x.%' 查询，数据库可以直接走 wtcode 索引做范围扫描
+        stmt = select(*(getattr(PartsModel, column) for column in cls.TREE_COLUMNS)).where(
+            or_(PartsModel.wtcode == prefix, PartsModel.wtcode.startswith(f"{prefix}.", autoescape=True)),
+            cls._level_expr() <= max_level,
+        )
+        if search.component_wtcode:
+            stmt = stmt.where(PartsModel.component_wtcode == search.component_wtcode)
+        async with async_db_session() as session:
+            rows = (await session.execute(stmt)).mappings().all()
+            boundary = [row["wtcode"] for row in rows if row["wtcode"].count(".") == max_level]
+            boundary_stats = await cls._subtree_stats(session, boundary, max_level, search.component_wtcode)
+
+        nodes = {
+            row["wtcode"]: {
+                **row, "level": 0, "child_count": 0, "descendant_count": 0,
+                "descendant_mass": 0.0, "children": [],
+            }
+            for row in rows
+        }
+        for wtcode, (child_count, descendant_count, descendant_mass) in boundary_stats.items():
+            nodes[wtcode].update(
+                child_count=child_count, descendant_count=descendant_count, descendant_mass=descendant_mass
+            )
+
+        # 上级为去掉末级后最近的已存在节点，编码不连续时跳过缺失的层级
+        ordered = sorted(nodes, key=lambda wtcode: wtcode.count("."))
+        parents: dict[str, str | None] = {}
+        for wtcode in ordered:
+            parent = wtcode
+            while "." in parent and parent != prefix:
+                parent = parent.rsplit(".", 1)[0]
+                if parent in nodes:
+                    break
+            else:
+                parent = None
+            parents[wtcode] = parent
+            if parent:
+                nodes[wtcode]["level"] = nodes[parent]["level"] + 1
+                nodes[parent]["child_count"] += 1
+                nodes[parent]["children"].append(nodes[wtcode])
+
+        # 自下而上汇总后代数量和质量
+        for wtcode in reversed(ordered):
+            parent = parents[wtcode]
+            if parent:
+                node = nodes[wtcode]
+                nodes[parent]["descendant_count"] += node["descendant_count"] + 1
+                nodes[parent]["descendant_mass"] += node["descendant_mass"] + (node["total_mass"] or 0)
+
+        for node in nodes.values():
+            node["descendant_mass"] = round(node["descendant_mass"], 6)
+            node["children"].sort(key=lambda child: cls._wtcode_key(child["wtcode"]))
+        roots = sorted(
+            (nodes[wtcode] for wtcode, parent in parents.items() if parent is None),
+            key=lambda node: cls._wtcode_key(node["wtcode"]),
+        )
+        return {"prefix": prefix, "depth": search.depth, "total": len(nodes), "items": roots}
+
     @classmethod
     async def create_parts_service(cls, obj: PartsCreate) -> PartsModel:
         """
@@ -72,6 +206,7 @@ class PartsService:
 
                 parts = PartsModel(**obj.model_dump(exclude_unset=True))
                 session.add(parts)
+                await RollupService.refresh_components(session, [parts.component_wtcode])
             return parts
 
     @classmethod
@@ -95,8 +230,10 @@ class PartsService:
                 # I should probably fix PartsUpdate schema too if these are editable.
                 # For now, I'll stick to what's in obj.
 
+                old_component_wtcode = parts.component_wtcode
                 for key, value in obj.model_dump(exclude_unset=True).items():
                     setattr(parts, key, value)
+                await RollupService.refresh_components(session, [old_component_wtcode, parts.component_wtcode])
             return parts
 
     @classmethod
@@ -113,3 +250,4 @@ class PartsService:
                 
                 for part in parts_list:
                     await session.delete(part)
+                await RollupService.refresh_components(session, [part.component_wtcode for part in parts_list])
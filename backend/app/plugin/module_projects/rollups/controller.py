@@ -0,0 +1,38 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, Query
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.common.response import SuccessResponse
+from app.core.dependencies import AuthPermission
+
+from .service import RollupService
+
+RollupsRouter = APIRouter(prefix="/rollups", tags=["项目管理"])
+
+
+@RollupsRouter.get("/component/{component_wtcode:path}", summary="获取部件汇总")
+async def get_component_rollup(
+    component_wtcode: Annotated[str, Path(description="部件万通码")],
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_projects:components:query"]))]
+):
+    data = await RollupService.get_component_rollup_service(component_wtcode)
+    return SuccessResponse(data=data)
+
+
+@RollupsRouter.get("/project/{project_code:path}", summary="获取项目汇总")
+async def get_project_rollup(
+    project_code: Annotated[str, Path(description="项目编码")],
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_projects:project:query"]))]
+):
+    data = await RollupService.get_project_rollup_service(project_code)
+    return SuccessResponse(data=data)
+
+
+@RollupsRouter.post("/rebuild", summary="重建汇总")
+async def rebuild_rollup(
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_projects:components:update"]))],
+    project_code: Annotated[str | None, Query(description="项目编码，为空时重建全部")] = None,
+):
+    count = await RollupService.rebuild_rollup_service(project_code)
+    return SuccessResponse(data={"components": count}, msg=f"已重建 {count} 个部件的汇总")
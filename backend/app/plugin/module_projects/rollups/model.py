@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.base_model import MappedBase
+
+
+class ComponentRollupModel(MappedBase):
+    """
+    部件汇总表
+
+    按部件汇总零件数量和质量，零件写入时在同一事务内刷新对应部件的汇总，
+    项目汇总由本表按项目编码求和得到。属于派生数据，可随时重建。
+    """
+    __tablename__ = "projects_component_rollups"
+    __table_args__ = {"comment": "部件汇总表"}
+
+    component_wtcode: Mapped[str] = mapped_column(String(64), primary_key=True, comment="部件万通码")
+    project_code: Mapped[str] = mapped_column(String(64), index=True, comment="项目编码")
+    part_count: Mapped[int] = mapped_column(Integer, default=0, comment="零件行数")
+    quantity: Mapped[int] = mapped_column(Integer, default=0, comment="零件数量合计")
+    total_mass: Mapped[float] = mapped_column(Float, default=0, comment="总重合计")
+    dedicated_count: Mapped[int] = mapped_column(Integer, default=0, comment="专用件行数")
+    dedicated_mass: Mapped[float] = mapped_column(Float, default=0, comment="专用件总重")
+    purchased_count: Mapped[int] = mapped_column(Integer, default=0, comment="外购件行数")
+    purchased_mass: Mapped[float] = mapped_column(Float, default=0, comment="外购件总重")
+    updated_time: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, comment="汇总时间")
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.validator import DateTimeStr
+
+
+class RollupTotals(BaseModel):
+    """
+    汇总数据
+    """
+    part_count: int = Field(0, description="零件行数")
+    quantity: int = Field(0, description="零件数量合计")
+    total_mass: float = Field(0, description="总重合计")
+    dedicated_count: int = Field(0, description="专用件行数")
+    dedicated_mass: float = Field(0, description="专用件总重")
+    purchased_count: int = Field(0, description="外购件行数")
+    purchased_mass: float = Field(0, description="外购件总重")
+
+
+class ComponentRollupOut(RollupTotals):
+    """
+    部件汇总输出模型
+    """
+    component_wtcode: str = Field(..., description="部件万通码")
+    project_code: str = Field(..., description="项目编码")
+    updated_time: DateTimeStr | None = Field(None, description="汇总时间")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectRollupOut(RollupTotals):
+    """
+    项目汇总输出模型
+    """
+    project_code: str = Field(..., description="项目编码")
+    component_count: int = Field(0, description="部件数量")
+    components: list[ComponentRollupOut] = Field(default_factory=list, description="各部件汇总")
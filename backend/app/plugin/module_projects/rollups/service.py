@@ -0,0 +1,178 @@
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.core.base_crud import CRUDBase
+from app.core.database import async_db_session
+from app.core.exceptions import CustomException
+from app.plugin.module_projects.components.model import ComponentsModel
+from app.plugin.module_projects.parts.model import PartsModel
+
+from .model import ComponentRollupModel
+from .schema import ComponentRollupOut, ProjectRollupOut, RollupTotals
+
+
+class RollupService:
+    """
+    部件/项目汇总
+
+    零件的新增、修改、删除都在各自事务内调用 refresh_components，只重算受影响部件的汇总；
+    查询时缺失的汇总会被补算，所以历史数据无需单独迁移。
+    """
+    CHUNK_SIZE = 500
+    TOTAL_FIELDS = tuple(RollupTotals.model_fields)
+
+    @classmethod
+    async def refresh_components(cls, session: AsyncSession, component_wtcodes: Iterable[str | None]) -> None:
+        """
+        在当前事务内重算指定部件的汇总，部件已不存在时删除其汇总
+
+        专用件与外购件的划分与导入时相同：零件代号以部件代号开头的是专用件，
+        其余有代号的是外购件；部件自身行(万通码与部件相同)不计入。
+
+        参数:
+        - session (AsyncSession): 数据库会话，需已开启事务。
+        - component_wtcodes (Iterable[str | None]): 受影响的部件万通码。
+        """
+        wtcodes = list({wtcode for wtcode in component_wtcodes if wtcode})
+        if not wtcodes:
+            return
+        await session.flush()   # 确保会话中未提交的零件变更参与汇总
+
+        # 不用 startswith：部件代号作为 LIKE 模式时其中的 % 和 _ 会被当作通配符
+        dedicated = func.substr(PartsModel.code, 1, func.char_length(ComponentsModel.code)) == ComponentsModel.code
+        purchased = and_(PartsModel.code != "", ~dedicated)
+        mass = func.coalesce(PartsModel.total_mass, 0)
+        now = datetime.now()
+        crud = CRUDBase(ComponentRollupModel, AuthSchema(db=session, check_data_scope=False))
+        for start in range(0, len(wtcodes), cls.CHUNK_SIZE):
+            chunk = wtcodes[start:start + cls.CHUNK_SIZE]
+            stmt = (
+                select(
+                    ComponentsModel.wtcode,
+                    ComponentsModel.project_code,
+                    func.count(PartsModel.id),
+                    func.coalesce(func.sum(PartsModel.count), 0),
+                    func.coalesce(func.sum(PartsModel.total_mass), 0),
+                    func.coalesce(func.sum(case((dedicated, 1), else_=0)), 0),
+                    func.coalesce(func.sum(case((dedicated, mass), else_=0)), 0),
+                    func.coalesce(func.sum(case((purchased, 1), else_=0)), 0),
+                    func.coalesce(func.sum(case((purchased, mass), else_=0)), 0),
+                )
+                .select_from(ComponentsModel)
+                .outerjoin(PartsModel, and_(
+                    PartsModel.component_wtcode == ComponentsModel.wtcode,
+                    PartsModel.wtcode != ComponentsModel.wtcode,
+                ))
+                .where(ComponentsModel.wtcode.in_(chunk))
+                .group_by(ComponentsModel.wtcode, ComponentsModel.project_code)
+            )
+            rows = (await session.execute(stmt)).all()
+            # 并发保存同一部件时，先删后插会因主键冲突失败，由数据库按主键合并
+            await crud.upsert(
+                [
+                    {
+                        "component_wtcode": wtcode,
+                        "project_code": project_code,
+                        **dict(zip(cls.TOTAL_FIELDS, totals, strict=True)),
+                        "updated_time": now,
+                    }
+                    for wtcode, project_code, *totals in rows
+                ],
+                index_elements=["component_wtcode"],
+            )
+            existing = {row[0] for row in rows}
+            removed = [wtcode for wtcode in chunk if wtcode not in existing]
+            if removed:
+                await session.execute(
+                    delete(ComponentRollupModel).where(ComponentRollupModel.component_wtcode.in_(removed))
+                )
+
+    @classmethod
+    async def get_component_rollup_service(cls, component_wtcode: str) -> dict:
+        """
+        获取部件汇总
+
+        参数:
+        - component_wtcode (str): 部件万通码。
+
+        返回:
+        - dict: 部件汇总。
+
+        异常:
+        - CustomException: 部件不存在时抛出。
+        """
+        async with async_db_session() as session:
+            async with session.begin():
+                rollup = await session.get(ComponentRollupModel, component_wtcode)
+                if rollup is None:
+                    await cls.refresh_components(session, [component_wtcode])
+                    rollup = await session.get(ComponentRollupModel, component_wtcode)
+                if rollup is None:
+                    raise CustomException(msg=f"部件万通码 {component_wtcode} 不存在")
+                return ComponentRollupOut.model_validate(rollup).model_dump()
+
+    @classmethod
+    async def get_project_rollup_service(cls, project_code: str) -> dict:
+        """
+        获取项目汇总，由各部件汇总相加得到
+
+        参数:
+        - project_code (str): 项目编码。
+
+        返回:
+        - dict: 项目合计及各部件汇总。
+        """
+        async with async_db_session() as session:
+            async with session.begin():
+                component_wtcodes = set((await session.execute(
+                    select(ComponentsModel.wtcode).where(ComponentsModel.project_code == project_code)
+                )).scalars().all())
+                stmt = select(ComponentRollupModel).where(
+                    ComponentRollupModel.component_wtcode.in_(component_wtcodes)
+                ).order_by(ComponentRollupModel.component_wtcode)
+                rollups = (await session.execute(stmt)).scalars().all()
+                missing = component_wtcodes - {rollup.component_wtcode for rollup in rollups}
+                if missing:
+                    await cls.refresh_components(session, missing)
+                    rollups = (await session.execute(stmt)).scalars().all()
+
+                components = [ComponentRollupOut.model_validate(rollup) for rollup in rollups]
+                totals = {
+                    field: sum(getattr(component, field) for component in components)
+                    for field in cls.TOTAL_FIELDS
+                }
+                return ProjectRollupOut(
+                    project_code=project_code,
+                    component_count=len(components),
+                    components=components,
+                    **totals,
+                ).model_dump()
+
+    @classmethod
+    async def rebuild_rollup_service(cls, project_code: str | None = None) -> int:
+        """
+        重建汇总
+
+        参数:
+        - project_code (str | None): 项目编码，为空时重建全部。
+
+        返回:
+        - int: 重建的部件数量。
+        """
+        async with async_db_session() as session:
+            async with session.begin():
+                stmt = select(ComponentsModel.wtcode)
+                if project_code:
+                    stmt = stmt.where(ComponentsModel.project_code == project_code)
+                component_wtcodes = set((await session.execute(stmt)).scalars().all())
+                # 删除已不存在部件的残留汇总
+                stale = select(ComponentRollupModel.component_wtcode)
+                if project_code:
+                    stale = stale.where(ComponentRollupModel.project_code == project_code)
+                component_wtcodes.update((await session.execute(stale)).scalars().all())
+                await cls.refresh_components(session, component_wtcodes)
+        return len(component_wtcodes)
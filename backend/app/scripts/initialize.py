@@ -5,7 +5,9 @@ from typing import Any
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.module_system.dept.model import DeptModel
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.dept.crud import DeptCRUD
+from app.api.v1.module_system.dept.model import DeptClosureModel, DeptModel
 from app.api.v1.module_system.dict.model import DictDataModel, DictTypeModel
 from app.api.v1.module_system.menu.model import MenuModel
 from app.api.v1.module_system.params.model import ParamsModel
@@ -118,6 +120,20 @@ class InitializeData:
                 log.error(f"❌️ 初始化 {table_name} 表数据失败: {e!s}")
                 raise
 
+    async def __init_dept_closure(self, db: AsyncSession) -> None:
+        """
+        部门闭包表为空时根据部门树重建(首次初始化或升级前已有部门数据)
+
+        参数:
+        - db (AsyncSession): 异步数据库会话。
+        """
+        closure_count = (await db.execute(select(func.count()).select_from(DeptClosureModel))).scalar()
+        if closure_count:
+            return
+        count = await DeptCRUD(AuthSchema(db=db, check_data_scope=False)).rebuild_closure_crud()
+        if count:
+            log.info(f"✅️ 已重建部门闭包表，共 {count} 条")
+
     def __create_objects_with_children(self, data: list[dict], model_class: type) -> list:
         """
         通用递归创建对象函数，处理嵌套的 children 数据
@@ -182,6 +198,7 @@ class InitializeData:
         async with async_db_session() as session:
             async with session.begin():
                 await self.__init_data(session)
+                await self.__init_dept_closure(session)
                 # session.add_all(objs)
                 # 确保提交事务
                 await session.commit()
@@ -1,7 +1,12 @@
+import asyncio
+import codecs
+import csv
 import io
-from typing import Any
+import json
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import IO, Any, Literal
 
-import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, PatternFill
 from openpyxl.utils import get_column_letter
@@ -11,23 +16,13 @@ from openpyxl.worksheet.datavalidation import DataValidation
 class ExcelUtil:
     """Excel文件处理工具类"""
 
-    @classmethod
-    def __mapping_list(cls, list_data: list[dict[str, Any]], mapping_dict: dict) -> list:
-        """
-        工具方法：将列表数据中的字段名映射为对应的中文字段名。
-
-        参数:
-        - list_data (list[dict[str, Any]]): 数据列表。
-        - mapping_dict (dict): 字段名映射字典。
-
-        返回:
-        - list: 映射后的数据列表。
-        """
-        mapping_data = [
-            {mapping_dict.get(key): item.get(key) for key in mapping_dict} for item in list_data
-        ]
-
-        return mapping_data
+    # 导出文件类型对应的响应媒体类型
+    MEDIA_TYPES = {
+        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "csv": "text/csv; charset=utf-8",
+    }
+    # 流式输出每次读取的字节数
+    CHUNK_SIZE = 64 * 1024
 
     @classmethod
     def get_excel_template(
@@ -88,6 +83,46 @@ class ExcelUtil:
         excel_data = buffer.getvalue()
         return excel_data
 
+    @classmethod
+    def __cell_value(cls, value: Any) -> Any:
+        """
+        工具方法：把字段值转换为可写入单元格的值。
+
+        参数:
+        - value (Any): 字段值。
+
+        返回:
+        - Any: 单元格值，字典和列表转换为 JSON 字符串。
+        """
+        if isinstance(value, (dict, list, tuple)):
+            return json.dumps(value, ensure_ascii=False, default=str)
+        return value
+
+    @classmethod
+    def __mapping_rows(
+        cls,
+        list_data: list[dict[str, Any]],
+        mapping_dict: dict,
+        formatter: Callable[[dict[str, Any]], Any] | None = None,
+    ) -> list[list[Any]]:
+        """
+        工具方法：按字段映射顺序把数据转换为单元格值的行。
+
+        参数:
+        - list_data (list[dict[str, Any]]): 数据列表。
+        - mapping_dict (dict): 字段名映射字典。
+        - formatter (Callable | None): 逐行处理函数，原地修改行数据(如状态值转中文)。
+
+        返回:
+        - list[list[Any]]: 行列表。
+        """
+        rows = []
+        for item in list_data:
+            if formatter:
+                formatter(item)
+            rows.append([cls.__cell_value(item.get(key)) for key in mapping_dict])
+        return rows
+
     @classmethod
     def export_list2excel(cls, list_data: list[dict[str, Any]], mapping_dict: dict) -> bytes:
         """
@@ -100,9 +135,99 @@ class ExcelUtil:
         返回:
         - bytes: Excel 文件的二进制数据。
         """
-        mapping_data = cls.__mapping_list(list_data, mapping_dict)
-        df = pd.DataFrame(mapping_data)
+        # 只写模式逐行写出，不在内存中构建单元格对象
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(list(mapping_dict.values()))
+        for row in cls.__mapping_rows(list_data, mapping_dict):
+            ws.append(row)
         buffer = io.BytesIO()
-        df.to_excel(buffer, index=False, engine="openpyxl")  # pyright: ignore[reportArgumentType]
-        binary_data = buffer.getvalue()
-        return binary_data
+        wb.save(buffer)
+        return buffer.getvalue()
+
+    @classmethod
+    async def stream_export(
+        cls,
+        batches: AsyncIterable[list[dict[str, Any]]],
+        mapping_dict: dict,
+        formatter: Callable[[dict[str, Any]], Any] | None = None,
+        file_type: Literal["xlsx", "csv"] = "xlsx",
+    ) -> AsyncIterator[bytes]:
+        """
+        流式导出：逐批读取数据写入临时文件，内存中只保留一批数据，写完后返回分块读取文件的迭代器。
+
+        先完整写出文件再开始响应：查询或写入中途失败时在响应开始前抛出异常，
+        不会向客户端发送看似完整的截断文件。xlsx 使用 openpyxl 只写模式。
+
+        参数:
+        - batches (AsyncIterable[list[dict[str, Any]]]): 分批数据。
+        - mapping_dict (dict): 字段名映射字典，决定列顺序和表头。
+        - formatter (Callable | None): 逐行处理函数，原地修改行数据(如状态值转中文)。
+        - file_type (Literal["xlsx", "csv"]): 导出文件类型。
+
+        返回:
+        - AsyncIterator[bytes]: 文件内容分块。
+        """
+        file = tempfile.TemporaryFile()
+        try:
+            if file_type == "csv":
+                await cls.__write_csv(file, batches, mapping_dict, formatter)
+            else:
+                await cls.__write_xlsx(file, batches, mapping_dict, formatter)
+            file.seek(0)
+        except BaseException:
+            file.close()
+            raise
+        return cls.__read_chunks(file)
+
+    @classmethod
+    async def __read_chunks(cls, file: IO[bytes]) -> AsyncIterator[bytes]:
+        """分块读出临时文件，读完或响应中断时关闭文件"""
+        with file:
+            while chunk := await asyncio.to_thread(file.read, cls.CHUNK_SIZE):
+                yield chunk
+
+    @classmethod
+    async def __write_csv(
+        cls,
+        file: IO[bytes],
+        batches: AsyncIterable[list[dict[str, Any]]],
+        mapping_dict: dict,
+        formatter: Callable[[dict[str, Any]], Any] | None,
+    ) -> None:
+        """逐批写出 CSV，带 BOM 以便 Excel 正确识别 UTF-8"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(mapping_dict.values())
+        file.write(codecs.BOM_UTF8 + buffer.getvalue().encode("utf-8"))
+        async for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(cls.__mapping_rows(batch, mapping_dict, formatter))
+            await asyncio.to_thread(file.write, buffer.getvalue().encode("utf-8"))
+
+    @classmethod
+    async def __write_xlsx(
+        cls,
+        file: IO[bytes],
+        batches: AsyncIterable[list[dict[str, Any]]],
+        mapping_dict: dict,
+        formatter: Callable[[dict[str, Any]], Any] | None,
+    ) -> None:
+        """只写模式逐批写入文件；写入和压缩在线程中执行，不阻塞事件循环"""
+
+        def append_rows(ws: Any, batch: list[dict[str, Any]]) -> None:
+            for row in cls.__mapping_rows(batch, mapping_dict, formatter):
+                ws.append(row)
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(list(mapping_dict.values()))
+        try:
+            async for batch in batches:
+                await asyncio.to_thread(append_rows, ws, batch)
+        except BaseException:
+            # 中途失败时结束工作表写入，释放 openpyxl 的临时文件
+            ws.close()
+            raise
+        await asyncio.to_thread(wb.save, file)
@@ -1,5 +1,8 @@
+import asyncio
 import hashlib
 import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from cryptography.hazmat.backends.openssl import backend
@@ -8,21 +11,33 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from itsdangerous import URLSafeSerializer
 from passlib.context import CryptContext
 
+from app.config.setting import settings
+from app.core.exceptions import CustomException
 from app.core.logger import log
 
 # 密码加密配置
 PwdContext = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
-    bcrypt__rounds=12,  # 设置加密轮数,增加安全性
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS,  # 设置加密轮数,增加安全性
 )
 
 
 class PwdUtil:
     """
     密码工具类,提供密码加密和验证功能
+
+    bcrypt 计算是刻意设计的CPU密集操作，异步代码应使用 *_async 方法，在独立的有界线程池中计算
+    (bcrypt 计算时释放GIL)，不阻塞事件循环。并发数由 PASSWORD_HASH_MAX_WORKERS 限制，
+    等待中的任务超过 PASSWORD_HASH_MAX_QUEUE 时直接拒绝。
     """
 
+    _executor: ThreadPoolExecutor | None = None
+    _semaphore: asyncio.Semaphore | None = None
+    _waiting: int = 0
+    _running: int = 0
+    _rejected: int = 0
+
     @classmethod
     def verify_password(cls, plain_password: str, password_hash: str) -> bool:
         """
@@ -50,6 +65,125 @@ class PwdUtil:
         """
         return PwdContext.hash(password)
 
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """获取哈希线程池，不存在时创建"""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_MAX_WORKERS, thread_name_prefix="pwd-hash"
+            )
+        return cls._executor
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """获取并发信号量"""
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_WORKERS)
+        return cls._semaphore
+
+    @classmethod
+    async def _run(cls, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在哈希线程池中执行函数
+
+        参数:
+        - func (Callable): 哈希计算函数。
+        - *args (Any): 函数参数。
+
+        返回:
+        - Any: 函数返回值。
+
+        异常:
+        - CustomException: 排队已满时抛出。
+        """
+        semaphore = cls._get_semaphore()
+        if semaphore.locked() and cls._waiting >= settings.PASSWORD_HASH_MAX_QUEUE:
+            cls._rejected += 1
+            log.warning(f"密码哈希排队已满({cls._waiting})，拒绝新任务")
+            raise CustomException(msg="系统繁忙，请稍后重试")
+
+        cls._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            cls._waiting -= 1
+
+        cls._running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(cls._get_executor(), func, *args)
+        finally:
+            cls._running -= 1
+            semaphore.release()
+
+    @classmethod
+    async def verify_password_async(cls, plain_password: str, password_hash: str) -> bool:
+        """
+        在哈希线程池中校验密码是否匹配
+
+        参数:
+        - plain_password (str): 明文密码。
+        - password_hash (str): 加密后的密码哈希值。
+
+        返回:
+        - bool: 密码是否匹配。
+        """
+        return await cls._run(PwdContext.verify, plain_password, password_hash)
+
+    @classmethod
+    async def verify_and_update_async(
+        cls, plain_password: str, password_hash: str
+    ) -> tuple[bool, str | None]:
+        """
+        在哈希线程池中校验密码，哈希已过时(如轮数与当前配置不同)时同时计算新哈希
+
+        参数:
+        - plain_password (str): 明文密码。
+        - password_hash (str): 加密后的密码哈希值。
+
+        返回:
+        - tuple[bool, str | None]: 密码是否匹配，需要更新时的新哈希值(否则为 None)。
+        """
+        if not settings.PASSWORD_REHASH_ENABLE:
+            return await cls.verify_password_async(plain_password, password_hash), None
+        return await cls._run(PwdContext.verify_and_update, plain_password, password_hash)
+
+    @classmethod
+    async def set_password_hash_async(cls, password: str) -> str:
+        """
+        在哈希线程池中对密码进行加密
+
+        参数:
+        - password (str): 明文密码。
+
+        返回:
+        - str: 加密后的密码哈希值。
+        """
+        return await cls._run(PwdContext.hash, password)
+
+    @classmethod
+    def status(cls) -> dict:
+        """
+        获取哈希线程池状态
+
+        返回:
+        - dict: 线程数、执行中任务数、排队任务数、累计拒绝数。
+        """
+        return {
+            "max_workers": settings.PASSWORD_HASH_MAX_WORKERS,
+            "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+            "running": cls._running,
+            "waiting": cls._waiting,
+            "rejected": cls._rejected,
+        }
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """关闭哈希线程池（应用关闭时调用）"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+        cls._semaphore = None
+
     @classmethod
     def check_password_strength(cls, password: str) -> str | None:
         """
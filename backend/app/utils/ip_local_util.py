@@ -1,15 +1,106 @@
+import ipaddress
+import mmap
 import re
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Protocol
 
 import httpx
 
+from app.config.setting import settings
 from app.core.logger import log
 
 
+class IpLocationBackend(Protocol):
+    """IP归属地查询后端，search 为同步调用，应只做本地查询"""
+
+    def search(self, ip: str) -> str | None: ...
+
+
+class XdbSearcher:
+    """
+    ip2region xdb 格式离线IP库查询
+
+    文件以只读方式内存映射，由操作系统按需分页加载、多进程共享；查询时先用 /16 向量索引
+    定位区段范围，再在按起始IP排序的区段索引上二分查找，不读取整个文件。
+
+    文件结构：256字节头部；256*256 个向量索引项(起止区段指针，各4字节)；
+    区段索引项14字节(起始IP 4字节、结束IP 4字节、数据长度 2字节、数据指针 4字节)；
+    区域数据为 "国家|区域|省份|城市|ISP" 格式的UTF-8字符串，未知字段为 "0"。
+    """
+
+    HEADER_SIZE = 256
+    VECTOR_INDEX_COLS = 256
+    VECTOR_INDEX_SIZE = 8
+    SEGMENT_INDEX_SIZE = 14
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        打开并内存映射离线IP库
+
+        参数:
+        - path (Path | str): xdb 文件路径。
+
+        异常:
+        - ValueError: 文件过小，不是有效的 xdb 文件时抛出。
+        """
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < self.HEADER_SIZE + 256 * self.VECTOR_INDEX_COLS * self.VECTOR_INDEX_SIZE:
+            self._mm.close()
+            raise ValueError(f"无效的 xdb 文件: {path}")
+
+    def search(self, ip: str) -> str | None:
+        """
+        查询IPv4地址的归属地
+
+        参数:
+        - ip (str): IPv4地址。
+
+        返回:
+        - str | None: "国家-区域-省份-城市-ISP" 格式的归属地，未收录时返回 None。
+        """
+        value = int(ipaddress.IPv4Address(ip))
+        offset = self.HEADER_SIZE + (
+            (value >> 24) * self.VECTOR_INDEX_COLS + ((value >> 16) & 0xFF)
+        ) * self.VECTOR_INDEX_SIZE
+        start_ptr, end_ptr = struct.unpack_from("<II", self._mm, offset)
+        if not start_ptr:
+            return None
+        low, high = 0, (end_ptr - start_ptr) // self.SEGMENT_INDEX_SIZE
+        while low <= high:
+            mid = (low + high) >> 1
+            start_ip, end_ip, data_len, data_ptr = struct.unpack_from(
+                "<IIHI", self._mm, start_ptr + mid * self.SEGMENT_INDEX_SIZE
+            )
+            if value < start_ip:
+                high = mid - 1
+            elif value > end_ip:
+                low = mid + 1
+            else:
+                region = self._mm[data_ptr:data_ptr + data_len].decode("utf-8")
+                return "-".join("" if part == "0" else part for part in region.split("|"))
+        return None
+
+    def close(self) -> None:
+        """关闭内存映射"""
+        self._mm.close()
+
+
 class IpLocalUtil:
     """
     获取IP归属地工具类
+
+    依次查询进程内 LRU 缓存、离线IP库(默认 IP_LOCATION_DB_FILE 指定的 ip2region xdb 文件，
+    可通过 set_backend 替换)，在线接口只在 IP_LOCATION_REMOTE_ENABLE 开启时作为兜底。
     """
 
+    _backend: IpLocationBackend | None = None
+    _backend_loaded: bool = False
+    _cache: "OrderedDict[str, str]" = OrderedDict()
+    _client: httpx.AsyncClient | None = None
+
     @classmethod
     def is_valid_ip(cls, ip: str) -> bool:
         """
@@ -40,6 +131,40 @@ class IpLocalUtil:
         priv_pattern = r"^(127\.|10\.|172\.(1[6-9]|2[0-9]|3[01])\.|192\.168\.)"
         return bool(re.match(priv_pattern, ip))
 
+    @classmethod
+    def set_backend(cls, backend: IpLocationBackend | None) -> None:
+        """
+        设置离线查询后端并清空缓存
+
+        参数:
+        - backend (IpLocationBackend | None): 查询后端，为 None 时不使用离线库。
+        """
+        cls._backend, cls._backend_loaded = backend, True
+        cls._cache.clear()
+
+    @classmethod
+    def _get_backend(cls) -> IpLocationBackend | None:
+        """获取离线查询后端，首次调用时加载 IP_LOCATION_DB_FILE"""
+        if not cls._backend_loaded:
+            cls._backend_loaded = True
+            path = settings.IP_LOCATION_DB_FILE
+            if path.resolve().is_relative_to(settings.STATIC_ROOT.resolve()):
+                log.warning(f"离线IP库位于静态资源目录下，会被公开下载，请移到其他目录: {path}")
+            if path.is_file():
+                try:
+                    cls._backend = XdbSearcher(path)
+                    log.info(f"已加载离线IP库: {path}")
+                except Exception as e:
+                    log.error(f"加载离线IP库失败: {e!s}")
+            elif settings.IP_LOCATION_REMOTE_ENABLE:
+                log.warning(f"离线IP库不存在: {path}，IP归属地将全部查询在线接口")
+            else:
+                log.warning(
+                    f"离线IP库不存在: {path}，公网IP归属地将显示为未知。"
+                    "请按 README 下载 ip2region.xdb，或设置 IP_LOCATION_REMOTE_ENABLE=True"
+                )
+        return cls._backend
+
     @classmethod
     async def get_ip_location(cls, ip: str) -> str | None:
         """
@@ -60,27 +185,60 @@ class IpLocalUtil:
         if cls.is_private_ip(ip):
             return "内网IP"
 
+        location = cls._cache.get(ip)
+        if location is not None:
+            cls._cache.move_to_end(ip)
+            return location
+
+        backend = cls._get_backend()
+        if backend is not None:
+            try:
+                location = backend.search(ip)
+            except Exception as e:
+                log.error(f"离线查询IP归属地失败: {e!s}")
+        if location is None and settings.IP_LOCATION_REMOTE_ENABLE:
+            location = await cls._get_remote_location(ip)
+        if location is None:
+            return "未知"
+
+        cls._cache[ip] = location
+        while len(cls._cache) > settings.IP_LOCATION_CACHE_SIZE:
+            cls._cache.popitem(last=False)
+        return location
+
+    @classmethod
+    async def _get_remote_location(cls, ip: str) -> str | None:
+        """
+        通过在线接口获取IP归属地，复用同一个 HTTP 客户端
+
+        参数:
+        - ip (str): IP地址。
+
+        返回:
+        - str | None: IP归属地信息，失败时返回 None。
+        """
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(timeout=settings.IP_LOCATION_REMOTE_TIMEOUT)
+        client = cls._client
         try:
-            # 使用ip-api.com API获取IP归属地信息
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # 尝试使用 ip9.com.cn API
-                url = f"https://ip9.com.cn/get?ip={ip}"
-                response = await cls._make_api_request(client, url)
-                if response and response.json().get("ret") == 200:
-                    result = response.json().get("data", {})
-                    return f"{result.get('country', '')}-{result.get('prov', '')}-{result.get('city', '')}-{result.get('area', '')}-{result.get('isp', '')}"
-
-                # 尝试使用百度 API
-                url = f"https://qifu-api.baidubce.com/ip/geo/v1/district?ip={ip}"
-                response = await cls._make_api_request(client, url)
-                if response and response.json().get("code") == "Success":
-                    data = response.json().get("data", {})
-                    # 修正原代码中的格式错误
-                    return f"{data.get('country', '')}-{data.get('prov', '')}-{data.get('city', '')}-{data.get('district', '')}-{data.get('isp', '')}"
+            # 尝试使用 ip9.com.cn API
+            url = f"https://ip9.com.cn/get?ip={ip}"
+            response = await cls._make_api_request(client, url)
+            if response and response.json().get("ret") == 200:
+                result = response.json().get("data", {})
+                return f"{result.get('country', '')}-{result.get('prov', '')}-{result.get('city', '')}-{result.get('area', '')}-{result.get('isp', '')}"
+
+            # 尝试使用百度 API
+            url = f"https://qifu-api.baidubce.com/ip/geo/v1/district?ip={ip}"
+            response = await cls._make_api_request(client, url)
+            if response and response.json().get("code") == "Success":
+                data = response.json().get("data", {})
+                # 修正原代码中的格式错误
+                return f"{data.get('country', '')}-{data.get('prov', '')}-{data.get('city', '')}-{data.get('district', '')}-{data.get('isp', '')}"
 
         except Exception as e:
             log.error(f"获取IP归属地失败: {e}")
-            return "未知"
+        return None
 
     @classmethod
     async def _make_api_request(cls, client: httpx.AsyncClient, url: str):
@@ -97,7 +255,7 @@ class IpLocalUtil:
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = await client.get(url, timeout=10)
+                response = await client.get(url)
                 if response.status_code == 200:
                     return response
             except Exception as e:
@@ -105,3 +263,10 @@ class IpLocalUtil:
                     continue
                 log.error(f"API 请求失败: {e}")
         return None
+
+    @classmethod
+    async def close(cls) -> None:
+        """关闭在线接口的 HTTP 客户端（应用关闭时调用）"""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
@@ -0,0 +1,179 @@
+"""
+请求日志中间件基准测试
+
+在同一个最小应用上分别挂载原 BaseHTTPMiddleware 实现和 ASGI 实现的 RequestLogMiddleware，
+直接调用 ASGI 接口(不经过网络)发送带访问令牌的请求，对比吞吐量，同时校验两者的响应状态、
+响应体和 X-Process-Time 响应头一致。接口依赖与 get_current_user 一样通过 decode_request_token
+解析令牌，原实现下令牌解码两次，ASGI 实现下只解码一次。
+
+用法(在 backend 目录下):
+    python -m scripts.benchmark_middleware --requests 5000 --concurrency 1 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Annotated
+
+from fastapi import Depends, FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import Response
+
+from app.api.v1.module_system.auth.schema import JWTPayloadSchema
+from app.common.response import ErrorResponse
+from app.core.logger import log
+from app.core.middlewares import RequestLogMiddleware
+from app.core.security import (
+    OAuth2Schema,
+    create_access_token,
+    decode_access_token,
+    decode_request_token,
+)
+from app.core.system_config import SystemConfigCache
+
+
+class LegacyRequestLogMiddleware(BaseHTTPMiddleware):
+    """基于 BaseHTTPMiddleware 的原始实现，作为对照"""
+
+    @staticmethod
+    def _extract_session_id_from_request(request: Request) -> str | None:
+        session_id = request.scope.get("session_id")
+        if session_id:
+            return session_id
+        try:
+            authorization = request.headers.get("Authorization")
+            if not authorization:
+                return None
+            payload = decode_access_token(authorization.replace("Bearer ", "").strip())
+            session_id = json.loads(payload.sub).get("session_id")
+            if session_id:
+                request.scope["session_id"] = session_id
+            return session_id
+        except Exception:
+            return None
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        start_time = time.time()
+        self._extract_session_id_from_request(request)
+        log.info(
+            f"请求来源: {request.client.host if request.client else '未知'},"
+            f"请求方法: {request.method},"
+            f"请求路径: {request.url.path}"
+        )
+        request_ip = (
+            x_forwarded_for.split(",")[0].strip()
+            if (x_forwarded_for := request.headers.get("X-Forwarded-For"))
+            else request.client.host
+            if request.client
+            else None
+        )
+        system_config = SystemConfigCache.get()
+        if request_ip and request_ip in system_config.ip_black_list:
+            return ErrorResponse(msg="演示环境，禁止操作")
+        if system_config.demo_enable and request.method != "GET":
+            if request_ip not in system_config.ip_white_list and request.url.path not in system_config.white_api_list_path:
+                return ErrorResponse(msg="演示环境，禁止操作")
+        response = await call_next(request)
+        process_time = round(time.time() - start_time, 5)
+        response.headers["X-Process-Time"] = str(process_time)
+        log.info(
+            f"响应状态: {response.status_code}, 响应内容长度: {response.headers.get('content-length', '0')}, "
+            f"处理时间: {round(process_time * 1000, 3)}ms"
+        )
+        return response
+
+
+def make_app(middleware: type) -> FastAPI:
+    """
+    创建挂载指定中间件的最小应用
+
+    参数:
+    - middleware (type): 中间件类。
+
+    返回:
+    - FastAPI: 应用实例，/bench 接口与 get_current_user 一样解析访问令牌。
+    """
+    app = FastAPI()
+
+    @app.get("/bench")
+    async def bench(request: Request, token: Annotated[str, Depends(OAuth2Schema)]) -> dict:
+        payload = decode_request_token(request, token)
+        return {"session_id": json.loads(payload.sub)["session_id"]}
+
+    app.add_middleware(middleware)
+    return app
+
+
+async def call(app: FastAPI, token: str) -> tuple[int, bytes, bool]:
+    """发送一次请求，返回状态码、响应体和是否带有 X-Process-Time 响应头"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/bench",
+        "raw_path": b"/bench",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    messages = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    headers = dict(messages[0]["headers"])
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], body, b"x-process-time" in headers
+
+
+async def measure(app: FastAPI, token: str, requests: int, concurrency: int) -> float:
+    """以指定并发发送请求，返回每秒请求数"""
+    per_worker = requests // concurrency
+
+    async def worker() -> None:
+        for _ in range(per_worker):
+            await call(app, token)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - start)
+
+
+async def run(requests: int, concurrencies: list[int]) -> None:
+    token = create_access_token(
+        JWTPayloadSchema(
+            sub=json.dumps({"session_id": "benchmark", "user_id": 1, "user_name": "admin"}),
+            exp=datetime.now() + timedelta(hours=1),
+        )
+    )
+    legacy_app, asgi_app = make_app(LegacyRequestLogMiddleware), make_app(RequestLogMiddleware)
+    legacy_result, asgi_result = await call(legacy_app, token), await call(asgi_app, token)
+    identical = legacy_result == asgi_result and legacy_result[0] == 200 and legacy_result[2]
+    # 预热
+    await measure(legacy_app, token, 200, 1)
+    await measure(asgi_app, token, 200, 1)
+    print(f"{'concurrency':>11} {'legacy(req/s)':>14} {'asgi(req/s)':>12} {'speedup':>8} identical")
+    for concurrency in concurrencies:
+        legacy = await measure(legacy_app, token, requests, concurrency)
+        asgi = await measure(asgi_app, token, requests, concurrency)
+        print(f"{concurrency:>11} {legacy:>14.0f} {asgi:>12.0f} {asgi / legacy:>7.2f}x {identical}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="请求日志中间件基准测试")
+    parser.add_argument("--requests", type=int, default=5000, help="每轮请求数")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50], help="并发数")
+    args = parser.parse_args()
+    # 日志输出与中间件实现无关，屏蔽后只比较中间件本身的开销
+    log.disable("app")
+    log.disable(__name__)
+    asyncio.run(run(args.requests, args.concurrency))
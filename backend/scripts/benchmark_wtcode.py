@@ -0,0 +1,137 @@
+"""
+万通码生成基准测试
+
+用合成的大型BOM对比逐行 generate_wtcode 与一次线性遍历的 getwtcode，
+同时校验两者输出的 data 和 info 完全一致。
+
+用法(在 backend 目录下):
+    python -m scripts.benchmark_wtcode --rows 10000 50000 100000
+"""
+import argparse
+import contextlib
+import copy
+import io
+import random
+import time
+
+from app.plugin.module_projects.datas.wtdata import (
+    del_dedicated,
+    generate_wtcode,
+    get_child_code,
+    get_first_buy_code,
+    get_next_buy_code,
+    getwtcode,
+    split_datas,
+)
+
+BASE_CODE = "WGWF36LH.4.14-3/1"
+
+
+def make_bom(rows: int, seed: int = 0) -> dict:
+    """
+    生成合成BOM，结构与 dxf2dict 的输出相同
+
+    参数:
+    - rows (int): 明细行数。
+    - seed (int): 随机种子。
+
+    返回:
+    - dict: 包含 data/info/零件数量/部件编号 的BOM。
+    """
+    rng = random.Random(seed)
+
+    def item(code: str, spec: str) -> dict:
+        return {
+            "seq": "", "code": code, "spec": spec, "count": "1", "material": "Q235",
+            "unit_mass": "1.0", "total_mass": "1.0", "remark": "", "x": 0, "y": 0,
+        }
+
+    data = [item(BASE_CODE, "部件")]
+    dedicated_rows = rows * 4 // 5
+    stack = [1]
+    for _ in range(dedicated_rows - 1):
+        action = rng.random()
+        if action < 0.3 and len(stack) < 8:                 # 下级编码，偶尔不连续
+            stack.append(1 if rng.random() < 0.8 else rng.randint(2, 5))
+        elif action < 0.8 or len(stack) == 1:               # 同级编码，偶尔不连续
+            stack[-1] += 1 if rng.random() < 0.8 else rng.randint(2, 5)
+        else:                                               # 上级编码，可能跨多级
+            del stack[len(stack) - rng.randint(1, len(stack) - 1):]
+            stack[-1] += 1
+        sep = "-" if rng.random() < 0.1 else "."
+        data.append(item(BASE_CODE + "".join(f"{sep}{s}" for s in stack), "专用件"))
+        if rng.random() < 0.005:                            # 混在专用件中的杂项
+            data.append(item(f"GB/T {rng.randint(1, 9999)}", "杂项"))
+    while len(data) < rows:                                 # 外购件
+        data.append(item(f"GB/T {rng.randint(1, 9999)} M{rng.randint(6, 30)}", "外购件"))
+    return {"info": [], "data": data, "零件数量": len(data), "部件编号": BASE_CODE}
+
+
+def legacy_getwtcode(res: dict) -> dict:
+    """逐行调用 generate_wtcode 的原始实现，作为对照"""
+    base_code = res["data"][0]["code"]
+    dedicated, buy = split_datas(base_code, res["data"])
+    msg = f"信息！！！零件数量共{res['零件数量']}件❗️，其中专用件{len(dedicated)}件，外购件{len(buy)}件"
+    res["info"].append(msg)
+    dedicated, info_list = del_dedicated(base_code, dedicated)
+    res["info"].extend(info_list)
+    dedicated[0]["wtcode"] = res["部件编号"]
+    for m in range(1, len(dedicated)):
+        _, dedicated[m]["wtcode"] = generate_wtcode(
+            dedicated[m - 1]["wtcode"], dedicated[m - 1]["code"], dedicated[m]["code"]
+        )
+        if dedicated[m]["code"] == dedicated[0]["code"]:
+            msg = f"错误！！！部件编码重复❌ ({dedicated[m]['code']} {dedicated[m]['spec']} {dedicated[m]['total_mass']}), ({dedicated[0]['code']} {dedicated[0]['spec']} {dedicated[0]['total_mass']})"
+            res["info"].append(msg)
+    res["info"].append(f"信息！！！专用件列表还剩 {len(dedicated)} 件❗️")
+    if len(buy) > 0:
+        summary = {'seq': '', 'code': '', 'spec': '外购件汇总', 'count': '1', 'material': '', 'unit_mass': '', 'total_mass': '', 'remark': '', 'x': '', 'y': ''}
+        buy.insert(0, summary)
+        buy[0]["wtcode"] = get_first_buy_code(dedicated[len(dedicated) - 1]["wtcode"])
+        buy[1]["wtcode"] = get_child_code(buy[0]["wtcode"])
+        for n in range(2, len(buy)):
+            buy[n]["wtcode"] = get_next_buy_code(buy[n - 1]["wtcode"])
+        res["data"] = dedicated + buy
+    else:
+        res["data"] = dedicated
+    return res
+
+
+def run(rows: int, seed: int = 0) -> dict:
+    """
+    对指定行数的合成BOM运行一次对比
+
+    参数:
+    - rows (int): 明细行数。
+    - seed (int): 随机种子。
+
+    返回:
+    - dict: 两种实现的耗时、加速比及输出是否一致。
+    """
+    bom = make_bom(rows, seed)
+    legacy_input, engine_input = copy.deepcopy(bom), copy.deepcopy(bom)
+    with contextlib.redirect_stdout(io.StringIO()):     # 屏蔽逐行打印
+        start = time.perf_counter()
+        legacy = legacy_getwtcode(legacy_input)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        engine = getwtcode(engine_input)
+        engine_time = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "legacy": legacy_time,
+        "engine": engine_time,
+        "speedup": legacy_time / engine_time if engine_time else float("inf"),
+        "identical": legacy["data"] == engine["data"] and legacy["info"] == engine["info"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="万通码生成基准测试")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 100000], help="BOM行数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+    print(f"{'rows':>8} {'legacy(s)':>10} {'engine(s)':>10} {'speedup':>8} identical")
+    for rows in args.rows:
+        r = run(rows, args.seed)
+        print(f"{r['rows']:>8} {r['legacy']:>10.3f} {r['engine']:>10.3f} {r['speedup']:>7.1f}x {r['identical']}")
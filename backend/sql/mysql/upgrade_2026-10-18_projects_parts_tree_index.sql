@@ -0,0 +1,3 @@
+-- 已有数据库升级：BOM树按部件和万通码前缀查询使用的索引
+-- 新建数据库由 create_all 自动创建，无需执行；已存在 projects_parts 表时手动执行一次
+CREATE INDEX `ix_projects_parts_component_wtcode_wtcode` ON `projects_parts` (`component_wtcode`, `wtcode`);
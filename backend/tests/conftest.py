@@ -1,12 +1,17 @@
+import asyncio
 import os
 import sys
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 # 导入 main 模块，确保路径正确
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from app.core.base_model import MappedBase
 from main import create_app
 
 # 创建测试客户端
@@ -17,3 +22,24 @@ app = create_app()
 def test_client():
     with TestClient(app) as client:
         yield client
+
+
+@pytest.fixture
+def run_in_db() -> Callable[[Callable[[AsyncSession], Awaitable[Any]]], Any]:
+    """在新建的内存SQLite数据库中执行异步函数，函数在一个事务内接收数据库会话"""
+
+    def run(func: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async def main() -> Any:
+            engine = create_async_engine("sqlite+aiosqlite://")
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(MappedBase.metadata.create_all)
+                async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                    async with session.begin():
+                        return await func(session)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,67 @@
+"""
+批量写入的数据权限测试
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_crud_permission.py
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.user.model import UserModel
+from app.core.base_crud import CRUDBase
+from app.core.exceptions import CustomException
+from app.plugin.module_projects.projects.model import ProjectsModel
+
+
+async def setup(session: AsyncSession) -> tuple[CRUDBase, dict[str, int]]:
+    """创建用户1和用户2各自的项目，返回仅本人数据权限的用户1的CRUD及项目编码到ID的映射"""
+    projects = [
+        ProjectsModel(code="P1", name="项目1", no="N1", created_id=1),
+        ProjectsModel(code="P2", name="项目2", no="N2", created_id=2),
+    ]
+    session.add_all(projects)
+    await session.flush()
+    # 没有角色的普通用户只能访问自己创建的数据
+    auth = AuthSchema(db=session, user=UserModel(id=1, is_superuser=False), check_data_scope=True)
+    return CRUDBase(ProjectsModel, auth), {project.code: project.id for project in projects}
+
+
+async def names(session: AsyncSession) -> dict[str, str]:
+    return dict((await session.execute(select(ProjectsModel.code, ProjectsModel.name))).all())
+
+
+def test_bulk_update_rejects_rows_out_of_scope(run_in_db) -> None:
+    """包含无权限对象时整批不更新"""
+
+    async def check(session: AsyncSession) -> None:
+        crud, ids = await setup(session)
+        with pytest.raises(CustomException):
+            await crud.bulk_update([{"id": ids["P1"], "name": "改1"}, {"id": ids["P2"], "name": "改2"}])
+        assert await names(session) == {"P1": "项目1", "P2": "项目2"}
+
+        assert await crud.bulk_update([{"id": ids["P1"], "name": "改1"}]) == 1
+        assert await names(session) == {"P1": "改1", "P2": "项目2"}
+
+    run_in_db(check)
+
+
+def test_upsert_rejects_updating_rows_out_of_scope(run_in_db) -> None:
+    """需要更新的已存在对象中有无权限的时整批不写入，只插入新对象或跳过已存在对象时不受限"""
+
+    async def check(session: AsyncSession) -> None:
+        crud, _ = await setup(session)
+        rows = [{"code": "P2", "name": "改2", "no": "N2"}, {"code": "P3", "name": "项目3", "no": "N3"}]
+        with pytest.raises(CustomException):
+            await crud.upsert(rows, index_elements=["code"])
+        assert await names(session) == {"P1": "项目1", "P2": "项目2"}
+
+        assert await crud.upsert(rows, index_elements=["code"], update_fields=[]) == (1, 1)
+        assert await names(session) == {"P1": "项目1", "P2": "项目2", "P3": "项目3"}
+
+        assert await crud.upsert([{"code": "P1", "name": "改1", "no": "N1"}], index_elements=["code"]) == (0, 1)
+        assert await names(session) == {"P1": "改1", "P2": "项目2", "P3": "项目3"}
+
+    run_in_db(check)
@@ -0,0 +1,124 @@
+"""
+游标分页测试
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_cursor_page.py
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.dept.crud import DeptCRUD
+from app.api.v1.module_system.dept.model import DeptModel
+from app.api.v1.module_system.dept.schema import DeptOutSchema
+from app.core.exceptions import CustomException
+
+ORDER_BY = [{"order": "desc"}]
+
+
+async def create_depts(session: AsyncSession) -> list[int]:
+    """创建排序值有重复的部门，返回按 order 降序排列的 ID(主键与最后一个排序字段同向)"""
+    depts = [DeptModel(name=f"dept{i}", code=f"d{i}", order=i % 3) for i in range(8)]
+    session.add_all(depts)
+    await session.flush()
+    return [dept.id for dept in sorted(depts, key=lambda dept: (dept.order, dept.id), reverse=True)]
+
+
+async def page(crud: DeptCRUD, cursor: str | None = None, order_by: list[dict] = ORDER_BY) -> dict:
+    return await crud.cursor_page(
+        limit=3, order_by=order_by, search={}, out_schema=DeptOutSchema, cursor=cursor, count_mode="exact"
+    )
+
+
+def test_forward_and_backward_round_trip(run_in_db) -> None:
+    """向后翻到最后一页再向前翻回第一页，每页内容与顺序一致且不重不漏"""
+
+    async def check(session: AsyncSession) -> None:
+        expected = await create_depts(session)
+        crud = DeptCRUD(AuthSchema(db=session, check_data_scope=False))
+
+        pages = [await page(crud)]
+        while pages[-1]["has_next"]:
+            pages.append(await page(crud, pages[-1]["next_cursor"]))
+        forward = [[item["id"] for item in p["items"]] for p in pages]
+        assert [id for ids in forward for id in ids] == expected
+        assert [len(ids) for ids in forward] == [3, 3, 2]
+        assert pages[0]["total"] == 8
+        assert not pages[0]["has_prev"] and pages[0]["prev_cursor"] is None
+        assert pages[-1]["next_cursor"] is None
+
+        backward = [forward[-1]]
+        current = pages[-1]
+        while current["has_prev"]:
+            current = await page(crud, current["prev_cursor"])
+            backward.append([item["id"] for item in current["items"]])
+        assert backward == forward[::-1]
+
+    run_in_db(check)
+
+
+def test_invalid_cursor_rejected(run_in_db) -> None:
+    """损坏的游标和排序条件改变后的游标都被拒绝"""
+
+    async def check(session: AsyncSession) -> None:
+        await create_depts(session)
+        crud = DeptCRUD(AuthSchema(db=session, check_data_scope=False))
+        next_cursor = (await page(crud))["next_cursor"]
+        with pytest.raises(CustomException):
+            await page(crud, next_cursor[:-4])
+        with pytest.raises(CustomException):
+            await page(crud, next_cursor, order_by=[{"order": "asc"}])
+
+    run_in_db(check)
+
+
+async def create_depts_with_nulls(session: AsyncSession) -> list[DeptModel]:
+    """创建 description 部分为空且有重复值的部门"""
+    depts = [
+        DeptModel(name=f"dept{i}", code=f"d{i}", description=None if i % 3 == 0 else f"desc{i % 2}")
+        for i in range(8)
+    ]
+    session.add_all(depts)
+    await session.flush()
+    return depts
+
+
+def test_nullable_sort_column(run_in_db) -> None:
+    """可为空的排序列按 NULL 最小处理，正反向翻页和分批遍历都不重不漏"""
+
+    async def check(session: AsyncSession) -> None:
+        depts = await create_depts_with_nulls(session)
+        crud = DeptCRUD(AuthSchema(db=session, check_data_scope=False))
+
+        for direction in ("asc", "desc"):
+            order_by = [{"description": direction}]
+            expected = [
+                dept.id
+                for dept in sorted(
+                    depts,
+                    key=lambda dept: (dept.description is not None, dept.description or "", dept.id),
+                    reverse=direction == "desc",
+                )
+            ]
+
+            pages = [await page(crud, order_by=order_by)]
+            while pages[-1]["has_next"]:
+                pages.append(await page(crud, pages[-1]["next_cursor"], order_by=order_by))
+            forward = [[item["id"] for item in p["items"]] for p in pages]
+            assert [id for ids in forward for id in ids] == expected
+
+            backward = [forward[-1]]
+            current = pages[-1]
+            while current["has_prev"]:
+                current = await page(crud, current["prev_cursor"], order_by=order_by)
+                backward.append([item["id"] for item in current["items"]])
+            assert backward == forward[::-1]
+
+            batches = [
+                [item["id"] for item in batch]
+                async for batch in crud.iter_projection(DeptOutSchema, order_by=order_by, batch_size=2)
+            ]
+            assert [id for ids in batches for id in ids] == expected
+
+    run_in_db(check)
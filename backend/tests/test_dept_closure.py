@@ -0,0 +1,111 @@
+"""
+部门闭包表测试
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_dept_closure.py
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.dept.model import DeptClosureModel, DeptModel
+from app.api.v1.module_system.dept.schema import DeptCreateSchema, DeptUpdateSchema
+from app.api.v1.module_system.dept.service import DeptService
+from app.core.exceptions import CustomException
+
+
+async def create_tree(auth: AuthSchema) -> dict[str, int]:
+    """创建部门树 A → B → C 和根部门 D，返回名称到 ID 的映射"""
+    ids: dict[str, int] = {}
+    for name, parent in (("A", None), ("B", "A"), ("C", "B"), ("D", None)):
+        dept = await DeptService.create_dept_service(
+            auth=auth, data=DeptCreateSchema(name=name, code=name, parent_id=ids.get(parent) if parent else None)
+        )
+        ids[name] = dept["id"]
+    return ids
+
+
+async def ancestors(session: AsyncSession, id: int) -> dict[int, int]:
+    """部门的所有祖先(含自身)及层级距离"""
+    rows = await session.execute(
+        select(DeptClosureModel.ancestor_id, DeptClosureModel.depth).where(DeptClosureModel.descendant_id == id)
+    )
+    return dict(rows.all())
+
+
+def test_create_builds_closure(run_in_db) -> None:
+    """新建部门写入与所有祖先的关系"""
+
+    async def check(session: AsyncSession) -> None:
+        ids = await create_tree(AuthSchema(db=session, check_data_scope=False))
+        assert await ancestors(session, ids["C"]) == {ids["C"]: 0, ids["B"]: 1, ids["A"]: 2}
+        assert await ancestors(session, ids["D"]) == {ids["D"]: 0}
+
+    run_in_db(check)
+
+
+def test_move_subtree(run_in_db) -> None:
+    """更换上级部门时整棵子树随之移动"""
+
+    async def check(session: AsyncSession) -> None:
+        auth = AuthSchema(db=session, check_data_scope=False)
+        ids = await create_tree(auth)
+        await DeptService.update_dept_service(
+            auth=auth, id=ids["B"], data=DeptUpdateSchema(name="B", code="B", parent_id=ids["D"])
+        )
+        assert await ancestors(session, ids["B"]) == {ids["B"]: 0, ids["D"]: 1}
+        assert await ancestors(session, ids["C"]) == {ids["C"]: 0, ids["B"]: 1, ids["D"]: 2}
+
+        # 移到根节点
+        await DeptService.update_dept_service(
+            auth=auth, id=ids["B"], data=DeptUpdateSchema(name="B", code="B", parent_id=None)
+        )
+        assert await ancestors(session, ids["C"]) == {ids["C"]: 0, ids["B"]: 1}
+
+    run_in_db(check)
+
+
+def test_rename_keeps_parent(run_in_db) -> None:
+    """未传上级部门的更新(如只改名称)不移动部门"""
+
+    async def check(session: AsyncSession) -> None:
+        auth = AuthSchema(db=session, check_data_scope=False)
+        ids = await create_tree(auth)
+        await DeptService.update_dept_service(auth=auth, id=ids["B"], data=DeptUpdateSchema(name="B2"))
+        assert (await session.get(DeptModel, ids["B"])).parent_id == ids["A"]
+        assert await ancestors(session, ids["C"]) == {ids["C"]: 0, ids["B"]: 1, ids["A"]: 2}
+
+    run_in_db(check)
+
+
+def test_move_under_descendant_rejected(run_in_db) -> None:
+    """上级部门不能是自身或其子部门"""
+
+    async def check(session: AsyncSession) -> None:
+        auth = AuthSchema(db=session, check_data_scope=False)
+        ids = await create_tree(auth)
+        for parent in ("B", "C"):
+            with pytest.raises(CustomException):
+                await DeptService.update_dept_service(
+                    auth=auth, id=ids["B"], data=DeptUpdateSchema(name="B", code="B", parent_id=ids[parent])
+                )
+        assert await ancestors(session, ids["C"]) == {ids["C"]: 0, ids["B"]: 1, ids["A"]: 2}
+
+    run_in_db(check)
+
+
+def test_delete_removes_subtree(run_in_db) -> None:
+    """删除部门时连同子部门及其闭包关系一起删除"""
+
+    async def check(session: AsyncSession) -> None:
+        auth = AuthSchema(db=session, check_data_scope=False)
+        ids = await create_tree(auth)
+        await DeptService.delete_dept_service(auth=auth, ids=[ids["B"]])
+        remaining = set((await session.execute(select(DeptModel.id))).scalars().all())
+        assert remaining == {ids["A"], ids["D"]}
+        closure = (await session.execute(select(DeptClosureModel.ancestor_id, DeptClosureModel.descendant_id))).all()
+        assert set(closure) == {(ids["A"], ids["A"]), (ids["D"], ids["D"])}
+
+    run_in_db(check)
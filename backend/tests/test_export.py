@@ -0,0 +1,62 @@
+"""
+流式导出测试
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_export.py
+"""
+
+import asyncio
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.user.model import UserModel
+from app.api.v1.module_system.user.service import UserService
+from app.config.setting import settings
+from app.core.exceptions import CustomException
+from app.utils.excel_util import ExcelUtil
+
+
+def test_export_users_by_nullable_column(run_in_db, monkeypatch) -> None:
+    """按可为空的列排序导出，多批查询不重不漏"""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+    async def check(session: AsyncSession) -> None:
+        users = [
+            UserModel(
+                username=f"user{i}", password="x", name=f"用户{i}",
+                last_login=None if i % 2 else datetime(2024, 1, 1 + i),
+            )
+            for i in range(5)
+        ]
+        session.add_all(users)
+        await session.flush()
+
+        chunks = await UserService.export_user_list_service(
+            auth=AuthSchema(db=session, check_data_scope=False),
+            order_by=[{"last_login": "desc"}],
+            file_type="csv",
+        )
+        content = b"".join([chunk async for chunk in chunks]).decode("utf-8-sig")
+        ids = [int(row[0]) for row in list(csv.reader(io.StringIO(content)))[1:]]
+        expected = sorted(users, key=lambda user: (user.last_login is not None, user.last_login or 0, user.id))
+        assert ids == [user.id for user in reversed(expected)]
+
+    run_in_db(check)
+
+
+@pytest.mark.parametrize("file_type", ["csv", "xlsx"])
+def test_export_failure_raised_before_streaming(file_type: str) -> None:
+    """中途查询失败时在返回内容迭代器之前抛出异常，不输出截断的文件"""
+
+    async def batches() -> AsyncIterator[list[dict]]:
+        yield [{"id": 1}]
+        raise CustomException(msg="分批查询失败")
+
+    with pytest.raises(CustomException):
+        asyncio.run(ExcelUtil.stream_export(batches(), mapping_dict={"id": "编号"}, file_type=file_type))
@@ -0,0 +1,111 @@
+"""
+离线IP库(ip2region xdb)查询测试
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_ip_location.py
+"""
+
+import asyncio
+import ipaddress
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from app.config.setting import settings
+from app.utils.ip_local_util import IpLocalUtil, XdbSearcher
+
+SEGMENTS = [
+    ("1.0.0.0", "1.0.0.255", "中国|0|广东省|广州市|电信"),
+    ("1.0.1.0", "1.0.3.255", "中国|0|福建省|福州市|电信"),
+    # 跨越 /16 边界的区段
+    ("1.0.255.0", "1.1.0.255", "中国|0|北京|北京市|联通"),
+    ("8.8.8.0", "8.8.8.255", "美国|0|0|0|Level3"),
+]
+
+
+def build_xdb(path: Path, segments: list[tuple[str, str, str]]) -> None:
+    """按 ip2region xdb 格式写入离线IP库：区段按 /16 切分，向量索引记录每个 /16 的首末区段索引项"""
+
+    def split(start: int, end: int) -> Iterator[tuple[int, int]]:
+        while start <= end:
+            block_end = min(end, start | 0xFFFF)
+            yield start, block_end
+            start = block_end + 1
+
+    header_size = XdbSearcher.HEADER_SIZE
+    vector_size = 256 * XdbSearcher.VECTOR_INDEX_COLS * XdbSearcher.VECTOR_INDEX_SIZE
+    data = bytearray()
+    entries = []
+    for start_ip, end_ip, region in segments:
+        region_bytes = region.encode()
+        data_ptr = header_size + vector_size + len(data)
+        data += region_bytes
+        for start, end in split(int(ipaddress.IPv4Address(start_ip)), int(ipaddress.IPv4Address(end_ip))):
+            entries.append((start, end, len(region_bytes), data_ptr))
+
+    index_start = header_size + vector_size + len(data)
+    vector = bytearray(vector_size)
+    for i, (start, *_) in enumerate(entries):
+        entry_ptr = index_start + i * XdbSearcher.SEGMENT_INDEX_SIZE
+        offset = (start >> 16) * XdbSearcher.VECTOR_INDEX_SIZE
+        first_ptr = struct.unpack_from("<I", vector, offset)[0] or entry_ptr
+        struct.pack_into("<II", vector, offset, first_ptr, entry_ptr)
+    index = b"".join(struct.pack("<IIHI", *entry) for entry in entries)
+    path.write_bytes(bytes(header_size) + vector + data + index)
+
+
+@pytest.fixture
+def xdb_file(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "ip2region.xdb"
+    build_xdb(path, SEGMENTS)
+    yield path
+
+
+@pytest.mark.parametrize(
+    ("ip", "location"),
+    [
+        ("1.0.0.0", "中国--广东省-广州市-电信"),
+        ("1.0.0.255", "中国--广东省-广州市-电信"),
+        ("1.0.2.100", "中国--福建省-福州市-电信"),
+        ("1.0.3.255", "中国--福建省-福州市-电信"),
+        ("1.0.255.1", "中国--北京-北京市-联通"),
+        ("1.1.0.0", "中国--北京-北京市-联通"),
+        ("1.1.0.255", "中国--北京-北京市-联通"),
+        ("8.8.8.8", "美国----Level3"),
+        # 同一 /16 内未收录的区间
+        ("1.0.4.0", None),
+        ("1.1.1.0", None),
+        # 向量索引为空的 /16
+        ("9.9.9.9", None),
+    ],
+)
+def test_xdb_search(xdb_file: Path, ip: str, location: str | None) -> None:
+    searcher = XdbSearcher(xdb_file)
+    try:
+        assert searcher.search(ip) == location
+    finally:
+        searcher.close()
+
+
+def test_invalid_xdb_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "broken.xdb"
+    path.write_bytes(b"\0" * 1024)
+    with pytest.raises(ValueError):
+        XdbSearcher(path)
+
+
+def test_get_ip_location_uses_xdb(xdb_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """离线库命中时返回归属地，未命中且未开启在线查询时返回未知"""
+    monkeypatch.setattr(settings, "IP_LOCATION_REMOTE_ENABLE", False)
+    searcher = XdbSearcher(xdb_file)
+    IpLocalUtil.set_backend(searcher)
+    try:
+        assert asyncio.run(IpLocalUtil.get_ip_location("8.8.8.8")) == "美国----Level3"
+        assert asyncio.run(IpLocalUtil.get_ip_location("9.9.9.9")) == "未知"
+        assert asyncio.run(IpLocalUtil.get_ip_location("192.168.1.1")) == "内网IP"
+    finally:
+        IpLocalUtil.set_backend(None)
+        IpLocalUtil._backend_loaded = False
+        searcher.close()
@@ -0,0 +1,80 @@
+"""
+投影查询测试：只查询输出模型需要的列和关系时，输出与加载完整对象后序列化的结果一致
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_projection.py
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.dept.model import DeptModel
+from app.api.v1.module_system.log.crud import OperationLogCRUD
+from app.api.v1.module_system.log.model import OperationLogModel
+from app.api.v1.module_system.log.schema import OperationLogOutSchema
+from app.api.v1.module_system.position.model import PositionModel
+from app.api.v1.module_system.role.model import RoleModel
+from app.api.v1.module_system.user.crud import UserCRUD
+from app.api.v1.module_system.user.model import UserModel
+from app.api.v1.module_system.user.schema import UserOutSchema
+
+
+async def create_users(session: AsyncSession) -> None:
+    """创建带部门、角色、岗位和创建人的用户"""
+    dept = DeptModel(name="研发部", code="dev")
+    role = RoleModel(name="开发", code="dev", data_scope=3, depts=[dept])
+    position = PositionModel(name="工程师")
+    admin = UserModel(username="admin", password="x", name="管理员", is_superuser=True)
+    session.add_all([dept, role, position, admin])
+    await session.flush()
+    session.add_all([
+        UserModel(
+            username=f"user{i}", password="x", name=f"用户{i}", mobile=f"1380000000{i}", dept_id=dept.id,
+            roles=[role], positions=[position], created_id=admin.id,
+        )
+        for i in range(3)
+    ])
+    session.add_all([
+        OperationLogModel(
+            type=1, request_path=f"/api/{i}", request_method="GET", response_code=200, created_id=admin.id
+        )
+        for i in range(3)
+    ])
+    await session.flush()
+    session.expunge_all()
+
+
+def test_user_projection_matches_full_entity(run_in_db) -> None:
+    """含关系字段的输出模型"""
+
+    async def check(session: AsyncSession) -> None:
+        await create_users(session)
+        crud = UserCRUD(AuthSchema(db=session, check_data_scope=False))
+        order_by = [{"id": "asc"}]
+        full = [UserOutSchema.model_validate(user).model_dump() for user in await crud.get_list_crud(order_by=order_by)]
+        session.expunge_all()
+        projected = await crud.get_out_list_crud(order_by=order_by)
+        assert len(projected) == 4
+        assert projected == full
+        assert projected[1]["dept"]["name"] == "研发部"
+        assert projected[1]["created_by"]["name"] == "管理员"
+
+    run_in_db(check)
+
+
+def test_log_projection_matches_full_entity(run_in_db) -> None:
+    """只含列字段的输出模型，按行构造，分页结果也一致"""
+
+    async def check(session: AsyncSession) -> None:
+        await create_users(session)
+        crud = OperationLogCRUD(AuthSchema(db=session, check_data_scope=False))
+        order_by = [{"id": "desc"}]
+        full = await crud.page(offset=0, limit=2, order_by=order_by, search={}, out_schema=OperationLogOutSchema)
+        session.expunge_all()
+        projected = await crud.page(
+            offset=0, limit=2, order_by=order_by, search={}, out_schema=OperationLogOutSchema, projection=True
+        )
+        assert projected == full
+        assert [item["request_path"] for item in projected["items"]] == ["/api/2", "/api/1"]
+
+    run_in_db(check)
@@ -0,0 +1,63 @@
+"""
+中间件系统配置测试
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_system_config.py
+"""
+
+import pytest
+
+from app.core.system_config import IpSet
+
+IP_LIST = ["192.168.1.10", "10.0.0.0/8", "172.16.5.0/24", "203.0.113.7/32", "2001:db8::/32", "::1", "not-an-ip/xx"]
+
+
+@pytest.mark.parametrize(
+    ("ip", "expected"),
+    [
+        # 单个地址
+        ("192.168.1.10", True),
+        ("192.168.1.11", False),
+        # 网段边界
+        ("10.0.0.0", True),
+        ("10.255.255.255", True),
+        ("11.0.0.0", False),
+        ("9.255.255.255", False),
+        ("172.16.5.0", True),
+        ("172.16.5.255", True),
+        ("172.16.6.0", False),
+        ("172.16.4.255", False),
+        ("203.0.113.7", True),
+        ("203.0.113.8", False),
+        # IPv6
+        ("2001:db8::1", True),
+        ("2001:db8:ffff:ffff::1", True),
+        ("2001:db9::1", False),
+        ("::1", True),
+        # IPv4 地址不匹配 IPv6 网段
+        ("32.1.13.184", False),
+        # 无法解析的值
+        ("not-an-ip", False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_ip_set_matches_addresses_and_networks(ip: str | None, expected: bool) -> None:
+    assert (ip in IpSet(IP_LIST)) is expected
+
+
+def test_unparsable_entry_matches_literally() -> None:
+    """无法解析的项按原字符串匹配"""
+    assert "not-an-ip/xx" in IpSet(IP_LIST)
+
+
+def test_non_strict_network_uses_network_address() -> None:
+    """主机位不为0的网段按所在网络匹配"""
+    ip_set = IpSet(["192.168.1.77/24"])
+    assert "192.168.1.1" in ip_set
+    assert "192.168.2.1" not in ip_set
+
+
+def test_empty_set() -> None:
+    assert "127.0.0.1" not in IpSet()
+    assert "127.0.0.1" not in IpSet(["", "  "])
@@ -0,0 +1,129 @@
+"""
+批量导入用户测试
+
+注意：使用普通的 def 定义测试函数，不要使用 async def
+执行命令: pytest tests/test_user_import.py
+"""
+
+import io
+
+import pandas as pd
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.module_system.auth.schema import AuthSchema
+from app.api.v1.module_system.dept.model import DeptModel
+from app.api.v1.module_system.user.model import UserModel
+from app.api.v1.module_system.user.service import UserService
+
+HEADERS = ["部门编号", "用户名", "名称", "邮箱", "手机号", "性别", "状态"]
+
+
+def excel_file(rows: list[list]) -> UploadFile:
+    buffer = io.BytesIO()
+    pd.DataFrame(rows, columns=HEADERS).to_excel(buffer, index=False)
+    buffer.seek(0)
+    return UploadFile(file=buffer, filename="users.xlsx")
+
+
+def test_conflicting_rows_reported_and_skipped(run_in_db) -> None:
+    """手机号、邮箱已被使用或在文件中重复、部门不存在的行按行号报错，其余行照常导入"""
+
+    async def check(session: AsyncSession) -> None:
+        dept = DeptModel(name="研发部", code="dev")
+        session.add(dept)
+        await session.flush()
+        admin = UserModel(
+            username="admin", password="x", name="管理员", is_superuser=True,
+            mobile="13800000000", email="admin@example.com",
+        )
+        session.add(admin)
+        await session.flush()
+        auth = AuthSchema(db=session, user=admin, check_data_scope=False)
+
+        result = await UserService.batch_import_user_service(
+            auth=auth,
+            file=excel_file([
+                [dept.id, "u1", "用户1", "u1@example.com", "13800000001", "男", "正常"],
+                [dept.id, "u2", "用户2", "admin@example.com", "13800000002", "女", "正常"],
+                [dept.id, "u3", "用户3", "u3@example.com", "13800000000", "男", "正常"],
+                [dept.id, "u4", "用户4", "u1@example.com", "13800000004", "男", "正常"],
+                [999, "u5", "用户5", "u5@example.com", "13800000005", "男", "正常"],
+                [dept.id, "u6", "用户6", None, None, "男", "正常"],
+            ]),
+        )
+
+        assert result.startswith("成功导入 2 条数据")
+        assert "第2行: 邮箱 admin@example.com 已被其他用户使用" in result
+        assert "第3行: 手机号 13800000000 已被其他用户使用" in result
+        assert "第4行: 邮箱 u1@example.com 与本文件中其他行重复" in result
+        assert "第5行: 部门编号 999 不存在" in result
+        usernames = set((await session.execute(select(UserModel.username))).scalars().all())
+        assert usernames == {"admin", "u1", "u6"}
+
+    run_in_db(check)
+
+
+def test_update_keeps_own_contacts(run_in_db) -> None:
+    """更新已存在用户时，沿用其自身的手机号和邮箱不算冲突"""
+
+    async def check(session: AsyncSession) -> None:
+        dept = DeptModel(name="研发部", code="dev")
+        session.add(dept)
+        await session.flush()
+        admin = UserModel(username="admin", password="x", name="管理员", is_superuser=True)
+        user = UserModel(
+            username="u1", password="x", name="用户1", dept_id=dept.id, mobile="13800000001", email="u1@example.com"
+        )
+        session.add_all([admin, user])
+        await session.flush()
+        auth = AuthSchema(db=session, user=admin, check_data_scope=False)
+
+        result = await UserService.batch_import_user_service(
+            auth=auth,
+            file=excel_file([[dept.id, "u1", "新名称", "u1@example.com", "13800000001", "男", "正常"]]),
+            update_support=True,
+        )
+
+        assert result == "成功导入 1 条数据"
+        await session.refresh(user)
+        assert user.name == "新名称"
+
+    run_in_db(check)
+
+
+def test_existing_user_out_of_scope_reported(run_in_db) -> None:
+    """已存在但不在导入人数据权限范围内的用户名按行报错，不当作新用户写入"""
+
+    async def check(session: AsyncSession) -> None:
+        dept = DeptModel(name="研发部", code="dev")
+        session.add(dept)
+        await session.flush()
+        importer = UserModel(username="importer", password="x", name="导入人")
+        session.add(importer)
+        await session.flush()
+        other = UserModel(username="other", password="x", name="他人创建", dept_id=dept.id)
+        mine = UserModel(username="mine", password="x", name="本人创建", dept_id=dept.id, created_id=importer.id)
+        session.add_all([other, mine])
+        await session.flush()
+        # 没有角色的普通用户只能访问自己创建的数据
+        auth = AuthSchema(db=session, user=UserModel(id=importer.id, is_superuser=False), check_data_scope=True)
+        rows = [
+            [dept.id, "other", "新名称", None, None, "男", "正常"],
+            [dept.id, "mine", "新名称", None, None, "男", "正常"],
+            [dept.id, "new", "新用户", None, None, "男", "正常"],
+        ]
+
+        result = await UserService.batch_import_user_service(auth=auth, file=excel_file(rows), update_support=True)
+        assert result.startswith("成功导入 2 条数据")
+        assert "第1行: 用户 other 已存在，无权限修改" in result
+        names = dict((await session.execute(select(UserModel.username, UserModel.name))).all())
+        assert names["other"] == "他人创建"
+        assert names["mine"] == "新名称"
+        assert names["new"] == "新用户"
+
+        result = await UserService.batch_import_user_service(auth=auth, file=excel_file(rows[:1]))
+        assert "第1行: 用户 other 已存在" in result
+
+    run_in_db(check)
@@ -12,6 +12,59 @@ const DatasAPI = {
     });
   },
 
+  // 创建BOM导入任务，立即返回任务ID
+  createImportJob(formData: FormData) {
+    return request<ApiResponse<ImportJobSchema>>({
+      url: `${API_PATH}/import`,
+      method: "post",
+      data: formData,
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+  },
+
+  // 创建批量导入BOM任务（多个图纸或ZIP），立即返回任务ID
+  batchImport(formData: FormData) {
+    return request<ApiResponse<ImportJobSchema>>({
+      url: `${API_PATH}/import/batch`,
+      method: "post",
+      data: formData,
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+  },
+
+  // 查询BOM导入任务状态
+  getImportJob(jobId: string) {
+    return request<ApiResponse<ImportJobSchema>>({
+      url: `${API_PATH}/import/${jobId}`,
+      method: "get",
+    });
+  },
+
+  // 获取BOM导入任务结果（任务完成后）
+  getImportJobResult(jobId: string) {
+    return request<ApiResponse<UploadInnerData>>({
+      url: `${API_PATH}/import/${jobId}/result`,
+      method: "get",
+    });
+  },
+
+  // 获取批量导入任务结果（任务完成后），包含每个图纸的概要
+  getBatchImportResult(jobId: string) {
+    return request<ApiResponse<BatchImportSchema>>({
+      url: `${API_PATH}/import/${jobId}/result`,
+      method: "get",
+    });
+  },
+
+  // 比较BOM修订，apply为true时只写入差异
+  diffDatas(payload: any) {
+    return request<ApiResponse<any>>({
+      url: `${API_PATH}/diff`,
+      method: "post",
+      data: payload,
+    });
+  },
+
   saveDatas(payload: any) {
     return request({
       url: `${API_PATH}/savedatas`,
@@ -63,5 +116,38 @@ export interface UploadInnerData {
   零件数量: number;
 }
 
+// BOM导入任务状态
+export interface ImportJobSchema {
+  job_id: string;
+  filename: string;
+  status: "pending" | "running" | "success" | "failed";
+  stage: "queued" | "converted" | "parsed" | "coded" | "built";
+  progress: number;
+  inserts: number;
+  wtcodes: number;
+  msg?: string | null;
+  created_time: string;
+  updated_time: string;
+}
+
+// 批量导入中单个图纸的概要，完整结果用 job_id 调用 getImportJobResult 获取
+export interface BatchImportFileSchema extends ImportJobSchema {
+  component_code?: string | null;
+  component_name?: string | null;
+  project_name?: string | null;
+  contract_no?: string | null;
+  part_count: number;
+  info: string[];
+}
+
+// 批量导入结果
+export interface BatchImportSchema {
+  batch_id: string;
+  total: number;
+  success: number;
+  failed: number;
+  files: BatchImportFileSchema[];
+}
+
 // 上传接口的响应类型（最终匹配axios返回的res结构）
 // export type DataUploadResponse = AxiosResponse<ApiResponse<UploadInnerData>>;
@@ -45,6 +45,30 @@ export interface PartsData {
   updated_time: string;
 }
 
+export interface PartsTreeQuery {
+  component_wtcode?: string;
+  prefix?: string; // 子树根节点万通码，懒加载时传入要展开的节点
+  depth?: number;
+}
+
+export interface PartsTreeNode {
+  id: number;
+  wtcode: string;
+  component_wtcode: string;
+  code: string;
+  spec: string;
+  count: number;
+  material: string;
+  unit_mass: number;
+  total_mass: number;
+  remark: string;
+  level: number;
+  child_count: number; // 大于0且children为空时需要懒加载
+  descendant_count: number;
+  descendant_mass: number;
+  children: PartsTreeNode[];
+}
+
 export class PartsAPI {
   static getList(params: PartsQuery) {
     return request({
@@ -54,6 +78,14 @@ export class PartsAPI {
     });
   }
 
+  static getTree(params: PartsTreeQuery) {
+    return request({
+      url: `${API_PATH}/tree`,
+      method: "get",
+      params,
+    });
+  }
+
   static create(data: PartsForm) {
     return request({
       url: `${API_PATH}/create`,
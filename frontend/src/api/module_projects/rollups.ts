@@ -0,0 +1,51 @@
+import request from "@/utils/request";
+
+const API_PATH = "/projects/rollups";
+
+export interface RollupTotals {
+  part_count: number;
+  quantity: number;
+  total_mass: number;
+  dedicated_count: number;
+  dedicated_mass: number;
+  purchased_count: number;
+  purchased_mass: number;
+}
+
+export interface ComponentRollup extends RollupTotals {
+  component_wtcode: string;
+  project_code: string;
+  updated_time: string;
+}
+
+export interface ProjectRollup extends RollupTotals {
+  project_code: string;
+  component_count: number;
+  components: ComponentRollup[];
+}
+
+export class RollupsAPI {
+  static getComponent(componentWtcode: string) {
+    return request({
+      url: `${API_PATH}/component/${componentWtcode}`,
+      method: "get",
+    });
+  }
+
+  static getProject(projectCode: string) {
+    return request({
+      url: `${API_PATH}/project/${projectCode}`,
+      method: "get",
+    });
+  }
+
+  static rebuild(projectCode?: string) {
+    return request({
+      url: `${API_PATH}/rebuild`,
+      method: "post",
+      params: { project_code: projectCode },
+    });
+  }
+}
+
+export default RollupsAPI;